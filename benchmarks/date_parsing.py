@@ -0,0 +1,128 @@
+"""
+Micro-benchmark of the WhoisRecord date parser.
+
+Compares the current parser with the former four-regex cascade over a
+corpus of date strings as returned by the API and checks both give the
+same results.
+
+Usage: python benchmarks/date_parsing.py [iterations]
+"""
+import datetime
+import logging
+import re
+import sys
+import timeit
+
+from whoisapi.models.response import _datetime_value
+
+logging.disable(logging.CRITICAL)
+
+# Date shapes seen in WhoisService responses, weighted roughly by how
+# often they occur in a record.
+CORPUS = [
+    '2009-03-19T21:47:17Z',
+    '2009-03-19T21:47:17Z',
+    '2030-03-19T21:47:17Z',
+    '2021-02-16T19:04:22Z',
+    '2009-03-19T14:47:17-07:00',
+    '2021-02-16T12:04:22-0700',
+    '1997-09-15T04:00:00+0000',
+    '2028-09-14T04:00:00+00:00',
+    '2021-05-11T17:30:00.000+02:00',
+    '2021-02-17 15:26:53.000 UTC',
+    '2021-02-17 15:26:53.000 UTC',
+    '2009-03-19 21:47:17 UTC',
+    '2019-11-01 10:00:00 GMT',
+    '2009-03-19 00:00:00 UTC',
+]
+
+# Shapes the fast path leaves to the fallback, or that don't parse.
+EDGE_CASES = [
+    '2021-02-17',
+    '19-Mar-2009',
+    '2009-03-19 21:47:17+00:00',
+    '2009-03-19T21:47:17.000Z',
+    '2009-03-19T21:47:17.123456+00:00',
+    '2009-03-19T24:47:17Z',
+    '2009-03-19T21:47:60Z',
+    '2009-02-30T21:47:17+00:00',
+    '2009-03-19T21:47:17+25:00',
+    '2009-03-19T21:47:17+05:75',
+    '2009-03-19T21:47:17Z\n',
+    '2009-03-19 21:47:17   utc',
+    '2009-3-9 1:47:17 UTC',
+    '2009-03-19 21:47:17 XYZ',
+    '',
+]
+
+re_milliseconds_and_timezone_offset = re.compile(
+    r'(\.\d\d\d)?([-+])(\d\d)(:)?(\d\d)$')
+re_timezone_offset = re.compile(r'([-+])(\d\d)(:)?(\d\d)$')
+re_coordinated_utc = re.compile(r'(T\d\d:\d\d:\d\dZ)$')
+re_milliseconds_and_timezone_name = re.compile(
+    r'(\.\d\d\d)?\s+([a-z]{3,4})$', re.IGNORECASE)
+
+
+def legacy_datetime_value(values: dict, key: str):
+    """The parser up to version 1.2.0"""
+    if key in values:
+        if values[key] is None:
+            return None
+        dt = str(values[key])
+        m = re_milliseconds_and_timezone_offset.search(dt)
+        m2 = re_timezone_offset.search(dt)
+        m3 = re_milliseconds_and_timezone_name.search(dt)
+        m4 = re_coordinated_utc.search(dt)
+        try:
+            if m is not None:
+                return datetime.datetime.strptime(
+                    re_milliseconds_and_timezone_offset.sub(r'\2\3\5', dt),
+                    "%Y-%m-%dT%H:%M:%S%z")
+            if m2 is not None:
+                return datetime.datetime.strptime(
+                    re_timezone_offset.sub(r'\1\2\4', dt),
+                    "%Y-%m-%dT%H:%M:%S%z")
+            if m3 is not None:
+                return datetime.datetime.strptime(
+                    re_milliseconds_and_timezone_name.sub(r' \2', dt),
+                    "%Y-%m-%d %H:%M:%S %Z")
+            if m4 is not None:
+                return datetime.datetime.strptime(dt, '%Y-%m-%dT%H:%M:%SZ')
+        except (ValueError, Exception):
+            pass
+        return None
+
+
+def check():
+    for dt in CORPUS + EDGE_CASES:
+        values = {'date': dt}
+        expected = legacy_datetime_value(values, 'date')
+        actual = _datetime_value(values, 'date')
+        if expected != actual or repr(expected) != repr(actual):
+            raise AssertionError('{!r}: expected {!r}, got {!r}'.format(
+                dt, expected, actual))
+
+
+def run(parser, iterations: int) -> float:
+    corpus = [{'date': dt} for dt in CORPUS]
+
+    def parse_corpus():
+        for values in corpus:
+            parser(values, 'date')
+
+    seconds = min(timeit.repeat(parse_corpus, number=iterations, repeat=5))
+    return seconds / (iterations * len(corpus)) * 1e9
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    check()
+    legacy = run(legacy_datetime_value, iterations)
+    current = run(_datetime_value, iterations)
+    print('legacy cascade: {:8.0f} ns/date'.format(legacy))
+    print('current parser: {:8.0f} ns/date'.format(current))
+    print('speedup:        {:8.1f}x'.format(legacy / current))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark of the response decoding step of Client.data.
+
+Compares the former hand-off, loads(str(response.text)), with decoding
+the raw body bytes through each available JsonDecoder, on a response
+with raw texts and on the same response without them.
+
+Usage: python benchmarks/json_decoding.py [iterations]
+"""
+import json
+import os
+import sys
+import timeit
+
+from requests.models import Response
+
+from whoisapi.decoders import StdlibJsonDecoder, OrjsonDecoder, orjson
+
+PAYLOADS = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'payloads')
+
+
+def without_raw_texts(value):
+    if isinstance(value, dict):
+        return {k: without_raw_texts(v) for k, v in value.items()
+                if k not in ('rawText', 'strippedText')}
+    return value
+
+
+def make_response(body: bytes) -> Response:
+    response = Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = 'application/json'
+    response._content = body
+    return response
+
+
+def run(decode, body: bytes, iterations: int) -> float:
+    # A new Response each time, as .text decodes on every access
+    responses = [make_response(body) for _ in range(iterations)]
+
+    def decode_all():
+        for response in responses:
+            decode(response)
+
+    seconds = min(timeit.repeat(decode_all, number=1, repeat=5))
+    return seconds / iterations * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with open(os.path.join(PAYLOADS, 'whois_record.json'), 'rb') as file:
+        full = file.read()
+    bodies = [
+        ('with raw texts', full),
+        ('ignore_raw_texts=1', json.dumps(
+            without_raw_texts(json.loads(full))).encode()),
+    ]
+
+    decoders = [('loads(str(response.text))',
+                 lambda r: json.loads(str(r.text)))]
+    stdlib = StdlibJsonDecoder()
+    decoders.append(('json, bytes', lambda r: stdlib.decode(r.content)))
+    if orjson is not None:
+        fast = OrjsonDecoder()
+        decoders.append(('orjson, bytes', lambda r: fast.decode(r.content)))
+
+    for label, body in bodies:
+        print('{} ({} bytes)'.format(label, len(body)))
+        baseline = None
+        for name, decode in decoders:
+            micros = run(decode, body, iterations)
+            baseline = baseline or micros
+            print('  {:28} {:8.1f} us  {:5.1f}x'.format(
+                name, micros, baseline / micros))
+
+
+if __name__ == '__main__':
+    main()
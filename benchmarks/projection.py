@@ -0,0 +1,47 @@
+"""
+Benchmark of record construction with and without a field projection.
+
+Usage: python benchmarks/projection.py [iterations]
+"""
+import json
+import os
+import sys
+import timeit
+
+from whoisapi import WhoisRecord, LazyWhoisRecord, Projection
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      'payloads', 'whois_record.json')
+FIELDS = ['domain_name', 'expires_date', 'registrar_name',
+          'registrant.country_code', 'registry_data.expires_date']
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with open(SAMPLE) as file:
+        values = json.load(file)['WhoisRecord']
+    projection = Projection(FIELDS)
+
+    def lazy_read():
+        record = LazyWhoisRecord(values)
+        for field in FIELDS:
+            model = record
+            for name in field.split('.'):
+                model = getattr(model, name)
+
+    cases = [
+        ('WhoisRecord', lambda: WhoisRecord(values)),
+        ('LazyWhoisRecord, 5 fields read', lazy_read),
+        ('Projection, 5 fields', lambda: projection.build(values)),
+    ]
+    baseline = None
+    for name, build in cases:
+        seconds = min(timeit.repeat(build, number=iterations, repeat=5))
+        micros = seconds / iterations * 1e6
+        baseline = baseline or micros
+        print('{:34} {:8.1f} us/record  {:5.1f}x'.format(
+            name, micros, baseline / micros))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark of WhoisRecordBatch against a list of WhoisRecord instances
+built from the same decoded responses: build time and the bytes
+allocated per record, plus the time to pull one column out.
+
+The sample response is varied per record (domain name, dates, registrar
+and country), so the dictionary-encoded columns see realistic repeats.
+
+Usage: python benchmarks/record_batch.py [--count N]
+"""
+import argparse
+import copy
+import json
+import os
+import time
+import tracemalloc
+
+from whoisapi import WhoisRecord, WhoisRecordBatch
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      'payloads', 'whois_record.json')
+REGISTRARS = ['GoDaddy.com, LLC', 'NameCheap, Inc.', 'Tucows Domains Inc.',
+              'Google LLC', 'Network Solutions, LLC']
+COUNTRIES = ['US', 'DE', 'FR', 'GB', 'CA', 'JP', 'NL']
+
+
+def sample_values(count: int) -> list:
+    with open(SAMPLE) as file:
+        base = json.load(file)['WhoisRecord']
+    values = []
+    for i in range(count):
+        record = copy.deepcopy(base)
+        record['domainName'] = 'domain{}.com'.format(i)
+        record['expiresDate'] = '20{:02d}-{:02d}-{:02d}T10:00:00Z'.format(
+            25 + i % 10, 1 + i % 12, 1 + i % 28)
+        record['registrarName'] = REGISTRARS[i % len(REGISTRARS)]
+        record.setdefault('registrant', {})['countryCode'] = \
+            COUNTRIES[i % len(COUNTRIES)]
+        values.append(record)
+    return values
+
+
+def build_batch(values: list) -> WhoisRecordBatch:
+    batch = WhoisRecordBatch()
+    batch.extend(values)
+    return batch
+
+
+def measure(build, values: list):
+    """Time a build, then repeat it under tracemalloc for its size"""
+    start = time.perf_counter()
+    build(values)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(values)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=10000)
+    args = parser.parse_args()
+    values = sample_values(args.count)
+
+    records, records_time, records_size = measure(
+        lambda v: [WhoisRecord(r) for r in v], values)
+    batch, batch_time, batch_size = measure(build_batch, values)
+
+    start = time.perf_counter()
+    expires = [r.expires_date for r in records]
+    column_records = time.perf_counter() - start
+    start = time.perf_counter()
+    expires_column = batch.column('expires_date')
+    column_batch = time.perf_counter() - start
+    assert len(expires) == len(expires_column) == args.count
+
+    print('{:34} {:>12} {:>14}'.format('', 'us/record', 'bytes/record'))
+    for name, seconds, size in (
+            ('list of WhoisRecord', records_time, records_size),
+            ('WhoisRecordBatch, default fields', batch_time, batch_size)):
+        print('{:34} {:12.1f} {:14.0f}'.format(
+            name, seconds / args.count * 1e6, size / args.count))
+    print('{:34} {:12.1f}x {:13.1f}x'.format(
+        'improvement', records_time / batch_time, records_size / batch_size))
+    print('\nexpires_date column: {:.2f} ms from records, {:.4f} ms from '
+          'the batch'.format(column_records * 1e3, column_batch * 1e3))
+
+
+if __name__ == '__main__':
+    main()
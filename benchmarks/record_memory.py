@@ -0,0 +1,83 @@
+"""
+Memory benchmark of WhoisRecord instances.
+
+Builds many records from a sample response and reports the bytes
+allocated per record. With --against REV the models of that git
+revision are measured too, for a before/after comparison.
+
+Usage: python benchmarks/record_memory.py [--count N] [--against REV]
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+from whoisapi import WhoisRecord, LazyWhoisRecord
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE = os.path.join(ROOT, 'benchmarks', 'payloads', 'whois_record.json')
+
+
+def load_models(revision: str, directory: str):
+    """Import whoisapi.models of a git revision as a separate package"""
+    package = os.path.join(directory, 'legacy_models')
+    os.mkdir(package)
+    open(os.path.join(package, '__init__.py'), 'w').close()
+    for name in ('base.py', 'response.py'):
+        source = subprocess.check_output(
+            ['git', 'show', '{}:src/whoisapi/models/{}'.format(
+                revision, name)], cwd=ROOT)
+        with open(os.path.join(package, name), 'wb') as file:
+            file.write(source)
+    sys.path.insert(0, directory)
+    return importlib.import_module('legacy_models.response')
+
+
+def bytes_per_record(record_class, values: dict, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [record_class(values) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(records) == count
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=5000)
+    parser.add_argument('--against', help='git revision to compare with')
+    args = parser.parse_args()
+
+    with open(SAMPLE) as file:
+        values = json.load(file)['WhoisRecord']
+
+    results = [('WhoisRecord', bytes_per_record(
+        WhoisRecord, values, args.count))]
+
+    def first_access(v):
+        record = LazyWhoisRecord(v)
+        record.expires_date
+        record.registrar_name
+        return record
+
+    results.append(('LazyWhoisRecord, 2 fields read', bytes_per_record(
+        first_access, values, args.count)))
+
+    if args.against:
+        with tempfile.TemporaryDirectory() as directory:
+            legacy = load_models(args.against, directory)
+            results.append(('WhoisRecord @ {}'.format(args.against),
+                            bytes_per_record(legacy.WhoisRecord, values,
+                                             args.count)))
+
+    for name, size in results:
+        print('{:40} {:10.0f} bytes/record'.format(name, size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark of request construction overhead per lookup: building the
+query from RequestParameters and preparing the URL with requests.
+
+Usage: python benchmarks/request_building.py [iterations]
+"""
+import sys
+import timeit
+from urllib.parse import urlencode
+
+from requests.models import PreparedRequest
+
+from whoisapi import ApiRequester, RequestParameters
+
+URL = 'https://www.whoisxmlapi.com/whoisserver/WhoisService'
+API_KEY = 'at_' + '0' * 29
+
+
+def legacy_payload(params: RequestParameters, domain: str) -> dict:
+    """Request payload as built before the query string was cached"""
+    payload = {
+        'apiKey': params.api_key,
+        'domainName': params.domain_name,
+        'outputFormat': params.output_format,
+        'da': params.da,
+        'ip': params.ip,
+        'ipWhois': params.ip_whois,
+        'thinWhois': params.thin_whois,
+        'preferFresh': params.prefer_fresh,
+        'checkProxyData': params.check_proxy_data,
+        'ignoreRawTexts': params.ignore_raw_texts
+    }
+    payload['domainName'] = domain or payload['domainName']
+    return payload
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    requester = ApiRequester(api_key=API_KEY, url=URL)
+    params = RequestParameters(api_key=API_KEY, da=2)
+    domain = 'whoisxmlapi.com'
+
+    def legacy_prepare():
+        PreparedRequest().prepare_url(URL, legacy_payload(params, domain))
+
+    def cached_prepare():
+        PreparedRequest().prepare_url(
+            requester._url(domain, params), None)
+
+    cases = [
+        ('query, legacy dict + urlencode',
+         lambda: urlencode(legacy_payload(params, domain))),
+        ('query, cached prefix', lambda: requester._url(domain, params)),
+        ('prepared URL, legacy', legacy_prepare),
+        ('prepared URL, cached prefix', cached_prepare),
+    ]
+    for i, (name, build) in enumerate(cases):
+        seconds = min(timeit.repeat(build, number=iterations, repeat=5))
+        micros = seconds / iterations * 1e6
+        if i % 2 == 0:
+            baseline = micros
+        print('{:34} {:8.2f} us/call  {:5.1f}x'.format(
+            name, micros, baseline / micros))
+
+
+if __name__ == '__main__':
+    main()
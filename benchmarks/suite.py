@@ -0,0 +1,223 @@
+"""
+Offline benchmark suite. Replays the recorded payloads from a local stub
+WhoisService server and measures:
+- Client.data throughput and latency percentiles at several concurrency
+  levels, for WhoisRecord and ErrorMessage responses
+- Client.raw_data and Client.data with the XML output format
+- parsing without the network: JSON or XML decoding plus WhoisRecord
+  construction, and WhoisRecord construction alone
+
+Results are printed and can be saved as JSON; pass a saved file to
+--compare to print the ratios against it, e.g. between two releases:
+
+    python benchmarks/suite.py --output 1.2.0.json
+    python benchmarks/suite.py --compare 1.2.0.json
+
+Usage: python benchmarks/suite.py [options], see --help
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, os.pardir, 'tests'))
+
+from stub_server import StubWhoisServer, API_KEY  # noqa: E402
+from whoisapi import Client, RequestParameters, WhoisRecord, \
+    WhoisApiError, XmlDecoder  # noqa: E402
+from whoisapi.decoders import get_decoder  # noqa: E402
+
+PAYLOADS = os.path.join(HERE, 'payloads')
+
+
+def read_payload(name: str) -> bytes:
+    with open(os.path.join(PAYLOADS, name), 'rb') as file:
+        return file.read()
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def replay(record: bytes, error: bytes, xml: bytes):
+    """Stub response callable serving the recorded payloads"""
+    def respond(query):
+        if query.get('outputFormat', 'json').lower() == 'xml':
+            return 200, xml, {'Content-Type': 'application/xml'}
+        if query.get('domainName', '').startswith('error'):
+            return 200, error, {'Content-Type': 'application/json'}
+        return 200, record, {'Content-Type': 'application/json'}
+
+    return respond
+
+
+def run_lookups(lookup, requests: int, concurrency: int) -> dict:
+    def timed(i):
+        start = time.perf_counter()
+        try:
+            lookup(i)
+        except WhoisApiError:
+            pass
+        return time.perf_counter() - start
+
+    timed(0)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        start = time.perf_counter()
+        latencies = sorted(executor.map(timed, range(requests)))
+        elapsed = time.perf_counter() - start
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'throughput': requests / elapsed,
+        'p50_ms': percentile(latencies, 0.5) * 1e3,
+        'p90_ms': percentile(latencies, 0.9) * 1e3,
+        'p99_ms': percentile(latencies, 0.99) * 1e3,
+        'max_ms': latencies[-1] * 1e3,
+    }
+
+
+def network_benchmarks(args) -> dict:
+    results = {}
+    server = StubWhoisServer(latency=args.latency).start()
+    respond = replay(read_payload('whois_record.json'),
+                     read_payload('error_message.json'),
+                     read_payload('whois_record.xml'))
+    domains = ['whoisxmlapi.com', 'error.com']
+    for domain in domains:
+        server.respond(domain, body=respond)
+    xml = RequestParameters(output_format='xml')
+    try:
+        for concurrency in args.concurrency:
+            with Client(api_key=API_KEY, url=server.url,
+                        pool_maxsize=concurrency) as client:
+                cases = [
+                    ('data', lambda i: client.data(domains[0])),
+                    ('data_error', lambda i: client.data(domains[1])),
+                    ('raw_data_xml',
+                     lambda i: client.raw_data(domains[0], xml)),
+                    ('data_xml', lambda i: client.data(domains[0], xml)),
+                ]
+                for name, lookup in cases:
+                    key = '{}/c{}'.format(name, concurrency)
+                    results[key] = run_lookups(
+                        lookup, args.requests, concurrency)
+                    print_result(key, results[key])
+    finally:
+        server.stop()
+    return results
+
+
+def parse_benchmarks(args) -> dict:
+    results = {}
+    body = read_payload('whois_record.json')
+    xml = read_payload('whois_record.xml')
+    values = json.loads(body)['WhoisRecord']
+    cases = [
+        ('parse_json', lambda: Client._parse_response(
+            body, get_decoder('json'))),
+        ('parse_auto', lambda: Client._parse_response(
+            body, get_decoder('auto'))),
+        ('parse_xml', lambda: Client._parse_response(xml, XmlDecoder())),
+        ('build_record', lambda: WhoisRecord(values)),
+    ]
+    for name, parse in cases:
+        seconds = min(timeit.repeat(parse, number=args.iterations,
+                                    repeat=5))
+        results[name] = {'us_per_call': seconds / args.iterations * 1e6}
+        print_result(name, results[name])
+    return results
+
+
+def print_result(name: str, result: dict):
+    if 'throughput' in result:
+        print('{:24} {:9.1f} req/s  p50 {:7.2f} ms  p90 {:7.2f} ms  '
+              'p99 {:7.2f} ms'.format(
+                  name, result['throughput'], result['p50_ms'],
+                  result['p90_ms'], result['p99_ms']))
+    else:
+        print('{:24} {:9.1f} us/call'.format(name, result['us_per_call']))
+
+
+def compare(results: dict, baseline: dict):
+    """Print current / baseline ratios; above 1 is better"""
+    print('\nCompared to {} ({}):'.format(
+        baseline.get('revision') or 'baseline', baseline.get('date')))
+    for name, result in results.items():
+        old = baseline['results'].get(name)
+        if old is None:
+            continue
+        if 'throughput' in result:
+            ratios = [('throughput', result['throughput'] /
+                       old['throughput'])]
+            ratios += [(p, old[p] / result[p])
+                       for p in ('p50_ms', 'p99_ms')]
+        else:
+            ratios = [('speed', old['us_per_call'] / result['us_per_call'])]
+        print('{:24} {}'.format(name, '  '.join(
+            '{} {:5.2f}x'.format(k, v) for k, v in ratios)))
+
+
+def revision() -> str or None:
+    try:
+        return subprocess.check_output(
+            ['git', 'describe', '--always', '--dirty'], cwd=HERE,
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Offline benchmarks against a local stub server.')
+    parser.add_argument('--requests', type=int, default=500,
+                        help='lookups per scenario (default 500)')
+    parser.add_argument('--concurrency', default='1,4,16',
+                        help='comma-separated worker counts '
+                             '(default 1,4,16)')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='stub server latency in seconds (default 0)')
+    parser.add_argument('--iterations', type=int, default=2000,
+                        help='iterations of the parse benchmarks')
+    parser.add_argument('--skip-network', action='store_true',
+                        help='run the parse benchmarks only')
+    parser.add_argument('--output', help='save the results as JSON')
+    parser.add_argument('--compare', help='saved results to compare to')
+    args = parser.parse_args(argv)
+    args.concurrency = [int(c) for c in args.concurrency.split(',')]
+
+    results = {}
+    if not args.skip_network:
+        results.update(network_benchmarks(args))
+    results.update(parse_benchmarks(args))
+
+    report = {
+        'revision': revision(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'latency': args.latency,
+            'iterations': args.iterations,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file))
+
+
+if __name__ == '__main__':
+    main()
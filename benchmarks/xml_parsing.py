@@ -0,0 +1,76 @@
+"""
+Benchmark of XML response parsing against the JSON path on matching
+payloads (payloads/whois_record.xml is the XML form of
+payloads/whois_record.json): time per response from body to WhoisRecord
+and the peak memory allocated while parsing, also for a body with large
+raw texts.
+
+For reference, building an ElementTree of the XML body is measured too.
+
+Usage: python benchmarks/xml_parsing.py [iterations]
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+from xml.etree import ElementTree
+
+from whoisapi import Client, XmlDecoder
+from whoisapi.decoders import get_decoder
+
+PAYLOADS = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'payloads')
+
+
+def read_payload(name: str) -> bytes:
+    with open(os.path.join(PAYLOADS, name), 'rb') as file:
+        return file.read()
+
+
+def peak_bytes(parse) -> int:
+    tracemalloc.start()
+    parse()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    json_body = read_payload('whois_record.json')
+    xml_body = read_payload('whois_record.xml')
+    xml = XmlDecoder(skip_keys=('rawText', 'strippedText'))
+    xml_everything = XmlDecoder()
+
+    cases = [
+        ('JSON, json module', lambda: Client._parse_response(
+            json_body, get_decoder('json'))),
+        ('JSON, auto decoder', lambda: Client._parse_response(
+            json_body, get_decoder('auto'))),
+        ('XML, raw texts skipped', lambda: Client._parse_response(
+            xml_body, xml)),
+        ('XML, everything', lambda: Client._parse_response(
+            xml_body, xml_everything)),
+        ('XML, ElementTree only', lambda: ElementTree.fromstring(xml_body)),
+    ]
+    print('body sizes: JSON {} bytes, XML {} bytes\n'.format(
+        len(json_body), len(xml_body)))
+    print('{:26} {:>10} {:>12}'.format('', 'us/call', 'peak bytes'))
+    for name, parse in cases:
+        seconds = min(timeit.repeat(parse, number=iterations, repeat=5))
+        print('{:26} {:10.1f} {:12d}'.format(
+            name, seconds / iterations * 1e6, peak_bytes(parse)))
+
+    # every raw text padded by 200 KB
+    padding = b'x' * 200000
+    json_body = json_body.replace(b'"rawText": "', b'"rawText": "' + padding)
+    xml_body = xml_body.replace(b'<rawText>', b'<rawText>' + padding)
+    print('\nlarge raw texts: JSON {} bytes, XML {} bytes\n'.format(
+        len(json_body), len(xml_body)))
+    print('{:26} {:>12}'.format('', 'peak bytes'))
+    for name, parse in cases:
+        print('{:26} {:12d}'.format(name, peak_bytes(parse)))
+
+
+if __name__ == '__main__':
+    main()
@@ -60,10 +60,28 @@ setup(
         'api',
         'whoisxmlapi',
     ],
+    entry_points={
+        'console_scripts': [
+            'whoisapi = whoisapi.cli:main',
+        ]
+    },
     install_requires=[
         'requests',
     ],
     extras_require={
+        'async': [
+            'aiohttp',
+        ],
+        'fast': [
+            'orjson',
+        ],
+        'prometheus': [
+            'prometheus_client',
+        ],
+        'analytics': [
+            'numpy',
+            'pandas',
+        ],
         'dev': [
             'tox',
         ]
@@ -2,12 +2,48 @@ __all__ = ['Client', 'RequestParameters', 'WhoisRecord', 'Registrant',
            'Contact', 'Audit', 'ErrorMessage', 'RegistryData', 'NameServers',
            'WhoisApiError', 'ApiAuthError', 'HttpApiError',
            'EmptyApiKeyError', 'ParameterError', 'ResponseError',
-           'UnparsableApiResponseError', 'ApiRequester']
+           'UnparsableApiResponseError', 'ApiRequester', 'AsyncClient',
+           'AsyncApiRequester', 'RateLimitError', 'TokenBucket',
+           'AdaptiveRateLimiter', 'RetryPolicy', 'BaseCache', 'MemoryCache',
+           'SqliteCache', 'LazyWhoisRecord', 'JsonDecoder',
+           'StdlibJsonDecoder', 'OrjsonDecoder', 'NdjsonExporter',
+           'CsvExporter', 'Projection', 'TextFieldFilter', 'RequestEvent',
+           'PrometheusListener', 'Deadline', 'DeadlineExceededError',
+           'WhoisRecordBatch', 'XmlDecoder', 'RecordStore',
+           'RefreshScheduler', 'Credential', 'CredentialPool']
 
 from .client import Client
 from .models.request import RequestParameters
 from .models.response import WhoisRecord, Registrant, RegistryData, Contact, \
     NameServers, ErrorMessage, Audit
+from .models.lazy import LazyWhoisRecord
+from .models.projection import Projection
+from .models.batch import WhoisRecordBatch
 from .exceptions.error import ParameterError, HttpApiError, WhoisApiError, \
-    ApiAuthError, ResponseError, EmptyApiKeyError, UnparsableApiResponseError
+    ApiAuthError, ResponseError, EmptyApiKeyError, \
+    UnparsableApiResponseError, RateLimitError, DeadlineExceededError
 from .net.http import ApiRequester
+from .net.ratelimit import TokenBucket, AdaptiveRateLimiter
+from .net.retry import RetryPolicy
+from .net.deadline import Deadline
+from .net.credentials import Credential, CredentialPool
+from .cache import BaseCache, MemoryCache, SqliteCache
+from .decoders import JsonDecoder, StdlibJsonDecoder, OrjsonDecoder, \
+    XmlDecoder
+from .export import NdjsonExporter, CsvExporter
+from .streaming import TextFieldFilter
+from .store import RecordStore
+from .refresh import RefreshScheduler
+from .instrumentation import RequestEvent, PrometheusListener
+
+
+def __getattr__(name):
+    # asyncio support is opt-in, aiohttp is imported on first use
+    if name == 'AsyncClient':
+        from .async_client import AsyncClient
+        return AsyncClient
+    if name == 'AsyncApiRequester':
+        from .net.async_http import AsyncApiRequester
+        return AsyncApiRequester
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name))
@@ -0,0 +1,162 @@
+import asyncio
+from time import perf_counter
+from .client import Client
+from .models.request import RequestParameters
+from .net.async_http import AsyncApiRequester
+from .net.deadline import Deadline
+from .models.response import WhoisRecord
+from .models.lazy import LazyWhoisRecord
+from .models.projection import Projection
+from .decoders import XmlDecoder, get_decoder
+from .instrumentation import RequestEvent, notify
+from .exceptions.error import DeadlineExceededError
+
+
+class AsyncClient:
+    __default_url = "https://www.whoisxmlapi.com/whoisserver/WhoisService"
+    _api_requester: AsyncApiRequester or None
+
+    def __init__(self, **kwargs):
+        """
+        asyncio counterpart of Client. Requires aiohttp.
+
+        :param kwargs: dict Supported parameters:
+        - url: (optional) API endpoint URL; str
+        - timeout: (optional) API call timeout in seconds; float
+        - max_concurrency: (optional) maximum number of requests in
+          flight at once; int
+        - pool_maxsize, pool_maxsize_per_host, keep_alive: (optional)
+          connection pool settings, see AsyncApiRequester
+        - rate_limit, rate_limit_burst, adaptive_rate_limit: (optional)
+          client-side rate limiting, see AsyncApiRequester
+        - retry: (optional) retry policy for transient failures;
+          RetryPolicy
+        - credentials: (optional) API keys to spread the requests over
+          instead of api_key, see Client; CredentialPool
+        - lazy: (optional) return LazyWhoisRecord instances that convert
+          fields on first access, default False; bool
+        - decoder: (optional) JSON decoder, see Client; str or JsonDecoder
+        - listeners: (optional) callables invoked with a RequestEvent
+          after every data() call, see Client; list of callable
+        One of the following parameters (required):
+        - api_key: Your API key; str
+        - parameters: RequestParameters
+        """
+        if 'url' not in kwargs:
+            kwargs['url'] = AsyncClient.__default_url
+        self._record_class = LazyWhoisRecord \
+            if kwargs.pop('lazy', False) else WhoisRecord
+        self._decoder = get_decoder(kwargs.pop('decoder', 'auto'))
+        self._xml_decoder = XmlDecoder()
+        self._listeners = tuple(kwargs.pop('listeners', ()))
+        self.api_requester = AsyncApiRequester(**kwargs)
+
+    @property
+    def parameters(self) -> RequestParameters:
+        return self._api_requester.parameters
+
+    @parameters.setter
+    def parameters(self, value: RequestParameters):
+        self._api_requester.parameters = value
+
+    @property
+    def api_requester(self) -> AsyncApiRequester or None:
+        return self._api_requester
+
+    @api_requester.setter
+    def api_requester(self, value: AsyncApiRequester):
+        self._api_requester = value
+
+    @property
+    def timeout(self) -> float:
+        return self._api_requester.timeout
+
+    @timeout.setter
+    def timeout(self, value: float):
+        self._api_requester.timeout = value
+
+    async def close(self):
+        """Release the pooled connections of the underlying requester"""
+        await self._api_requester.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def data(self, domain: str,
+                   params: RequestParameters or None = None,
+                   fields=None, budget: float or None = None,
+                   deadline: Deadline or float or None = None) -> WhoisRecord:
+        """
+        Get parsed whois data from the API
+        :param domain: str - the domain name
+        :param params: RequestParameters instance (optional), XML
+          responses are parsed as in Client.data
+        :param fields: (optional) build only these fields, see Client.data;
+          list of str or Projection
+        :param budget: (optional) seconds the whole call may take; float
+        :param deadline: (optional) Deadline or time.monotonic() value,
+          see Client.data. The call is cancelled when it runs out
+        :return: WhoisRecord
+        :raises
+        - base class is whoisapi.exceptions.WhoisApiError
+          - DeadlineExceededError -- the budget or deadline ran out
+          - ResponseError -- the response contain ErrorMessage
+          - UnparsableApiResponseError -- the response couldn't be parsed
+          - ApiAuthError -- Server returns 401 HTTP code
+          - RateLimitError -- Server returns 429 HTTP code
+          - HttpApiError -- HTTP code is not 2xx or 401
+        - aiohttp.ClientError
+        """
+        if params is None:
+            params = self._api_requester.parameters
+        if fields is not None and not isinstance(fields, Projection):
+            fields = Projection(fields)
+        deadline = Deadline.of(budget, deadline)
+        if not self._listeners:
+            return await self._data(domain, params, fields, None, deadline)
+
+        event = RequestEvent(domain)
+        start = perf_counter()
+        try:
+            return await self._data(domain, params, fields, event, deadline)
+        except Exception as error:
+            event.error = error
+            raise
+        finally:
+            event.total = perf_counter() - start
+            notify(self._listeners, event)
+
+    async def _data(self, domain: str, params: RequestParameters,
+                    fields: Projection or None = None,
+                    event: RequestEvent or None = None,
+                    deadline: Deadline or None = None) -> WhoisRecord:
+        decoder = self._xml_decoder if Client._is_xml(params) \
+            else self._decoder
+        if deadline is None:
+            response = await self._api_requester.get_data(
+                domain, params, True, event)
+            return Client._parse_response(
+                response, decoder, self._record_class, fields, event)
+
+        try:
+            response = await asyncio.wait_for(
+                self._api_requester.get_data(
+                    domain, params, True, event, deadline),
+                deadline.check('the request'))
+        except asyncio.TimeoutError as error:
+            if deadline.remaining() > 0:
+                raise
+            raise DeadlineExceededError(
+                "Deadline exceeded during the request") from error
+        deadline.check('parsing')
+        return Client._parse_response(
+            response, decoder, self._record_class, fields, event)
+
+    async def raw_data(self, domain: str,
+                       params: RequestParameters or None = None) -> str:
+        if params is None:
+            params = self._api_requester.parameters
+        return await self._api_requester.get_data(domain, params)
@@ -0,0 +1,6 @@
+__all__ = ['BaseCache', 'CacheStats', 'MemoryCache', 'SqliteCache',
+           'cache_key']
+
+from .base import BaseCache, CacheStats, cache_key
+from .memory import MemoryCache
+from .sqlite import SqliteCache
@@ -0,0 +1,108 @@
+import threading
+from urllib.parse import urlencode
+from ..models.request import RequestParameters
+
+
+def cache_key(domain: str, params: RequestParameters) -> str:
+    """
+    Build the cache key of a lookup: the domain plus the request
+    parameters that affect the response. The API key and prefer_fresh
+    are left out.
+    """
+    return urlencode([
+        ('domainName', str(domain or params.domain_name).lower()),
+        ('outputFormat', str(params.output_format).lower()),
+        ('da', params.da),
+        ('ip', params.ip),
+        ('ipWhois', params.ip_whois),
+        ('thinWhois', params.thin_whois),
+        ('checkProxyData', params.check_proxy_data),
+        ('ignoreRawTexts', params.ignore_raw_texts)
+    ])
+
+
+class CacheStats:
+    """
+    Cache counters.
+    - hits: lookups served from the cache
+    - misses: lookups not found or expired
+    - bypasses: lookups with prefer_fresh=1
+    - evictions: entries dropped to respect the size limit
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.bypasses = 0
+            self.evictions = 0
+
+    def record_bypass(self):
+        """Count a lookup that skipped the cache, the cache itself
+        doesn't see those"""
+        self._add('bypasses')
+
+    def _add(self, counter: str, value: int = 1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def __str__(self):
+        return str({
+            'hits': self.hits,
+            'misses': self.misses,
+            'bypasses': self.bypasses,
+            'evictions': self.evictions,
+            'hit_ratio': self.hit_ratio
+        })
+
+
+class BaseCache:
+    """
+    Response cache interface. Implementations must be thread-safe and
+    count hits, misses and evictions in self.stats.
+    """
+    _ttl: float
+
+    def __init__(self, ttl: float):
+        """
+
+        :param ttl: seconds a cached response stays valid; float
+        """
+        if ttl is None or ttl <= 0:
+            raise ValueError("'ttl' should be positive.")
+        self._ttl = float(ttl)
+        self.stats = CacheStats()
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    def get(self, key: str):
+        """
+        :return: the cached response, None if absent or expired
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
@@ -0,0 +1,59 @@
+import threading
+import time
+from collections import OrderedDict
+from .base import BaseCache
+
+
+class MemoryCache(BaseCache):
+    """
+    In-memory LRU cache with per-entry expiration.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        """
+
+        :param maxsize: (optional) maximum number of entries; int
+        :param ttl: (optional) seconds a cached response stays valid;
+          float
+        """
+        super().__init__(ttl)
+        if maxsize is None or int(maxsize) < 1:
+            raise ValueError("'maxsize' should be positive.")
+        self.maxsize = int(maxsize)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.stats._add('misses')
+                return None
+            self._entries.move_to_end(key)
+        self.stats._add('hits')
+        return entry[1]
+
+    def set(self, key: str, value):
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            self.stats._add('evictions', evicted)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,101 @@
+import sqlite3
+import threading
+import time
+from .base import BaseCache
+
+
+class SqliteCache(BaseCache):
+    """
+    On-disk cache in a SQLite database, shared between processes and
+    kept across restarts. Least recently used entries are evicted when
+    maxsize is set.
+    """
+    _schema = 'CREATE TABLE IF NOT EXISTS whois_cache (' \
+              'key TEXT PRIMARY KEY, ' \
+              'value BLOB NOT NULL, ' \
+              'expires REAL NOT NULL, ' \
+              'used REAL NOT NULL)'
+
+    def __init__(self, path: str, ttl: float = 86400,
+                 maxsize: int or None = None):
+        """
+
+        :param path: database file path; str
+        :param ttl: (optional) seconds a cached response stays valid;
+          float
+        :param maxsize: (optional) maximum number of entries, unbounded
+          by default; int
+        """
+        super().__init__(ttl)
+        if maxsize is not None and int(maxsize) < 1:
+            raise ValueError("'maxsize' should be positive.")
+        self.maxsize = int(maxsize) if maxsize is not None else None
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(SqliteCache._schema)
+            self._db.execute(
+                'CREATE INDEX IF NOT EXISTS whois_cache_used '
+                'ON whois_cache (used)')
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                'SELECT COUNT(*) FROM whois_cache').fetchone()[0]
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                'SELECT value, expires FROM whois_cache WHERE key = ?',
+                (key,)).fetchone()
+            with self._db:
+                if row is not None and row[1] <= now:
+                    self._db.execute(
+                        'DELETE FROM whois_cache WHERE key = ?', (key,))
+                    row = None
+                elif row is not None and self.maxsize is not None:
+                    self._db.execute(
+                        'UPDATE whois_cache SET used = ? WHERE key = ?',
+                        (now, key))
+        if row is None:
+            self.stats._add('misses')
+            return None
+        self.stats._add('hits')
+        return row[0]
+
+    def set(self, key: str, value):
+        now = time.time()
+        evicted = 0
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO whois_cache '
+                '(key, value, expires, used) VALUES (?, ?, ?, ?)',
+                (key, value, now + self._ttl, now))
+            if self.maxsize is not None:
+                evicted = self._db.execute(
+                    'DELETE FROM whois_cache WHERE key IN ('
+                    'SELECT key FROM whois_cache ORDER BY used DESC '
+                    'LIMIT -1 OFFSET ?)', (self.maxsize,)).rowcount
+        if evicted:
+            self.stats._add('evictions', evicted)
+
+    def delete(self, key: str):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM whois_cache WHERE key = ?', (key,))
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM whois_cache')
+
+    def purge_expired(self) -> int:
+        """Delete expired entries
+        :return: int - number of deleted entries"""
+        with self._lock, self._db:
+            return self._db.execute(
+                'DELETE FROM whois_cache WHERE expires <= ?',
+                (time.time(),)).rowcount
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,201 @@
+import argparse
+import os
+import sys
+
+from .client import Client
+from .export import NdjsonExporter
+from .net.retry import RetryPolicy
+from .exceptions.error import ResponseError
+
+API_KEY_VARIABLE = 'WHOISAPI_KEY'
+
+
+class Checkpoint:
+    """
+    Append-only file of completed domains, one per line.
+    Lines are written in batches by flush(), so the output file can be
+    flushed first and a crash never marks an unwritten result as done.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._done = set()
+        self._pending = []
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                self._done.update(
+                    line.strip() for line in file if line.strip())
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def __contains__(self, domain: str) -> bool:
+        return domain in self._done
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def add(self, domain: str):
+        self._done.add(domain)
+        self._pending.append(domain)
+
+    def flush(self):
+        if self._pending:
+            self._file.write('\n'.join(self._pending) + '\n')
+            self._pending = []
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+def read_domains(lines, skip=()):
+    """
+    Yield normalized domain names from text lines, without blank lines,
+    #-comments, duplicates and domains contained in skip
+    """
+    seen = set()
+    for line in lines:
+        domain = line.split('#', 1)[0].strip().lower()
+        if not domain or domain in seen or domain in skip:
+            continue
+        seen.add(domain)
+        yield domain
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='whoisapi',
+        description='Look up a list of domains with Whois API and write '
+                    'the results as NDJSON. With a checkpoint file an '
+                    'interrupted run continues where it stopped.')
+    parser.add_argument(
+        'input', nargs='?', default='-',
+        help="file with one domain per line, '-' for stdin (default)")
+    parser.add_argument(
+        '-o', '--output', default='-',
+        help="NDJSON output file, appended to; '-' for stdout (default)")
+    parser.add_argument(
+        '-c', '--checkpoint',
+        help='file of completed domains, default OUTPUT.checkpoint when '
+             'writing to a file')
+    parser.add_argument(
+        '-k', '--api-key', default=os.environ.get(API_KEY_VARIABLE),
+        help='API key, default ${}'.format(API_KEY_VARIABLE))
+    parser.add_argument('--url', help='API endpoint URL')
+    parser.add_argument(
+        '-w', '--workers', type=int, default=10,
+        help='number of concurrent lookups (default 10)')
+    parser.add_argument(
+        '-r', '--rate-limit', type=float,
+        help='maximum number of API calls per second')
+    parser.add_argument(
+        '--burst', type=int, help='rate limiter burst size')
+    parser.add_argument(
+        '--adaptive', action='store_true',
+        help='lower the rate on HTTP 429 and raise it back gradually')
+    parser.add_argument(
+        '--max-attempts', type=int, default=3,
+        help='tries per domain on transient failures (default 3)')
+    parser.add_argument(
+        '-t', '--timeout', type=float, help='API call timeout in seconds')
+    parser.add_argument(
+        '-f', '--fields',
+        help='comma-separated attribute paths to write, e.g. '
+             'domain_name,expires_date,registrant.country_code; '
+             'the whole record by default')
+    parser.add_argument(
+        '--no-errors', action='store_true',
+        help="don't write failed lookups to the output")
+    parser.add_argument(
+        '--flush-every', type=int, default=100,
+        help='flush the output and the checkpoint every N results '
+             '(default 100)')
+    parser.add_argument(
+        '-q', '--quiet', action='store_true',
+        help="don't print the summary to stderr")
+    return parser
+
+
+def main(argv=None) -> int:
+    """
+    Entry point of the whoisapi command
+    :return: int - exit status: 0 when every lookup succeeded,
+      1 when some failed, 130 when interrupted
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if not args.api_key:
+        parser.error('an API key is required: pass --api-key or set '
+                     '${}'.format(API_KEY_VARIABLE))
+    if args.workers < 1 or args.flush_every < 1 or args.max_attempts < 1:
+        parser.error('--workers, --flush-every and --max-attempts '
+                     'should be positive')
+
+    checkpoint_path = args.checkpoint
+    if checkpoint_path is None and args.output != '-':
+        checkpoint_path = args.output + '.checkpoint'
+    checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+
+    options = {
+        'api_key': args.api_key,
+        'pool_maxsize': args.workers,
+        'retry': RetryPolicy(max_attempts=args.max_attempts),
+        'adaptive_rate_limit': args.adaptive,
+    }
+    for name in ('url', 'timeout', 'rate_limit'):
+        if getattr(args, name) is not None:
+            options[name] = getattr(args, name)
+    if args.burst is not None:
+        options['rate_limit_burst'] = args.burst
+    fields = [f.strip() for f in args.fields.split(',')] \
+        if args.fields else None
+
+    source = sys.stdin if args.input == '-' \
+        else open(args.input, encoding='utf-8')
+    output = sys.stdout if args.output == '-' \
+        else open(args.output, 'a', encoding='utf-8')
+    exporter = NdjsonExporter(output, fields, chunk_size=args.flush_every,
+                              include_errors=not args.no_errors)
+    looked_up = 0
+    failed = 0
+    status = 0
+    try:
+        with Client(**options) as client:
+            domains = read_domains(
+                source, checkpoint if checkpoint is not None else ())
+            for domain, result in client.data_many(
+                    domains, workers=args.workers, fields=fields):
+                exporter.write((domain, result))
+                looked_up += 1
+                if isinstance(result, Exception):
+                    failed += 1
+                # Error responses are final; other failures are retried
+                # by the next run
+                if checkpoint is not None and (
+                        not isinstance(result, Exception)
+                        or isinstance(result, ResponseError)):
+                    checkpoint.add(domain)
+                if looked_up % args.flush_every == 0:
+                    exporter.flush()
+                    if checkpoint is not None:
+                        checkpoint.flush()
+    except KeyboardInterrupt:
+        status = 130
+    finally:
+        exporter.flush()
+        if checkpoint is not None:
+            checkpoint.close()
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+    if not args.quiet:
+        sys.stderr.write(
+            '{} looked up, {} failed{}\n'.format(
+                looked_up, failed,
+                ', {} completed in total'.format(len(checkpoint))
+                if checkpoint is not None else ''))
+    if status == 0 and failed:
+        status = 1
+    return status
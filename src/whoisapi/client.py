@@ -1,15 +1,33 @@
-from json import loads, JSONDecodeError
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from time import perf_counter
+from requests import RequestException
 
+from .cache.base import BaseCache, cache_key
+from .decoders import JsonDecoder, XmlDecoder, get_decoder
 from .models.request import RequestParameters
 from .net.http import ApiRequester
+from .net.deadline import Deadline
+from .net.singleflight import SingleFlight
 from .models.response import WhoisRecord, ErrorMessage
-from .exceptions.error import ResponseError, UnparsableApiResponseError
+from .models.lazy import LazyWhoisRecord
+from .models.projection import Projection
+from .streaming import TextFieldFilter
+from .store import RecordStore
+from .instrumentation import RequestEvent, notify
+from .exceptions.error import ResponseError, UnparsableApiResponseError, \
+    WhoisApiError
 
 
 class Client:
+    """
+    Whois API client. Requests don't modify the client or the passed
+    RequestParameters, so one instance can be shared by many threads.
+    """
     __default_url = "https://www.whoisxmlapi.com/whoisserver/WhoisService"
-    __parsable_format = 'json'
     _api_requester: ApiRequester or None
+    _cache: BaseCache or None
+    _single_flight: SingleFlight or None
 
     def __init__(self, **kwargs):
         """
@@ -17,12 +35,68 @@ class Client:
         :param kwargs: dict Supported parameters:
         - url: (optional) API endpoint URL; str
         - timeout: (optional) API call timeout in seconds; float
-        One of the following parameters (required):
+        - pool_connections, pool_maxsize, pool_block, max_retries,
+          keep_alive: (optional) connection pool settings,
+          see ApiRequester
+        - rate_limit, rate_limit_burst, adaptive_rate_limit: (optional)
+          client-side rate limiting, see ApiRequester
+        - retry: (optional) retry policy for transient failures;
+          RetryPolicy
+        - credentials: (optional) API keys to spread the requests over
+          instead of api_key. Each key has its own rate limit and keys
+          rejected by the API are skipped for a while. Neither the
+          default nor the per-call RequestParameters may set an API key
+          then; CredentialPool
+        - cache: (optional) response cache for data(), requests with
+          prefer_fresh=1 bypass it; BaseCache
+        - coalesce: (optional) let concurrent lookups of the same domain
+          with equivalent parameters share one API call, default False;
+          bool
+        - lazy: (optional) return LazyWhoisRecord instances that convert
+          fields on first access, default False; bool
+        - decoder: (optional) JSON decoder for data(): 'auto' (orjson if
+          installed), 'json', 'orjson' or a JsonDecoder instance,
+          default 'auto'; str or JsonDecoder
+        - streaming: (optional) read JSON responses of data()
+          incrementally and cut the skip_fields values out while
+          reading, so their size doesn't count towards memory use,
+          default False; bool
+        - skip_fields: (optional) keys cut out in streaming mode, default
+          ('rawText', 'strippedText'). Left out of XML responses in
+          streaming mode or when given explicitly; tuple of str
+        - spill: (optional) callable(path: str) returning a writable
+          binary file for the cut value at the dotted path, e.g.
+          'WhoisRecord.registryData.rawText', or None to drop it; the
+          file is closed once written. Used in streaming mode only
+        - listeners: (optional) callables invoked with a RequestEvent
+          holding the phase timings after every data() call;
+          list of callable
+        - store: (optional) local record store every record fetched by
+          data() is written to; cache hits aren't written again;
+          RecordStore
+        One of the following parameters (required, unless credentials
+        are given):
         - api_key: Your API key; str
         - parameters: RequestParameters
         """
         if 'url' not in kwargs:
             kwargs['url'] = Client.__default_url
+        self.cache = kwargs.pop('cache', None)
+        self._single_flight = SingleFlight() \
+            if kwargs.pop('coalesce', False) else None
+        self._record_class = LazyWhoisRecord \
+            if kwargs.pop('lazy', False) else WhoisRecord
+        self.decoder = kwargs.pop('decoder', 'auto')
+        self._streaming = bool(kwargs.pop('streaming', False))
+        skip_fields = kwargs.pop('skip_fields', None)
+        self._skip_fields = ('rawText', 'strippedText') \
+            if skip_fields is None else tuple(skip_fields)
+        self._spill = kwargs.pop('spill', None)
+        self._xml_decoder = XmlDecoder(
+            self._skip_fields
+            if self._streaming or skip_fields is not None else ())
+        self._listeners = tuple(kwargs.pop('listeners', ()))
+        self.store = kwargs.pop('store', None)
         self.api_requester = ApiRequester(**kwargs)
 
     @property
@@ -41,6 +115,54 @@ class Client:
     def api_requester(self, value: ApiRequester):
         self._api_requester = value
 
+    @property
+    def cache(self) -> BaseCache or None:
+        return self._cache
+
+    @cache.setter
+    def cache(self, value: BaseCache or None):
+        if value is None or isinstance(value, BaseCache):
+            self._cache = value
+        else:
+            raise TypeError("cache should be an instance of BaseCache class")
+
+    @property
+    def store(self) -> RecordStore or None:
+        return self._store
+
+    @store.setter
+    def store(self, value: RecordStore or None):
+        if value is None or isinstance(value, RecordStore):
+            self._store = value
+        else:
+            raise TypeError(
+                "store should be an instance of RecordStore class")
+
+    @property
+    def decoder(self) -> JsonDecoder:
+        return self._decoder
+
+    @decoder.setter
+    def decoder(self, value: str or JsonDecoder):
+        self._decoder = get_decoder(value)
+
+    @property
+    def single_flight(self) -> SingleFlight or None:
+        """Request coalescing state, None when coalescing is off"""
+        return self._single_flight
+
+    @property
+    def listeners(self) -> tuple:
+        return self._listeners
+
+    @listeners.setter
+    def listeners(self, value):
+        self._listeners = tuple(value)
+
+    @property
+    def streaming(self) -> bool:
+        return self._streaming
+
     @property
     def timeout(self) -> float:
         return self._api_requester.timeout
@@ -49,39 +171,271 @@ class Client:
     def timeout(self, value: float):
         self._api_requester.timeout = value
 
+    def close(self):
+        """Release the pooled connections of the underlying requester"""
+        self._api_requester.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def data(self, domain: str,
-             params: RequestParameters or None = None) -> WhoisRecord:
+             params: RequestParameters or None = None,
+             fields=None, budget: float or None = None,
+             deadline: Deadline or float or None = None) -> WhoisRecord:
         """
-        Get parsed whois data from the API
+        Get parsed whois data from the API.
+        In streaming mode the cut fields are empty strings in the result
+        and in the cache. XML responses are parsed incrementally into the
+        same models; the skip_fields are left out of them in streaming
+        mode or when given explicitly, which otherwise applies to JSON
+        responses only.
         :param domain: str - the domain name
-        :param params: RequestParameters instance (optional)
+        :param params: RequestParameters instance (optional), requests
+          with output_format='XML' get an XML response
+        :param fields: (optional) build only these fields, e.g.
+          ['expires_date', 'registrant.country_code'];
+          list of str or Projection
+        :param budget: (optional) seconds the whole call may take,
+          including rate limiting, retries and reading the body; float
+        :param deadline: (optional) Deadline or time.monotonic() value
+          the call has to finish by; the earlier of budget and deadline
+          applies. Lookups with a deadline aren't coalesced
         :return: WhoisRecord
         :raises
         - base class is whoisapi.exceptions.WhoisApiError
+          - DeadlineExceededError -- the budget or deadline ran out
           - ResponseError -- the response contain ErrorMessage
           - UnparsableApiResponseError -- the response couldn't be parsed
           - ApiAuthError -- Server returns 401 HTTP code
+          - RateLimitError -- Server returns 429 HTTP code
           - HttpApiError -- HTTP code is not 2xx or 401
         - ConnectionError
         """
         if params is None:
             params = self._api_requester.parameters
-        params.output_format = Client.__parsable_format
-        response = self._api_requester.get_data(domain, params)
+        if fields is not None and not isinstance(fields, Projection):
+            fields = Projection(fields)
+        deadline = Deadline.of(budget, deadline)
+        if not self._listeners:
+            return self._data(domain, params, fields, None, deadline)
+
+        event = RequestEvent(domain)
+        start = perf_counter()
+        try:
+            return self._data(domain, params, fields, event, deadline)
+        except Exception as error:
+            event.error = error
+            raise
+        finally:
+            event.total = perf_counter() - start
+            notify(self._listeners, event)
+
+    def _data(self, domain: str, params: RequestParameters,
+              fields: Projection or None = None,
+              event: RequestEvent or None = None,
+              deadline: Deadline or None = None) -> WhoisRecord:
+        decoder = self._decoder_for(params)
+        if self._cache is None:
+            response = self._fetch(domain, params, as_bytes=True,
+                                   event=event, deadline=deadline)
+            record = self._parse(response, decoder, fields, event, deadline)
+            self._write_through(domain, params, response, record, fields)
+            return record
+
+        key = cache_key(domain, params)
+        if params.prefer_fresh:
+            self._cache.stats.record_bypass()
+        else:
+            response = self._cache.get(key)
+            if response is not None:
+                if event is not None:
+                    event.cached = True
+                    event.size = len(response)
+                return self._parse(response, decoder, fields, event)
+
+        response = self._fetch(domain, params, key, True, event, deadline)
+        record = self._parse(response, decoder, fields, event, deadline)
+        self._cache.set(key, response)
+        self._write_through(domain, params, response, record, fields)
+        return record
+
+    def _write_through(self, domain: str, params: RequestParameters,
+                       response: bytes, record: WhoisRecord,
+                       fields: Projection or None = None):
+        if self._store is not None:
+            self._store.put(domain, response, params.output_format,
+                            record if fields is None else None)
+
+    @staticmethod
+    def _is_xml(params: RequestParameters) -> bool:
+        return params.output_format.lower() == 'xml'
+
+    def _decoder_for(self, params: RequestParameters):
+        return self._xml_decoder if Client._is_xml(params) \
+            else self._decoder
+
+    def _fetch(self, domain: str, params: RequestParameters,
+               key: str or None = None,
+               as_bytes: bool = False,
+               event: RequestEvent or None = None,
+               deadline: Deadline or None = None) -> str or bytes:
+        get = self._get_filtered \
+            if as_bytes and self._streaming and not Client._is_xml(params) \
+            else self._api_requester.get_data
+        if deadline is not None:
+            return get(domain, params, as_bytes, event, deadline)
+        if self._single_flight is None:
+            return get(domain, params, as_bytes, event)
+        # the cache key leaves out the API key and prefer_fresh, calls
+        # only share a response when those match too
+        return self._single_flight.do(
+            (key or cache_key(domain, params), params.api_key,
+             params.prefer_fresh, as_bytes),
+            get, domain, params, as_bytes, event)
+
+    def _get_filtered(self, domain: str, params: RequestParameters,
+                      as_bytes: bool = True,
+                      event: RequestEvent or None = None,
+                      deadline: Deadline or None = None) -> bytes:
+        text_filter = TextFieldFilter(self._skip_fields, self._spill)
+        chunks = self._api_requester.iter_data(
+            domain, params, event=event, deadline=deadline)
+        start = perf_counter() if event is not None else None
+        size = 0
         try:
-            parsed = loads(str(response))
-            if 'ErrorMessage' in parsed:
-                error = ErrorMessage(parsed['ErrorMessage'])
-                raise ResponseError(response, error)
-            if 'WhoisRecord' in parsed:
-                return WhoisRecord(parsed['WhoisRecord'])
+            for chunk in chunks:
+                size += len(chunk)
+                text_filter.feed(chunk)
+        finally:
+            response = text_filter.close()
+        if event is not None:
+            event.transfer = perf_counter() - start
+            event.size = size
+        return response
+
+    def data_many(self, domains, params: RequestParameters or None = None,
+                  workers: int = 10, ordered: bool = False, progress=None,
+                  fields=None, budget: float or None = None):
+        """
+        Look up many domains in parallel over the shared connection pool.
+        At most 2 * workers lookups are queued at once, so any iterable,
+        including a lazy one, can be passed.
+        Keep pool_maxsize >= workers to avoid throw-away connections.
+
+        :param domains: iterable of domain names
+        :param params: RequestParameters instance (optional)
+        :param workers: int - number of worker threads
+        :param ordered: bool - yield results in input order instead of
+          completion order
+        :param progress: (optional) callable(completed: int, failed: int)
+          invoked after each lookup
+        :param fields: (optional) build only these fields, see data()
+        :param budget: (optional) seconds each lookup may take, counted
+          from when a worker starts it, see data(); float
+        :return: generator of (domain, WhoisRecord or exception) tuples.
+          WhoisApiError and requests.RequestException are yielded instead
+          of being raised, so one failed domain does not abort the batch.
+        """
+        if workers is None or int(workers) < 1:
+            raise ValueError("'workers' should be positive.")
+        workers = int(workers)
+        if fields is not None and not isinstance(fields, Projection):
+            fields = Projection(fields)
+        if budget is not None and budget <= 0:
+            raise ValueError("The time budget should be positive.")
+        domains = iter(domains)
+        completed = 0
+        failed = 0
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < 2 * workers:
+                    try:
+                        domain = next(domains)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending.append((domain, executor.submit(
+                        self._lookup, domain, params, fields, budget)))
+                if not pending:
+                    return
+
+                if ordered:
+                    done = [pending.popleft()]
+                else:
+                    finished, _ = wait([f for _, f in pending],
+                                       return_when=FIRST_COMPLETED)
+                    done = [p for p in pending if p[1] in finished]
+                    for item in done:
+                        pending.remove(item)
+
+                for domain, future in done:
+                    result = future.result()
+                    completed += 1
+                    if isinstance(result, Exception):
+                        failed += 1
+                    if progress is not None:
+                        progress(completed, failed)
+                    yield domain, result
+
+    def _lookup(self, domain: str, params: RequestParameters or None,
+                fields: Projection or None = None,
+                budget: float or None = None):
+        try:
+            return self.data(domain, params, fields, budget)
+        except (WhoisApiError, RequestException) as error:
+            return error
+
+    def _parse(self, response: str or bytes, decoder,
+               projection: Projection or None = None,
+               event: RequestEvent or None = None,
+               deadline: Deadline or None = None) -> WhoisRecord:
+        if deadline is not None:
+            deadline.check('parsing')
+        return Client._parse_response(
+            response, decoder, self._record_class, projection, event)
+
+    @staticmethod
+    def _parse_response(response: str or bytes,
+                        decoder: JsonDecoder or XmlDecoder,
+                        record_class=WhoisRecord,
+                        projection: Projection or None = None,
+                        event: RequestEvent or None = None) -> WhoisRecord:
+        start = perf_counter() if event is not None else None
+        try:
+            parsed = decoder.decode(response)
+        except decoder.errors as error:
+            raise UnparsableApiResponseError("Could not parse API response", error)
+        if event is not None:
+            decoded = perf_counter()
+            event.decode = decoded - start
+
+        if type(parsed) is not dict:
             raise UnparsableApiResponseError(
                 "Could not find a correct root element.", None)
-        except JSONDecodeError as error:
-            raise UnparsableApiResponseError("Could not parse API response", error)
+        if 'ErrorMessage' in parsed:
+            error = ErrorMessage(parsed['ErrorMessage'])
+            if isinstance(response, bytes):
+                response = response.decode('utf-8', 'replace')
+            raise ResponseError(response, error)
+        if 'WhoisRecord' in parsed:
+            if projection is not None:
+                record = projection.build(parsed['WhoisRecord'])
+            else:
+                record = record_class(parsed['WhoisRecord'])
+            if event is not None:
+                event.build = perf_counter() - decoded
+            return record
+        raise UnparsableApiResponseError(
+            "Could not find a correct root element.", None)
 
     def raw_data(self, domain: str,
                  params: RequestParameters or None = None) -> str:
         if params is None:
             params = self._api_requester.parameters
-        return self._api_requester.get_data(domain, params)
+        return self._fetch(domain, params)
@@ -0,0 +1,123 @@
+import json
+from xml.etree.ElementTree import XMLPullParser, ParseError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JsonDecoder:
+    """
+    Decodes a JSON response body given as bytes or str.
+    Subclasses set `errors` to the exceptions signalling malformed input.
+    """
+    name = ''
+    errors = (ValueError,)
+
+    def decode(self, data: bytes or str):
+        raise NotImplementedError
+
+
+class StdlibJsonDecoder(JsonDecoder):
+    """The json module of the standard library"""
+    name = 'json'
+    errors = (ValueError,)
+
+    def decode(self, data: bytes or str):
+        return json.loads(data)
+
+
+class OrjsonDecoder(JsonDecoder):
+    """orjson, decodes bytes without an intermediate str"""
+    name = 'orjson'
+    errors = (ValueError,)
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError(
+                "OrjsonDecoder requires orjson. "
+                "Install it with: pip install whois-api[fast]")
+
+    def decode(self, data: bytes or str):
+        return orjson.loads(data)
+
+
+_decoders = {
+    'json': StdlibJsonDecoder,
+    'orjson': OrjsonDecoder,
+}
+
+
+def get_decoder(decoder: str or JsonDecoder or None = None) -> JsonDecoder:
+    """
+    :param decoder: decoder name ('auto', 'json' or 'orjson') or instance.
+      'auto' and None pick the fastest installed decoder.
+    :return: JsonDecoder
+    """
+    if isinstance(decoder, JsonDecoder):
+        return decoder
+    if decoder is None or decoder == 'auto':
+        return OrjsonDecoder() if orjson is not None else StdlibJsonDecoder()
+    if decoder in _decoders:
+        return _decoders[decoder]()
+    raise ValueError("Unknown JSON decoder: {}".format(decoder))
+
+
+class XmlDecoder:
+    """
+    Decodes an XML response body into the dict the JSON output decodes
+    to, e.g. {'WhoisRecord': {...}}, so the same models are built from
+    it. Values are strings, the models convert them.
+
+    The body is fed to a pull parser in chunks and every element is
+    converted and cleared as soon as it ends, so the element tree of the
+    whole body is never held. Elements named in skip_keys, none by
+    default, are left out.
+    """
+    name = 'xml'
+    errors = (ParseError, ValueError)
+    chunk_size = 16384
+
+    def __init__(self, skip_keys=(), list_keys=('hostNames', 'ips')):
+        """
+
+        :param skip_keys: (optional) element names to leave out,
+          with their content, e.g. ('rawText', 'strippedText');
+          iterable of str
+        :param list_keys: (optional) element names whose children are
+          list items; iterable of str
+        """
+        self.skip_keys = frozenset(skip_keys)
+        self.list_keys = frozenset(list_keys)
+
+    def decode(self, data: bytes or str) -> dict:
+        parser = XMLPullParser(('end',))
+        root = None
+        for start in range(0, len(data), self.chunk_size):
+            parser.feed(data[start:start + self.chunk_size])
+            root = self._convert(parser, root)
+        parser.close()
+        root = self._convert(parser, root)
+        return {root.tag: root.text}
+
+    def _convert(self, parser: XMLPullParser, element):
+        """
+        Replace the text of every ended element with its value: a list
+        for the list_keys, a dict of the children for other elements
+        with children, the text for leaves. Children are dropped once
+        converted.
+        :return: the last ended element, the passed one if none ended
+        """
+        skip_keys = self.skip_keys
+        for _, element in parser.read_events():
+            if element.tag in self.list_keys:
+                value = [child.text for child in element]
+            elif len(element):
+                value = {child.tag: child.text for child in element
+                         if child.tag not in skip_keys}
+            else:
+                value = element.text or ''
+            element.clear()
+            element.text = value
+        return element
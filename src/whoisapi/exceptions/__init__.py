@@ -1,6 +1,8 @@
 __all__ = ['ParameterError', 'HttpApiError', 'WhoisApiError',
            'ApiAuthError', 'ResponseError', 'EmptyApiKeyError',
-           'UnparsableApiResponseError']
+           'UnparsableApiResponseError', 'RateLimitError',
+           'DeadlineExceededError']
 
 from .error import ParameterError, HttpApiError, WhoisApiError, \
-    ApiAuthError, ResponseError, EmptyApiKeyError, UnparsableApiResponseError
+    ApiAuthError, ResponseError, EmptyApiKeyError, \
+    UnparsableApiResponseError, RateLimitError, DeadlineExceededError
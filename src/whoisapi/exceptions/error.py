@@ -56,4 +56,32 @@ class ApiAuthError(WhoisApiError):
 
 
 class HttpApiError(WhoisApiError):
+    def __init__(self, message, status_code=None):
+        self.message = message
+        self.status_code = status_code
+
+    @property
+    def status_code(self):
+        return self._status_code
+
+    @status_code.setter
+    def status_code(self, value):
+        self._status_code = value
+
+
+class RateLimitError(HttpApiError):
+    def __init__(self, message, retry_after):
+        super().__init__(message, 429)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after(self):
+        return self._retry_after
+
+    @retry_after.setter
+    def retry_after(self, value):
+        self._retry_after = value
+
+
+class DeadlineExceededError(WhoisApiError):
     pass
@@ -0,0 +1,228 @@
+import csv
+import datetime
+import json
+from .models.base import BaseModel
+from .models.response import _field_map
+from .exceptions.error import WhoisApiError, ResponseError
+
+DEFAULT_FIELDS = (
+    'domain_name',
+    'created_date',
+    'updated_date',
+    'expires_date',
+    'registrar_name',
+    'registrant.country_code',
+    'domain_availability',
+)
+
+
+_UNSET = object()
+
+
+def record_to_dict(model: BaseModel) -> dict:
+    """Convert a response model and its nested models to a dict; fields
+    left unset by a Projection are omitted"""
+    result = {}
+    for name in _field_map(type(model)):
+        value = getattr(model, name, _UNSET)
+        if value is _UNSET:
+            continue
+        result[name] = record_to_dict(value) \
+            if isinstance(value, BaseModel) else value
+    return result
+
+
+def resolve_field(model: BaseModel, path: str):
+    """
+    Get a dotted attribute path such as 'registrant.country_code'
+    :return: the value, None if a model on the path is missing
+    """
+    value = model
+    for name in path.split('.'):
+        if value is None:
+            return None
+        value = getattr(value, name)
+    if isinstance(value, BaseModel):
+        return record_to_dict(value)
+    return value
+
+
+def _error_text(error: Exception) -> str:
+    if isinstance(error, ResponseError) and error.parsed_message is not None:
+        return error.parsed_message.msg or error.parsed_message.error_code
+    if isinstance(error, WhoisApiError):
+        return str(error.message)
+    return '{}: {}'.format(type(error).__name__, error)
+
+
+def _json_default(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise TypeError("Unserializable value: {!r}".format(value))
+
+
+class BaseExporter:
+    """
+    Writes lookup results to a text file one by one, so memory use
+    doesn't grow with the number of results.
+
+    Accepted items: WhoisRecord instances and (domain, result) tuples as
+    yielded by Client.data_many, where result is a WhoisRecord or an
+    exception.
+    """
+
+    def __init__(self, file, fields=None, chunk_size: int = 100,
+                 include_errors: bool = True):
+        """
+
+        :param file: writable text file
+        :param fields: (optional) attribute paths to write, e.g.
+          ['domain_name', 'registrant.country_code']; list of str
+        :param chunk_size: (optional) flush the file every chunk_size
+          rows; int
+        :param include_errors: (optional) write a row for failed
+          lookups, default True; bool
+        """
+        if chunk_size is None or int(chunk_size) < 1:
+            raise ValueError("'chunk_size' should be positive.")
+        self._file = file
+        self.fields = tuple(fields) if fields is not None else None
+        self.chunk_size = int(chunk_size)
+        self.include_errors = include_errors
+        self.written = 0
+        self.errors = 0
+        self._pending = 0
+
+    def write(self, item):
+        if isinstance(item, tuple):
+            domain, result = item
+        else:
+            domain, result = None, item
+
+        if isinstance(result, Exception):
+            self.errors += 1
+            if not self.include_errors:
+                return
+            self._write_error(domain or '', _error_text(result))
+        else:
+            self._write_record(result)
+
+        self.written += 1
+        self._pending += 1
+        if self._pending >= self.chunk_size:
+            self.flush()
+
+    def write_all(self, items) -> int:
+        """Write every item of an iterable
+        :return: int - number of rows written"""
+        for item in items:
+            self.write(item)
+        self.flush()
+        return self.written
+
+    def flush(self):
+        self._pending = 0
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _write_record(self, record: BaseModel):
+        raise NotImplementedError
+
+    def _write_error(self, domain: str, error: str):
+        raise NotImplementedError
+
+
+class NdjsonExporter(BaseExporter):
+    """
+    One JSON object per line. Without fields the whole record is
+    written, nested models as objects.
+    """
+
+    def _dump(self, value: dict):
+        self._file.write(json.dumps(
+            value, default=_json_default, ensure_ascii=False,
+            separators=(',', ':')))
+        self._file.write('\n')
+
+    def _write_record(self, record: BaseModel):
+        if self.fields is None:
+            self._dump(record_to_dict(record))
+        else:
+            self._dump({f: resolve_field(record, f) for f in self.fields})
+
+    def _write_error(self, domain: str, error: str):
+        self._dump({'domain_name': domain, 'error': error})
+
+
+class CsvExporter(BaseExporter):
+    """
+    One row per result with a header line. Uses DEFAULT_FIELDS when no
+    fields are given; an 'error' column is added when errors are written.
+    """
+
+    def __init__(self, file, fields=None, chunk_size: int = 100,
+                 include_errors: bool = True, **csv_options):
+        """
+        See BaseExporter; csv_options are passed to csv.writer.
+        The file should be opened with newline=''.
+        """
+        super().__init__(file, fields or DEFAULT_FIELDS, chunk_size,
+                         include_errors)
+        self._writer = csv.writer(file, **csv_options)
+        header = list(self.fields)
+        if include_errors:
+            header.append('error')
+        self._writer.writerow(header)
+
+    @staticmethod
+    def _cell(value) -> str:
+        if value is None:
+            return ''
+        if isinstance(value, bool):
+            return 'true' if value else 'false'
+        if isinstance(value, datetime.datetime):
+            return value.isoformat()
+        if isinstance(value, list):
+            return ';'.join(str(v) for v in value)
+        if isinstance(value, dict):
+            return json.dumps(value, default=_json_default)
+        return str(value)
+
+    def _write_record(self, record: BaseModel):
+        row = [CsvExporter._cell(resolve_field(record, f))
+               for f in self.fields]
+        if self.include_errors:
+            row.append('')
+        self._writer.writerow(row)
+
+    def _write_error(self, domain: str, error: str):
+        row = [domain if f == 'domain_name' else '' for f in self.fields]
+        row.append(error)
+        self._writer.writerow(row)
+
+
+def export(results, file, format: str = 'ndjson', fields=None,
+           chunk_size: int = 100, include_errors: bool = True) -> int:
+    """
+    Stream lookup results to a file
+    :param results: iterable of WhoisRecord or (domain, result) tuples
+    :param file: writable text file
+    :param format: 'ndjson' or 'csv'
+    :param fields: (optional) attribute paths to write; list of str
+    :param chunk_size: (optional) flush the file every chunk_size rows
+    :param include_errors: (optional) write a row for failed lookups
+    :return: int - number of rows written
+    """
+    exporters = {'ndjson': NdjsonExporter, 'csv': CsvExporter}
+    if format not in exporters:
+        raise ValueError("Format should be 'ndjson' or 'csv'.")
+    exporter = exporters[format](file, fields, chunk_size, include_errors)
+    return exporter.write_all(results)
@@ -0,0 +1,126 @@
+import logging
+
+PHASES = ('queue', 'ttfb', 'transfer', 'decode', 'build')
+
+
+class RequestEvent:
+    """
+    Timings of one Client.data call, passed to the client listeners.
+    Durations are in seconds, None when the phase didn't happen:
+    - queue: waiting for the rate limiter, summed over attempts
+    - ttfb: from sending the request to receiving the response headers,
+      including connection acquire and connect, of the last attempt
+    - transfer: reading the response body
+    - decode: decoding the JSON or XML body
+    - build: WhoisRecord construction
+    - total: the whole call
+    Other fields:
+    - domain: the looked up domain name
+    - status: HTTP status code of the last attempt
+    - size: response body size in bytes
+    - attempts: number of API calls made; 0 for cache hits and calls
+      answered by a concurrent identical request
+    - cached: the response came from the cache
+    - error: the raised exception
+    """
+    __slots__ = ('domain', 'status', 'size', 'attempts', 'cached', 'error',
+                 'queue', 'ttfb', 'transfer', 'decode', 'build', 'total')
+
+    def __init__(self, domain: str):
+        self.domain = domain
+        self.status = None
+        self.size = None
+        self.attempts = 0
+        self.cached = False
+        self.error = None
+        self.queue = 0.0
+        self.ttfb = None
+        self.transfer = None
+        self.decode = None
+        self.build = None
+        self.total = None
+
+    @property
+    def retries(self) -> int:
+        return max(self.attempts - 1, 0)
+
+    def __repr__(self):
+        return 'RequestEvent({})'.format(', '.join(
+            '{}={!r}'.format(name, getattr(self, name))
+            for name in RequestEvent.__slots__))
+
+
+def notify(listeners, event: RequestEvent,
+           logger=logging.getLogger("whois-api-instrumentation")):
+    """Pass the event to every listener; failing listeners are logged
+    and don't affect the request"""
+    for listener in listeners:
+        try:
+            listener(event)
+        except Exception:
+            logger.exception("Request listener %r failed", listener)
+
+
+class PrometheusListener:
+    """
+    Exports request events as prometheus_client metrics:
+    - <prefix>_requests_total{outcome}: counter; outcome is 'ok',
+      'cached' or the exception class name
+    - <prefix>_retries_total: counter
+    - <prefix>_phase_seconds{phase}: histogram of PHASES and 'total'
+    - <prefix>_response_bytes: histogram
+
+    Usage: Client(api_key=..., listeners=[PrometheusListener()])
+    """
+
+    def __init__(self, prefix: str = 'whoisapi', registry=None,
+                 buckets=None):
+        """
+
+        :param prefix: (optional) metric name prefix; str
+        :param registry: (optional) prometheus_client CollectorRegistry,
+          the default registry if not set
+        :param buckets: (optional) histogram buckets of phase durations
+          in seconds
+        """
+        try:
+            import prometheus_client
+        except ImportError:
+            raise ImportError(
+                "PrometheusListener requires prometheus_client. "
+                "Install it with: pip install whois-api[prometheus]") \
+                from None
+        options = {}
+        if registry is not None:
+            options['registry'] = registry
+        seconds_options = dict(options)
+        if buckets is not None:
+            seconds_options['buckets'] = buckets
+
+        self.requests = prometheus_client.Counter(
+            prefix + '_requests_total', 'Whois API lookups',
+            ['outcome'], **options)
+        self.retries = prometheus_client.Counter(
+            prefix + '_retries_total', 'Whois API call retries', **options)
+        self.phases = prometheus_client.Histogram(
+            prefix + '_phase_seconds', 'Whois API lookup phase durations',
+            ['phase'], **seconds_options)
+        self.sizes = prometheus_client.Histogram(
+            prefix + '_response_bytes', 'Whois API response body sizes',
+            buckets=(1024, 4096, 16384, 65536, 262144, 1048576),
+            **options)
+
+    def __call__(self, event: RequestEvent):
+        if event.error is not None:
+            outcome = type(event.error).__name__
+        else:
+            outcome = 'cached' if event.cached else 'ok'
+        self.requests.labels(outcome).inc()
+        if event.retries:
+            self.retries.inc(event.retries)
+        for phase in PHASES + ('total',):
+            value = getattr(event, phase)
+            if value is not None and (phase != 'queue' or event.attempts):
+                self.phases.labels(phase).observe(value)
+        if event.size is not None:
+            self.sizes.observe(event.size)
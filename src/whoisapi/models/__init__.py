@@ -1,6 +1,18 @@
 __all__ = ['RequestParameters', 'Record', 'WhoisRecord', 'ErrorMessage',
-           'RegistryData', 'Registrant', 'Contact']
+           'RegistryData', 'Registrant', 'Contact', 'LazyWhoisRecord',
+           'Projection', 'WhoisRecordBatch']
 
 from .request import RequestParameters
 from .response import Record, WhoisRecord, ErrorMessage, Contact, \
     Registrant, RegistryData
+from .lazy import LazyWhoisRecord
+from .projection import Projection
+
+
+def __getattr__(name):
+    # imported on first use, the batch module isn't needed by lookups
+    if name == 'WhoisRecordBatch':
+        from .batch import WhoisRecordBatch
+        return WhoisRecordBatch
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name))
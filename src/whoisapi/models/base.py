@@ -1,21 +1,83 @@
+_UNSET = object()
+
+
 class BaseModel:
+    __slots__ = ()
+
+    _attribute_names_cache = {}
+    _field_names_cache = {}
+
     def __init__(self):
         pass
 
+    @classmethod
+    def _slot_names(cls) -> tuple:
+        names = BaseModel._attribute_names_cache.get(cls)
+        if names is None:
+            names = []
+            for klass in reversed(cls.__mro__):
+                slots = klass.__dict__.get('__slots__', ())
+                if isinstance(slots, str):
+                    slots = (slots,)
+                for name in slots:
+                    if name not in names and name != '__dict__':
+                        names.append(name)
+            names = tuple(names)
+            BaseModel._attribute_names_cache[cls] = names
+        return names
+
+    @classmethod
+    def _field_names(cls) -> tuple:
+        """Names of the fields declared in _fields by the class and its
+        bases, every slot for models declaring none"""
+        names = BaseModel._field_names_cache.get(cls)
+        if names is None:
+            names = []
+            for klass in reversed(cls.__mro__):
+                for field in klass.__dict__.get('_fields', ()):
+                    if field[0] not in names:
+                        names.append(field[0])
+            names = tuple(names) or cls._slot_names()
+            BaseModel._field_names_cache[cls] = names
+        return names
+
+    def _attributes(self):
+        """Set attributes as (name, value) pairs, slots first"""
+        for name in self._slot_names():
+            try:
+                yield name, getattr(self, name)
+            except AttributeError:
+                pass
+        instance_dict = getattr(self, '__dict__', None)
+        if instance_dict:
+            yield from instance_dict.items()
+
     def __str__(self):
         result = {}
-        for k, v in self.__dict__.items():
+        for k, v in self._attributes():
             result[k] = str(v)
         return str(result)
 
     def __eq__(self, other):
-        is_equal = isinstance(other, self.__class__)
-        for k, v in self.__dict__.values():
-            is_equal = is_equal and (other.__dict__.get(k) == v)
-
-        return is_equal
+        # a lazily built record equals the one built from the same values
+        if isinstance(other, self.__class__):
+            names = self._field_names()
+        elif isinstance(self, other.__class__):
+            names = other._field_names()
+        else:
+            return False
+        return all(getattr(self, name, _UNSET) == getattr(other, name, _UNSET)
+                   for name in names)
 
     def __getitem__(self, item):
-        if type(item) is str and item in self.__dict__:
-            return self.__dict__[item]
+        if type(item) is str:
+            if item in self._slot_names():
+                try:
+                    return getattr(self, item)
+                except AttributeError:
+                    pass
+            else:
+                instance_dict = getattr(self, '__dict__', None)
+                if instance_dict is not None and item in instance_dict:
+                    return instance_dict[item]
         raise KeyError("Invalid key: {}".format(item))
@@ -0,0 +1,402 @@
+import calendar
+import datetime
+import importlib
+import sys
+from array import array
+from .response import WhoisRecord, ErrorMessage, _field_map, \
+    _datetime_value, _int_value, _string_value, _availability_value
+from ..decoders import get_decoder
+from ..exceptions.error import ResponseError, UnparsableApiResponseError
+
+DEFAULT_FIELDS = (
+    'domain_name',
+    'created_date',
+    'updated_date',
+    'expires_date',
+    'registrar_name',
+    'registrant.country_code',
+    'domain_availability',
+)
+
+# String attributes with few distinct values, stored as codes into a
+# table of the distinct values
+DICTIONARY_ATTRIBUTES = frozenset((
+    'registrar_name', 'registrar_ianaid', 'whois_server', 'country',
+    'country_code', 'state', 'domain_name_ext', 'status', 'data_error',
+    'domain_availability_raw',
+))
+
+# Null of the int64 columns; numpy reads it as NaT in date columns
+NULL = -2 ** 63
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _require(name: str):
+    """Import numpy or pandas on first use, they're optional and slow
+    to import"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        raise ImportError(
+            "WhoisRecordBatch.to_{}() requires {}. "
+            "Install it with: pip install whois-api[analytics]".format(
+                name, name)) from None
+
+
+class _Int64Column:
+    __slots__ = ('data',)
+
+    def __init__(self):
+        self.data = array('q')
+
+    def append(self, value):
+        self.data.append(NULL if value is None else value)
+
+    def value(self, index: int):
+        value = self.data[index]
+        return None if value == NULL else value
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) * self.data.itemsize
+
+    def to_numpy(self):
+        numpy = _require('numpy')
+        return numpy.frombuffer(self.data, dtype=numpy.int64).copy()
+
+    def to_pandas(self):
+        pandas = _require('pandas')
+        values = self.to_numpy()
+        return pandas.arrays.IntegerArray(values, values == NULL)
+
+
+class _DateColumn(_Int64Column):
+    """Seconds since the epoch, naive dates are taken as UTC"""
+    __slots__ = ()
+
+    def append(self, value: datetime.datetime or None):
+        self.data.append(NULL if value is None
+                         else calendar.timegm(value.utctimetuple()))
+
+    def value(self, index: int) -> datetime.datetime or None:
+        value = self.data[index]
+        if value == NULL:
+            return None
+        return _EPOCH + datetime.timedelta(seconds=value)
+
+    def to_numpy(self):
+        return super().to_numpy().view('datetime64[s]')
+
+    def to_pandas(self):
+        pandas = _require('pandas')
+        return pandas.DatetimeIndex(self.to_numpy()).tz_localize('UTC')
+
+
+class _TriStateColumn(_Int64Column):
+    """1 for True, 0 for False, -1 for None"""
+    __slots__ = ()
+
+    def __init__(self):
+        self.data = array('b')
+
+    def append(self, value: bool or None):
+        self.data.append(-1 if value is None else int(value))
+
+    def value(self, index: int) -> bool or None:
+        value = self.data[index]
+        return None if value < 0 else bool(value)
+
+    def to_numpy(self):
+        numpy = _require('numpy')
+        return numpy.frombuffer(self.data, dtype=numpy.int8).copy()
+
+    def to_pandas(self):
+        pandas = _require('pandas')
+        values = self.to_numpy()
+        return pandas.arrays.BooleanArray(values == 1, values < 0)
+
+
+class _StringColumn:
+    __slots__ = ('data',)
+
+    def __init__(self):
+        self.data = []
+
+    def append(self, value: str or None):
+        self.data.append(value)
+
+    def value(self, index: int) -> str or None:
+        return self.data[index]
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.data) + sum(
+            sys.getsizeof(v) for v in self.data if v is not None)
+
+    def to_numpy(self):
+        numpy = _require('numpy')
+        values = numpy.empty(len(self.data), dtype=object)
+        values[:] = self.data
+        return values
+
+    def to_pandas(self):
+        return self.to_numpy()
+
+
+class _DictionaryColumn:
+    """Codes into the table of distinct values, -1 for None"""
+    __slots__ = ('codes', 'categories', '_index')
+
+    def __init__(self):
+        self.codes = array('i')
+        self.categories = []
+        self._index = {}
+
+    def append(self, value: str or None):
+        if value is None:
+            self.codes.append(-1)
+            return
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.categories)
+            self.categories.append(value)
+        self.codes.append(code)
+
+    def value(self, index: int) -> str or None:
+        code = self.codes[index]
+        return None if code < 0 else self.categories[code]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.codes) * self.codes.itemsize \
+            + sys.getsizeof(self.categories) \
+            + sum(sys.getsizeof(v) for v in self.categories)
+
+    def to_numpy(self):
+        numpy = _require('numpy')
+        table = numpy.empty(len(self.categories) + 1, dtype=object)
+        table[:-1] = self.categories
+        return table[numpy.frombuffer(self.codes, dtype=numpy.int32)]
+
+    def to_pandas(self):
+        numpy = _require('numpy')
+        pandas = _require('pandas')
+        return pandas.Categorical.from_codes(
+            numpy.frombuffer(self.codes, dtype=numpy.int32).copy(),
+            self.categories)
+
+
+_COLUMN_TYPES = {
+    _datetime_value: _DateColumn,
+    _int_value: _Int64Column,
+    _availability_value: _TriStateColumn,
+    _string_value: _StringColumn,
+}
+
+
+class WhoisRecordBatch:
+    """
+    Column store of many records, built from the decoded responses
+    without creating WhoisRecord objects.
+
+    Fields are WhoisRecord attribute paths as in Projection, e.g.
+    'registrant.country_code'; they should end at a scalar field. Column
+    types follow the field types:
+    - dates: array of int64 seconds since the epoch, NULL when missing
+    - ints: array of int64
+    - domain_availability: array of int8; 1, 0, or -1 when unknown
+    - strings: list of str, or int32 codes into a table of the distinct
+      values for the DICTIONARY_ATTRIBUTES
+    Fields under a missing nested model, e.g. no 'registrant', are null.
+
+    Usage:
+        batch = WhoisRecordBatch.from_responses(bodies)
+        batch.column('expires_date')    # array('q', [...])
+        batch.to_pandas()               # requires pandas
+    """
+
+    def __init__(self, fields=DEFAULT_FIELDS, dictionary=None):
+        """
+
+        :param fields: (optional) attribute paths of the columns;
+          iterable of str
+        :param dictionary: (optional) string fields to dictionary-encode,
+          by default the ones ending with one of DICTIONARY_ATTRIBUTES;
+          iterable of str
+        """
+        self.fields = tuple(fields)
+        if not self.fields:
+            raise ValueError("At least one field is required.")
+        if len(set(self.fields)) != len(self.fields):
+            raise ValueError("Fields should be unique.")
+        if dictionary is not None:
+            dictionary = frozenset(dictionary)
+        self._plan = tuple(
+            WhoisRecordBatch._compile(path, dictionary)
+            for path in self.fields)
+        self._columns = {path: column for path, _, _, _, column
+                         in self._plan}
+        self.skipped = 0
+        self._size = 0
+
+    @staticmethod
+    def _compile(path: str, dictionary: frozenset or None) -> tuple:
+        """
+        :return: tuple (path, nested keys, key, converter, column)
+        """
+        model_class = WhoisRecord
+        names = path.split('.')
+        nested = []
+        for name in names[:-1]:
+            field = _field_map(model_class).get(name)
+            if field is None or not hasattr(field[1], 'model_class'):
+                raise ValueError("{}.{} has no nested fields".format(
+                    model_class.__name__, name))
+            nested.append(field[0])
+            model_class = field[1].model_class
+
+        field = _field_map(model_class).get(names[-1])
+        if field is None:
+            raise ValueError("Unknown field: {}.{}".format(
+                model_class.__name__, names[-1]))
+        key, converter = field
+        column_type = _COLUMN_TYPES.get(converter)
+        if column_type is None:
+            raise ValueError("{} can't be stored in a column".format(path))
+        if column_type is _StringColumn:
+            encode = names[-1] in DICTIONARY_ATTRIBUTES \
+                if dictionary is None else path in dictionary
+            if encode:
+                column_type = _DictionaryColumn
+        return path, tuple(nested), key, converter, column_type()
+
+    def append(self, values: dict or None):
+        """
+        Add a record
+        :param values: the decoded 'WhoisRecord' object of a response
+        """
+        values = values or {}
+        for _, nested, key, converter, column in self._plan:
+            scope = values
+            for name in nested:
+                scope = scope.get(name)
+                if type(scope) is not dict:
+                    scope = None
+                    break
+            column.append(
+                None if scope is None else converter(scope, key))
+        self._size += 1
+
+    def extend(self, items) -> int:
+        """Add every decoded 'WhoisRecord' object of an iterable
+        :return: int - number of records in the batch"""
+        for values in items:
+            self.append(values)
+        return self._size
+
+    @staticmethod
+    def from_responses(responses, fields=DEFAULT_FIELDS, dictionary=None,
+                       decoder='auto', skip_errors: bool = False):
+        """
+        Build a batch from raw JSON response bodies, e.g. those returned by
+        ApiRequester.get_data(domain, as_bytes=True)
+        :param responses: iterable of bytes or str
+        :param fields: (optional) see WhoisRecordBatch()
+        :param dictionary: (optional) see WhoisRecordBatch()
+        :param decoder: (optional) JSON decoder, see Client;
+          str or JsonDecoder
+        :param skip_errors: (optional) count responses holding an
+          ErrorMessage in `skipped` instead of raising, default False;
+          bool
+        :return: WhoisRecordBatch
+        :raises
+          - ResponseError -- a response contains ErrorMessage
+          - UnparsableApiResponseError -- a response couldn't be parsed
+        """
+        batch = WhoisRecordBatch(fields, dictionary)
+        decoder = get_decoder(decoder)
+        for response in responses:
+            try:
+                parsed = decoder.decode(response)
+            except decoder.errors as error:
+                raise UnparsableApiResponseError(
+                    "Could not parse API response", error)
+            if type(parsed) is dict and 'WhoisRecord' in parsed:
+                batch.append(parsed['WhoisRecord'])
+            elif type(parsed) is dict and 'ErrorMessage' in parsed:
+                if not skip_errors:
+                    if isinstance(response, bytes):
+                        response = response.decode('utf-8', 'replace')
+                    raise ResponseError(
+                        response, ErrorMessage(parsed['ErrorMessage']))
+                batch.skipped += 1
+            else:
+                raise UnparsableApiResponseError(
+                    "Could not find a correct root element.", None)
+        return batch
+
+    def __len__(self):
+        return self._size
+
+    def column(self, field: str):
+        """
+        The storage of a column: array of int64 for dates and ints,
+        array of int8 for the tri-state, array of int32 codes for
+        dictionary-encoded strings, list of str for other strings
+        """
+        column = self._get(field)
+        if isinstance(column, _DictionaryColumn):
+            return column.codes
+        return column.data
+
+    def categories(self, field: str) -> list:
+        """Distinct values of a dictionary-encoded column, by code"""
+        column = self._get(field)
+        if not isinstance(column, _DictionaryColumn):
+            raise ValueError("{} isn't dictionary-encoded".format(field))
+        return column.categories
+
+    def row(self, index: int) -> dict:
+        """Values of one record as {field: value}; dates as UTC
+        datetimes, availability as bool or None"""
+        if not -self._size <= index < self._size:
+            raise IndexError("Row index out of range.")
+        return {path: self._columns[path].value(index)
+                for path in self.fields}
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield self.row(index)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the column data"""
+        return sum(column.nbytes for column in self._columns.values())
+
+    def to_numpy(self) -> dict:
+        """
+        Columns as NumPy arrays: datetime64[s] with NaT for dates, int64
+        with NULL for ints, int8 for the tri-state and object arrays of
+        str or None for strings
+        :return: dict {field: numpy.ndarray}
+        """
+        _require('numpy')
+        return {path: self._columns[path].to_numpy()
+                for path in self.fields}
+
+    def to_pandas(self):
+        """
+        Columns as a pandas DataFrame: UTC datetimes, nullable Int64 and
+        boolean columns and categoricals for dictionary-encoded strings
+        :return: pandas.DataFrame
+        """
+        pandas = _require('pandas')
+        return pandas.DataFrame({path: self._columns[path].to_pandas()
+                                 for path in self.fields})
+
+    def _get(self, field: str):
+        column = self._columns.get(field)
+        if column is None:
+            raise KeyError("Unknown column: {}".format(field))
+        return column
@@ -0,0 +1,50 @@
+from .response import WhoisRecord, RegistryData, _field_map, _model_value
+
+
+class LazyModel:
+    """
+    Mixin for response models that keeps the decoded dict and converts
+    each field on first access. The converted value is stored on the
+    instance, so later reads cost a plain attribute lookup.
+    """
+    __slots__ = ()
+
+    def __init__(self, values):
+        self._values = values if values is not None else {}
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        field = _field_map(type(self)).get(name)
+        if field is None:
+            raise AttributeError("'{}' object has no attribute '{}'".format(
+                type(self).__name__, name))
+        value = field[1](self._values, field[0])
+        setattr(self, name, value)
+        return value
+
+    def _fields_values(self) -> dict:
+        return {name: getattr(self, name) for name in _field_map(type(self))}
+
+    def __str__(self):
+        result = {}
+        for k, v in self._fields_values().items():
+            result[k] = str(v)
+        return str(result)
+
+    def __getitem__(self, item):
+        if type(item) is str and item in _field_map(type(self)):
+            return getattr(self, item)
+        raise KeyError("Invalid key: {}".format(item))
+
+
+class LazyRegistryData(LazyModel, RegistryData):
+    __slots__ = ('_values',)
+
+
+class LazyWhoisRecord(LazyModel, WhoisRecord):
+    __slots__ = ('_values',)
+
+    _fields = (
+        ('registry_data', 'registryData', _model_value(LazyRegistryData)),
+    )
@@ -0,0 +1,75 @@
+from .response import WhoisRecord, _field_map
+
+
+class Projection:
+    """
+    Builds records holding only the requested fields.
+
+    Fields are attribute names of WhoisRecord, nested ones as dotted
+    paths: ['domain_name', 'registrant.country_code',
+    'registry_data.expires_date']. Only the requested values are
+    converted; the other attributes of the built models are left unset
+    and raise AttributeError when read. A path naming a nested model,
+    e.g. 'registrant', gets the whole model.
+    """
+
+    def __init__(self, fields, record_class=WhoisRecord):
+        """
+
+        :param fields: attribute paths; iterable of str
+        :param record_class: (optional) root model class
+        """
+        self.fields = tuple(fields)
+        if not self.fields:
+            raise ValueError("At least one field is required.")
+        self.record_class = record_class
+        self._plan = Projection._compile(record_class, [
+            f.split('.') for f in self.fields])
+
+    @staticmethod
+    def _compile(model_class, paths: list) -> tuple:
+        """
+        :return: tuple of (attribute, key, converter, nested plan or None)
+        """
+        fields = _field_map(model_class)
+        nested = {}
+        for path in paths:
+            name = path[0]
+            if name not in fields:
+                raise ValueError("Unknown field: {}.{}".format(
+                    model_class.__name__, name))
+            rest = path[1:]
+            if not rest or nested.get(name, []) is None:
+                nested[name] = None
+                continue
+            if not hasattr(fields[name][1], 'model_class'):
+                raise ValueError("{}.{} has no nested fields".format(
+                    model_class.__name__, name))
+            nested.setdefault(name, []).append(rest)
+
+        plan = []
+        for name, rest in nested.items():
+            key, converter = fields[name]
+            if rest is None:
+                plan.append((name, key, converter, None))
+            else:
+                plan.append((name, key, converter.model_class,
+                             Projection._compile(converter.model_class, rest)))
+        return tuple(plan)
+
+    @staticmethod
+    def _build(model_class, plan: tuple, values: dict):
+        model = model_class.__new__(model_class)
+        for name, key, converter, nested in plan:
+            if nested is None:
+                setattr(model, name, converter(values, key))
+            elif key in values:
+                setattr(model, name, Projection._build(
+                    converter, nested, values[key] or {}))
+            else:
+                setattr(model, name, None)
+        return model
+
+    def build(self, values: dict or None):
+        """Build a record from the decoded 'WhoisRecord' object"""
+        return Projection._build(self.record_class, self._plan, values or {})
@@ -1,5 +1,6 @@
 from .base import BaseModel
 from ..exceptions.error import ParameterError, EmptyApiKeyError
+from urllib.parse import quote_plus, urlencode
 import re
 
 
@@ -18,6 +19,11 @@ class RequestParameters(BaseModel):
     - ignore_raw_texts
 
     Usage: instance.output_format = 'json'
+
+    The request payload and its encoded query string are built once and
+    reused until a setter runs.
+    An instance shared by several threads should not be modified; use
+    copy() to derive parameters for a particular request instead.
     """
 
     _re_api_key = re.compile(r'^at_[a-z0-9]{29}$', re.IGNORECASE)
@@ -39,6 +45,8 @@ class RequestParameters(BaseModel):
         - thin_whois
         - ignore_raw_texts
         """
+        self._cached_payload = None
+        self._cached_query = ''
         self._api_key = ''
         self._domain_name = ''
         self._output_format = 'JSON'
@@ -83,6 +91,7 @@ class RequestParameters(BaseModel):
                 str(value)
         ) is not None:
             self._api_key = str(value)
+            self._cached_payload = None
         else:
             raise ParameterError("Invalid API key format.")
 
@@ -94,6 +103,7 @@ class RequestParameters(BaseModel):
     def domain_name(self, value):
         if value is not None and len(str(value)) > 4:
             self._domain_name = str(value)
+            self._cached_payload = None
         else:
             raise ParameterError("Invalid domain name.")
 
@@ -105,6 +115,7 @@ class RequestParameters(BaseModel):
     def output_format(self, value):
         if RequestParameters._re_output_format.search(str(value)):
             self._output_format = str(value)
+            self._cached_payload = None
         else:
             raise ParameterError(
                 "Output format should either JSON or XML.")
@@ -117,6 +128,7 @@ class RequestParameters(BaseModel):
     def prefer_fresh(self, value):
         if int(value) in [0, 1]:
             self._prefer_fresh = int(value)
+            self._cached_payload = None
         else:
             raise ParameterError("'prefer_fresh' should be 0 or 1.")
 
@@ -128,6 +140,7 @@ class RequestParameters(BaseModel):
     def da(self, value):
         if int(value) in [0, 1, 2]:
             self._da = int(value)
+            self._cached_payload = None
         else:
             raise ParameterError("'da' should be 0, 1 or 2.")
 
@@ -139,6 +152,7 @@ class RequestParameters(BaseModel):
     def ip(self, value):
         if int(value) in [0, 1]:
             self._ip = int(value)
+            self._cached_payload = None
         else:
             raise ParameterError("'ip' should be 0 or 1.")
 
@@ -150,6 +164,7 @@ class RequestParameters(BaseModel):
     def ip_whois(self, value):
         if int(value) in [0, 1]:
             self._ip_whois = int(value)
+            self._cached_payload = None
         else:
             raise ParameterError("'ip_whois' should be 0 or 1.")
 
@@ -161,6 +176,7 @@ class RequestParameters(BaseModel):
     def check_proxy_data(self, value):
         if int(value) in [0, 1]:
             self._check_proxy_data = int(value)
+            self._cached_payload = None
         else:
             raise ParameterError("'check_proxy_data' should be 0 or 1.")
 
@@ -172,6 +188,7 @@ class RequestParameters(BaseModel):
     def thin_whois(self, value):
         if int(value) in [0, 1]:
             self._thin_whois = int(value)
+            self._cached_payload = None
         else:
             raise ParameterError("'thin_whois' should be 0 or 1.")
 
@@ -183,21 +200,75 @@ class RequestParameters(BaseModel):
     def ignore_raw_texts(self, value):
         if int(value) in [0, 1]:
             self._ignore_raw_texts = int(value)
+            self._cached_payload = None
         else:
             raise ParameterError("'ignore_raw_texts' should be 0 or 1.")
 
-    def get_request_parameters(self):
-        if self.api_key == '':
+    def copy(self, **changes):
+        """
+        Get a new instance with the same values
+        :param changes: parameters to change in the copy, validated like
+          in __init__
+        :return: RequestParameters
+        """
+        params = RequestParameters.__new__(RequestParameters)
+        params.__dict__.update(self.__dict__)
+        for name, value in changes.items():
+            if not isinstance(getattr(RequestParameters, name, None),
+                              property):
+                raise ParameterError("Unknown parameter: {}".format(name))
+            setattr(params, name, value)
+        return params
+
+    def get_request_parameters(self, api_key: str or None = None):
+        """
+        :param api_key: (optional) key to send when none is set
+        :return: dict - a new query parameters dict
+        """
+        if self._api_key == '' and not api_key:
+            raise EmptyApiKeyError("API key isn't defined")
+        if self._cached_payload is None:
+            self._build()
+        payload = dict(self._cached_payload)
+        if self._api_key == '':
+            payload['apiKey'] = api_key
+        return payload
+
+    def get_query_string(self, domain: str or None = None,
+                         api_key: str or None = None) -> str:
+        """
+        URL-encoded query; only the domain name is encoded per call
+        :param domain: (optional) domain name to use instead of
+          domain_name
+        :param api_key: (optional) key to send when none is set
+        :return: str
+        """
+        if self._api_key == '' and not api_key:
             raise EmptyApiKeyError("API key isn't defined")
-        return {
-            'apiKey': self.api_key,
-            'domainName': self.domain_name,
-            'outputFormat': self.output_format,
-            'da': self.da,
-            'ip': self.ip,
-            'ipWhois': self.ip_whois,
-            'thinWhois': self.thin_whois,
-            'preferFresh': self.prefer_fresh,
-            'checkProxyData': self.check_proxy_data,
-            'ignoreRawTexts': self.ignore_raw_texts
+        if self._cached_payload is None:
+            self._build()
+        return 'apiKey=' + (self._api_key or api_key) + '&domainName=' \
+            + quote_plus(str(domain or self._domain_name)) + self._cached_query
+
+    def _build(self):
+        payload = {
+            'apiKey': self._api_key,
+            'domainName': self._domain_name,
+            'outputFormat': self._output_format,
+            'da': self._da,
+            'ip': self._ip,
+            'ipWhois': self._ip_whois,
+            'thinWhois': self._thin_whois,
+            'preferFresh': self._prefer_fresh,
+            'checkProxyData': self._check_proxy_data,
+            'ignoreRawTexts': self._ignore_raw_texts
         }
+        self._cached_query = '&' + urlencode(
+            [(k, v) for k, v in payload.items()
+             if k != 'apiKey' and k != 'domainName'])
+        self._cached_payload = payload
+
+    def _attributes(self):
+        for name, value in super()._attributes():
+            if name != '_cached_payload' and name != '_cached_query':
+                yield name, value
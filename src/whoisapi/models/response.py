@@ -1,5 +1,6 @@
 import datetime
 import copy
+import functools
 import re
 import logging
 from .base import BaseModel
@@ -11,6 +12,14 @@ re_timezone_offset = re.compile(r'([-+])(\d\d)(:)?(\d\d)$')
 re_coordinated_utc = re.compile(r'(T\d\d:\d\d:\d\dZ)$')
 re_milliseconds_and_timezone_name = re.compile(
     r'(\.\d\d\d)?\s+([a-z]{3,4})$', re.IGNORECASE)
+# Fast paths: 2021-02-16T19:04:22Z, 2021-02-16T19:04:22.000+00:00,
+# 2021-02-16T19:04:22-0700 and 2021-02-17 15:26:53.000 UTC
+re_iso_datetime = re.compile(
+    r'(\d{4})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)'
+    r'(?:Z|(?:\.\d\d\d)?([-+])(\d\d):?([0-5]\d))\Z', re.ASCII)
+re_datetime_utc_name = re.compile(
+    r'(\d{4})-(\d\d)-(\d\d) (\d\d):(\d\d):(\d\d)(?:\.\d\d\d)? (?:UTC|GMT)\Z',
+    re.ASCII | re.IGNORECASE)
 
 
 def _string_value(values: dict, key: str) -> str:
@@ -44,42 +53,125 @@ def _datetime_value(values: dict, key: str) -> datetime.datetime or None:
     if key in values:
         if values[key] is None:
             return None
-        dt = str(values[key])
-        m = re_milliseconds_and_timezone_offset.search(dt)
-        m2 = re_timezone_offset.search(dt)
-        m3 = re_milliseconds_and_timezone_name.search(dt)
-        m4 = re_coordinated_utc.search(dt)
+        return _parse_datetime(str(values[key]))
+
+
+def _parse_datetime(dt: str) -> datetime.datetime or None:
+    """
+    Parse a date string of the API. The shapes the API returns are
+    matched by a single pattern; anything else goes through the slower
+    regular expression and strptime cascade.
+    """
+    m = re_iso_datetime.match(dt)
+    if m is not None:
+        year, month, day, hour, minute, second, sign, tz_hours, \
+            tz_minutes = m.groups()
         try:
-            if m is not None:
-                return datetime.datetime.strptime(
-                    re_milliseconds_and_timezone_offset.sub(r'\2\3\5', dt),
-                    "%Y-%m-%dT%H:%M:%S%z")
-            if m2 is not None:
-                return datetime.datetime.strptime(
-                    re_timezone_offset.sub(r'\1\2\4', dt),
-                    "%Y-%m-%dT%H:%M:%S%z")
-            if m3 is not None:
-                return datetime.datetime.strptime(
-                    re_milliseconds_and_timezone_name.sub(r' \2', dt),
-                    "%Y-%m-%d %H:%M:%S %Z")
-            if m4 is not None:
-                return datetime.datetime.strptime(dt, '%Y-%m-%dT%H:%M:%SZ')
-        except (ValueError, Exception) as error:
-            _logger.error(
-                "Couldn't parse the date ({}). Error occurred: {}".format(
-                    dt,
-                    error.__str__()
-                )
+            tz = None if sign is None \
+                else _timezone(sign, tz_hours, tz_minutes)
+            return datetime.datetime(
+                int(year), int(month), int(day),
+                int(hour), int(minute), int(second), tzinfo=tz)
+        except ValueError:
+            pass
+    else:
+        m = re_datetime_utc_name.match(dt)
+        if m is not None:
+            try:
+                return datetime.datetime(*map(int, m.groups()))
+            except ValueError:
+                pass
+    return _parse_datetime_fallback(dt)
+
+
+@functools.lru_cache(maxsize=64)
+def _timezone(sign: str, hours: str, minutes: str) -> datetime.timezone:
+    offset = datetime.timedelta(hours=int(hours), minutes=int(minutes))
+    return datetime.timezone(-offset if sign == '-' else offset)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_datetime_fallback(dt: str) -> datetime.datetime or None:
+    m = re_milliseconds_and_timezone_offset.search(dt)
+    m2 = re_timezone_offset.search(dt)
+    m3 = re_milliseconds_and_timezone_name.search(dt)
+    m4 = re_coordinated_utc.search(dt)
+    try:
+        if m is not None:
+            return datetime.datetime.strptime(
+                re_milliseconds_and_timezone_offset.sub(r'\2\3\5', dt),
+                "%Y-%m-%dT%H:%M:%S%z")
+        if m2 is not None:
+            return datetime.datetime.strptime(
+                re_timezone_offset.sub(r'\1\2\4', dt),
+                "%Y-%m-%dT%H:%M:%S%z")
+        if m3 is not None:
+            return datetime.datetime.strptime(
+                re_milliseconds_and_timezone_name.sub(r' \2', dt),
+                "%Y-%m-%d %H:%M:%S %Z")
+        if m4 is not None:
+            return datetime.datetime.strptime(dt, '%Y-%m-%dT%H:%M:%SZ')
+    except (ValueError, Exception) as error:
+        _logger.error(
+            "Couldn't parse the date ({}). Error occurred: {}".format(
+                dt,
+                error.__str__()
             )
+        )
+
+    return None
+
 
+def _availability_value(values: dict, key: str) -> bool or None:
+    return BaseWhoisRecord._parse_domain_availability(
+        _string_value(values, key))
+
+
+def _model_value(model_class):
+    def converter(values: dict, key: str):
+        if key in values:
+            return model_class(values[key])
         return None
 
+    converter.model_class = model_class
+    return converter
+
+
+def _set_fields(model, values: dict, fields: tuple):
+    for attribute, key, converter in fields:
+        setattr(model, attribute, converter(values, key))
+
+
+_field_maps = {}
+
+
+def _field_map(model_class) -> dict:
+    """
+    All fields of a model class and its bases:
+    {attribute: (key, converter)}, in declaration order
+    """
+    fields = _field_maps.get(model_class)
+    if fields is None:
+        fields = {}
+        for cls in reversed(model_class.__mro__):
+            for attribute, key, converter in cls.__dict__.get('_fields', ()):
+                fields[attribute] = (key, converter)
+        _field_maps[model_class] = fields
+    return fields
+
 
 class NameServers(BaseModel):
+    __slots__ = ('raw_text', 'host_names', 'ips')
     raw_text: str
     host_names: list
     ips: list
 
+    _fields = (
+        ('raw_text', 'rawText', _string_value),
+        ('host_names', 'hostNames', _list_value),
+        ('ips', 'ips', _list_value),
+    )
+
     def __init__(self, values):
         super().__init__()
         self.raw_text = ''
@@ -87,17 +179,24 @@ class NameServers(BaseModel):
         self.ips = []
 
         if values is not None:
-            self.raw_text = _string_value(values, 'rawText')
-            self.host_names = _list_value(values, 'hostNames')
-            self.ips = _list_value(values, 'ips')
+            _set_fields(self, values, NameServers._fields)
 
 
 class Audit(BaseModel):
+    __slots__ = ('updated_date', 'created_date', 'updated_date_raw',
+                 'created_date_raw')
     created_date: datetime.datetime or None
     created_date_raw: str
     updated_date: datetime.datetime or None
     updated_date_raw: str
 
+    _fields = (
+        ('updated_date', 'updatedDate', _datetime_value),
+        ('updated_date_raw', 'updatedDate', _string_value),
+        ('created_date', 'createdDate', _datetime_value),
+        ('created_date_raw', 'createdDate', _string_value),
+    )
+
     def __init__(self, values):
         super().__init__()
         self.updated_date = None
@@ -106,18 +205,21 @@ class Audit(BaseModel):
         self.created_date_raw = ''
 
         if values is not None:
-            self.updated_date = _datetime_value(values, 'updatedDate')
-            self.updated_date_raw = _string_value(values, 'updatedDate')
-            self.created_date = _datetime_value(values, 'createdDate')
-            self.created_date_raw = _string_value(values, 'createdDate')
+            _set_fields(self, values, Audit._fields)
 
 
 class Record(BaseModel):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
 
 class Contact(BaseModel):
+    __slots__ = ('name', 'organization', 'street1', 'street2', 'street3',
+                 'street4', 'city', 'state', 'postal_code', 'postal_code_str',
+                 'country', 'country_code', 'email', 'telephone',
+                 'telephone_ext', 'fax', 'fax_ext')
     name: str
     organization: str
     street1: str
@@ -137,6 +239,26 @@ class Contact(BaseModel):
     fax_ext: str
     raw_text: str
 
+    _fields = (
+        ('name', 'name', _string_value),
+        ('organization', 'organization', _string_value),
+        ('street1', 'street1', _string_value),
+        ('street2', 'street2', _string_value),
+        ('street3', 'street3', _string_value),
+        ('street4', 'street4', _string_value),
+        ('city', 'city', _string_value),
+        ('state', 'state', _string_value),
+        ('postal_code', 'postalCode', _int_value),
+        ('postal_code_str', 'postalCode', _string_value),
+        ('country', 'country', _string_value),
+        ('country_code', 'countryCode', _string_value),
+        ('email', 'email', _string_value),
+        ('telephone', 'telephone', _string_value),
+        ('telephone_ext', 'telephoneExt', _string_value),
+        ('fax', 'fax', _string_value),
+        ('fax_ext', 'faxExt', _string_value),
+    )
+
     def __init__(self, values):
         super().__init__()
         self.name = ''
@@ -158,37 +280,40 @@ class Contact(BaseModel):
         self.fax_ext = ''
 
         if values is not None:
-            self.name = _string_value(values, 'name')
-            self.organization = _string_value(values, 'organization')
-            self.street1 = _string_value(values, 'street1')
-            self.street2 = _string_value(values, 'street2')
-            self.street3 = _string_value(values, 'street3')
-            self.street4 = _string_value(values, 'street4')
-            self.city = _string_value(values, 'city')
-            self.state = _string_value(values, 'state')
-            self.postal_code = _int_value(values, 'postalCode')
-            self.postal_code_str = _string_value(values, 'postalCode')
-            self.country = _string_value(values, 'country')
-            self.country_code = _string_value(values, 'countryCode')
-            self.email = _string_value(values, 'email')
-            self.telephone = _string_value(values, 'telephone')
-            self.telephone_ext = _string_value(values, 'telephoneExt')
-            self.fax = _string_value(values, 'fax')
-            self.fax_ext = _string_value(values, 'faxExt')
+            _set_fields(self, values, Contact._fields)
 
 
 class Registrant(Contact):
+    __slots__ = ('unparsable',)
     unparsable: str
 
+    _fields = (
+        ('unparsable', 'unparsable', _string_value),
+    )
+
     def __init__(self, values):
         super().__init__(values)
         self.unparsable = ''
 
         if values is not None:
-            self.unparsable = _string_value(values, 'unparsable')
+            _set_fields(self, values, Registrant._fields)
 
 
 class BaseWhoisRecord(Record):
+    __slots__ = ('created_date', 'created_date_raw', 'updated_date',
+                 'updated_date_raw', 'expires_date', 'expires_date_raw',
+                 'data_error', 'contact_email', 'custom1_field_name',
+                 'custom1_field_value', 'custom2_field_name',
+                 'custom2_field_value', 'custom3_field_name',
+                 'custom3_field_value', 'domain_availability',
+                 'domain_availability_raw', 'domain_name', 'domain_name_ext',
+                 'estimated_domain_age', 'estimated_domain_age_raw', 'footer',
+                 'header', 'audit', 'name_servers', 'parse_code', 'raw_text',
+                 'stripped_text', 'registrant', 'administrative_contact',
+                 'billing_contact', 'technical_contact', 'zone_contact',
+                 'registrar_name', 'registrar_ianaid', 'whois_server',
+                 'created_date_normalized', 'updated_date_normalized',
+                 'expires_date_normalized')
     created_date: datetime.datetime or None
     created_date_raw: str
     updated_date: datetime.datetime or None
@@ -228,6 +353,48 @@ class BaseWhoisRecord(Record):
     expires_date_normalized: datetime.datetime or None
     whois_server: str
 
+    _fields = (
+        ('created_date', 'createdDate', _datetime_value),
+        ('created_date_raw', 'createdDate', _string_value),
+        ('updated_date', 'updatedDate', _datetime_value),
+        ('updated_date_raw', 'updatedDate', _string_value),
+        ('expires_date', 'expiresDate', _datetime_value),
+        ('expires_date_raw', 'expiresDate', _string_value),
+        ('data_error', 'dataError', _string_value),
+        ('contact_email', 'contactEmail', _string_value),
+        ('custom1_field_name', 'custom1FieldName', _string_value),
+        ('custom1_field_value', 'custom1FieldValue', _string_value),
+        ('custom2_field_name', 'custom2FieldName', _string_value),
+        ('custom2_field_value', 'custom2FieldValue', _string_value),
+        ('custom3_field_name', 'custom3FieldName', _string_value),
+        ('custom3_field_value', 'custom3FieldValue', _string_value),
+        ('domain_availability', 'domainAvailability', _availability_value),
+        ('domain_availability_raw', 'domainAvailability', _string_value),
+        ('domain_name', 'domainName', _string_value),
+        ('domain_name_ext', 'domainNameExt', _string_value),
+        ('estimated_domain_age', 'estimatedDomainAge', _int_value),
+        ('estimated_domain_age_raw', 'estimatedDomainAge', _string_value),
+        ('footer', 'footer', _string_value),
+        ('header', 'header', _string_value),
+        ('audit', 'audit', _model_value(Audit)),
+        ('name_servers', 'nameServers', _model_value(NameServers)),
+        ('parse_code', 'parseCode', _int_value),
+        ('raw_text', 'rawText', _string_value),
+        ('stripped_text', 'strippedText', _string_value),
+        ('registrant', 'registrant', _model_value(Registrant)),
+        ('administrative_contact', 'administrativeContact',
+         _model_value(Contact)),
+        ('billing_contact', 'billingContact', _model_value(Contact)),
+        ('technical_contact', 'technicalContact', _model_value(Contact)),
+        ('zone_contact', 'zoneContact', _model_value(Contact)),
+        ('registrar_name', 'registrarName', _string_value),
+        ('registrar_ianaid', 'registrarIANANID', _string_value),
+        ('whois_server', 'whoisServer', _string_value),
+        ('created_date_normalized', 'createdDateNormalized', _datetime_value),
+        ('updated_date_normalized', 'updatedDateNormalized', _datetime_value),
+        ('expires_date_normalized', 'expiresDateNormalized', _datetime_value),
+    )
+
     def __init__(self, values):
         super().__init__()
         self.created_date = None
@@ -270,52 +437,7 @@ class BaseWhoisRecord(Record):
         self.expires_date_normalized = None
 
         if values is not None:
-            self.created_date = _datetime_value(values, 'createdDate')
-            self.created_date_raw = _string_value(values, 'createdDate')
-            self.updated_date = _datetime_value(values, 'updatedDate')
-            self.updated_date_raw = _string_value(values, 'updatedDate')
-            self.expires_date = _datetime_value(values, 'expiresDate')
-            self.expires_date_raw = _string_value(values, 'expiresDate')
-            self.data_error = _string_value(values, 'dataError')
-            self.contact_email = _string_value(values, 'contactEmail')
-            self.custom1_field_name = _string_value(values, 'custom1FieldName')
-            self.custom1_field_value = _string_value(values, 'custom1FieldValue')
-            self.custom2_field_name = _string_value(values, 'custom2FieldName')
-            self.custom2_field_value = _string_value(values, 'custom2FieldValue')
-            self.custom3_field_name = _string_value(values, 'custom3FieldName')
-            self.custom3_field_value = _string_value(values, 'custom3FieldValue')
-            self.domain_availability = BaseWhoisRecord._parse_domain_availability(
-                _string_value(values, 'domainAvailability'))
-            self.domain_availability_raw = _string_value(values, 'domainAvailability')
-            self.domain_name = _string_value(values, 'domainName')
-            self.domain_name_ext = _string_value(values, 'domainNameExt')
-            self.estimated_domain_age = _int_value(values, 'estimatedDomainAge')
-            self.estimated_domain_age_raw = _string_value(values, 'estimatedDomainAge')
-            self.footer = _string_value(values, 'footer')
-            self.header = _string_value(values, 'header')
-            if 'audit' in values:
-                self.audit = Audit(values['audit'])
-            if 'nameServers' in values:
-                self.name_servers = NameServers(values['nameServers'])
-            self.parse_code = _int_value(values, 'parseCode')
-            self.raw_text = _string_value(values, 'rawText')
-            self.stripped_text = _string_value(values, 'strippedText')
-            if 'registrant' in values:
-                self.registrant = Registrant(values['registrant'])
-            if 'administrativeContact' in values:
-                self.administrative_contact = Contact(values['administrativeContact'])
-            if 'billingContact' in values:
-                self.billing_contact = Contact(values['billingContact'])
-            if 'technicalContact' in values:
-                self.technical_contact = Contact(values['technicalContact'])
-            if 'zoneContact' in values:
-                self.zone_contact = Contact(values['zoneContact'])
-            self.registrar_name = _string_value(values, 'registrarName')
-            self.registrar_ianaid = _string_value(values, 'registrarIANANID')
-            self.whois_server = _string_value(values, 'whoisServer')
-            self.created_date_normalized = _datetime_value(values, 'createdDateNormalized')
-            self.updated_date_normalized = _datetime_value(values, 'updatedDateNormalized')
-            self.expires_date_normalized = _datetime_value(values, 'expiresDateNormalized')
+            _set_fields(self, values, BaseWhoisRecord._fields)
 
     @staticmethod
     def _parse_domain_availability(value) -> bool or None:
@@ -327,9 +449,15 @@ class BaseWhoisRecord(Record):
 
 
 class RegistryData(BaseWhoisRecord):
+    __slots__ = ('referral_url', 'status')
     referral_url: str
     status: str
 
+    _fields = (
+        ('referral_url', 'referralURL', _string_value),
+        ('status', 'status', _string_value),
+    )
+
     def __init__(self, values):
         super().__init__(values)
 
@@ -337,26 +465,35 @@ class RegistryData(BaseWhoisRecord):
         self.status = ''
 
         if values is not None:
-            self.referral_url = _string_value(values, 'referralURL')
-            self.status = _string_value(values, 'status')
+            _set_fields(self, values, RegistryData._fields)
 
 
 class WhoisRecord(BaseWhoisRecord):
+    __slots__ = ('registry_data',)
     registry_data: RegistryData or None
 
+    _fields = (
+        ('registry_data', 'registryData', _model_value(RegistryData)),
+    )
+
     def __init__(self, values):
         super().__init__(values)
         self.registry_data = None
 
         if values is not None:
-            if 'registryData' in values:
-                self.registry_data = RegistryData(values['registryData'])
+            _set_fields(self, values, WhoisRecord._fields)
 
 
 class ErrorMessage(Record):
+    __slots__ = ('msg', 'error_code')
     msg: str
     error_code: str
 
+    _fields = (
+        ('error_code', 'errorMessage', _string_value),
+        ('msg', 'msg', _string_value),
+    )
+
     def __init__(self, values):
         super().__init__()
 
@@ -364,5 +501,4 @@ class ErrorMessage(Record):
         self.error_code = ''
 
         if values is not None:
-            self.error_code = _string_value(values, 'errorMessage')
-            self.msg = _string_value(values, 'msg')
+            _set_fields(self, values, ErrorMessage._fields)
@@ -1,3 +1,15 @@
-__all__ = ['ApiRequester']
+__all__ = ['ApiRequester', 'AsyncApiRequester', 'TokenBucket',
+           'AdaptiveRateLimiter', 'RetryPolicy']
 
 from .http import ApiRequester
+from .ratelimit import TokenBucket, AdaptiveRateLimiter
+from .retry import RetryPolicy
+
+
+def __getattr__(name):
+    # aiohttp is imported only when the asyncio requester is used
+    if name == 'AsyncApiRequester':
+        from .async_http import AsyncApiRequester
+        return AsyncApiRequester
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name))
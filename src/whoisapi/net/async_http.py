@@ -0,0 +1,216 @@
+import asyncio
+from time import perf_counter
+from .base import BaseApiRequester
+from .retry import register_transient_errors
+from ..exceptions.error import DeadlineExceededError, WhoisApiError, \
+    RateLimitError
+
+try:
+    import aiohttp
+    from yarl import URL
+except ImportError:  # pragma: no cover
+    aiohttp = None
+else:
+    register_transient_errors(aiohttp.ClientConnectionError)
+
+
+class AsyncApiRequester(BaseApiRequester):
+    """
+    Non-blocking API requester on top of aiohttp.
+
+    The underlying session and its connection pool are created on the
+    first call, inside the running event loop.
+    """
+    _max_concurrency: int
+
+    def __init__(self, **kwargs):
+        """
+
+        :param kwargs: Supported parameters:
+        - url: API endpoint URL; str
+        - timeout: (optional) API call timeout in seconds; float
+        - max_concurrency: (optional) maximum number of requests in
+          flight at once, default 10; int
+        - pool_maxsize: (optional) maximum number of pooled connections,
+          default 10; int
+        - pool_maxsize_per_host: (optional) maximum number of pooled
+          connections per host, 0 means no limit, default 0; int
+        - keep_alive: (optional) seconds to keep idle connections
+          open, default 15; float
+        - rate_limit, rate_limit_burst, adaptive_rate_limit: (optional)
+          client-side rate limiting, see BaseApiRequester
+        - retry: (optional) retry policy for transient failures; RetryPolicy
+        - credentials: (optional) API keys to spread the requests over;
+          CredentialPool
+        One of the following parameters (required):
+        - api_key: Your API key; str
+        - parameters: RequestParameters
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncApiRequester requires aiohttp. "
+                "Install it with: pip install whois-api[async]")
+
+        super().__init__(**kwargs)
+
+        self.max_concurrency = kwargs.get('max_concurrency', 10)
+        self._pool_maxsize = int(kwargs.get('pool_maxsize', 10))
+        self._pool_maxsize_per_host = int(
+            kwargs.get('pool_maxsize_per_host', 0))
+        self._keep_alive = float(kwargs.get('keep_alive', 15))
+        if self._pool_maxsize < 1 or self._pool_maxsize_per_host < 0:
+            raise ValueError("Pool sizes should be positive.")
+
+        self._session = None
+        self._semaphore = None
+        self._closed = False
+
+    @property
+    def max_concurrency(self) -> int:
+        """Maximum number of requests in flight at once"""
+        return self._max_concurrency
+
+    @max_concurrency.setter
+    def max_concurrency(self, value: int):
+        if value is not None and int(value) >= 1:
+            self._max_concurrency = int(value)
+            self._semaphore = None
+        else:
+            raise ValueError("'max_concurrency' should be positive.")
+
+    @property
+    def session(self):
+        """The aiohttp session, None until the first call"""
+        return self._session
+
+    def _get_session(self):
+        if self._closed:
+            raise RuntimeError("The API requester is closed.")
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self._pool_maxsize,
+                limit_per_host=self._pool_maxsize_per_host,
+                keepalive_timeout=self._keep_alive
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._session
+
+    async def close(self):
+        """Close all pooled connections. The requester can't be used after"""
+        self._closed = True
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def get_data(self, domain, params=None, as_bytes=False,
+                       event=None, deadline=None):
+        """
+        :param domain: str - the domain name
+        :param params: RequestParameters instance (optional)
+        :param as_bytes: bool - return the undecoded response body
+        :param event: (optional) RequestEvent to record the network
+          timings in
+        :param deadline: (optional) Deadline for the rate limiter wait
+          and the retries
+        :return: str, or bytes if as_bytes is set
+        """
+        session = self._get_session()
+        if self._credentials is not None:
+            self._check_pooled(params)
+            fn, args = self._pooled, (session, domain, params, as_bytes,
+                                      event, deadline)
+        else:
+            url = URL(self._url(domain, params), encoded=True)
+            fn, args = self._request, (session, url, as_bytes, event,
+                                       deadline)
+        if self._retry_policy is not None:
+            return await self._retry_policy.call_async(
+                fn, *args, deadline=deadline)
+        return await fn(*args)
+
+    async def _pooled(self, session, domain, params, as_bytes: bool = False,
+                      event=None, deadline=None):
+        """_request with the next key of the credential pool, moving on
+        to another key while keys are rejected"""
+        error = None
+        for _ in range(len(self._credentials)):
+            try:
+                credential, delay = self._credentials.reserve(
+                    deadline.check('rate limiting')
+                    if deadline is not None else None)
+            except RateLimitError:
+                if error is None:
+                    raise
+                break
+            if delay is None:
+                raise DeadlineExceededError(
+                    "Deadline exceeded waiting for the rate limiter")
+            if delay > 0:
+                await asyncio.sleep(delay)
+            url = URL(self._url(domain, params, credential.api_key),
+                      encoded=True)
+            try:
+                result = await self._request(session, url, as_bytes, event,
+                                             deadline)
+            except WhoisApiError as rejected:
+                if not self._credentials.report(credential, rejected):
+                    raise
+                error = rejected
+                continue
+            self._credentials.report(credential)
+            return result
+        raise error
+
+    async def _request(self, session, url, as_bytes: bool = False,
+                       event=None, deadline=None):
+        start = perf_counter() if event is not None else None
+        async with self._semaphore:
+            if self._rate_limiter is not None:
+                delay = self._rate_limiter.reserve(
+                    deadline.check('rate limiting')
+                    if deadline is not None else None)
+                if delay is None:
+                    raise DeadlineExceededError(
+                        "Deadline exceeded waiting for the rate limiter")
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if event is not None:
+                sent = perf_counter()
+                event.queue += sent - start
+                event.attempts += 1
+            connect, read = self._timeouts(deadline)
+            timeout = aiohttp.ClientTimeout(
+                sock_connect=connect, sock_read=read)
+            try:
+                async with session.get(url, timeout=timeout) as response:
+                    if event is not None:
+                        received = perf_counter()
+                        event.ttfb = received - sent
+                        event.status = response.status
+                    body = await response.read()
+                    if event is not None:
+                        event.transfer = perf_counter() - received
+                        event.size = len(body)
+            except asyncio.TimeoutError as error:
+                if read < self.timeout or connect < self._connect_timeout:
+                    raise DeadlineExceededError(
+                        "Deadline exceeded during the request") from error
+                raise
+        retry_after = self._observe(response.status, response.headers)
+
+        if 200 <= response.status < 300 and as_bytes:
+            return body
+
+        text = body.decode(response.get_encoding(), 'replace')
+        if 200 <= response.status < 300:
+            return text
+
+        self._check_status(response.status, text, retry_after)
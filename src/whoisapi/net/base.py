@@ -0,0 +1,208 @@
+from ..models.request import RequestParameters
+from ..exceptions.error import ParameterError, \
+    ApiAuthError, HttpApiError, RateLimitError
+from .ratelimit import TokenBucket, shared_rate_limiter, parse_retry_after
+from .retry import RetryPolicy
+from .credentials import CredentialPool
+
+
+class BaseApiRequester:
+    """
+    Settings and request/response handling shared by the blocking and
+    the asyncio API requesters.
+    """
+    _connect_timeout = 5
+    _base_url: str
+    _parameters: RequestParameters or None
+    _timeout: float
+    _rate_limiter: TokenBucket or None
+    _retry_policy: RetryPolicy or None
+    _credentials: CredentialPool or None
+
+    def __init__(self, **kwargs):
+        """
+
+        :param kwargs: Supported parameters:
+        - url: API endpoint URL; str
+        - timeout: (optional) API call timeout in seconds; float
+        - rate_limit: (optional) requests per second shared by all
+          requesters with the same API key, or the same set of keys in
+          their credential pool, or a TokenBucket instance to use as
+          is; float or TokenBucket
+        - rate_limit_burst: (optional) requests allowed at once after
+          an idle period, default 1; int
+        - adaptive_rate_limit: (optional) lower the rate on 429/503
+          responses and raise it back while not throttled, rate_limit
+          is then the maximum rate, default False; bool
+        - retry: (optional) retry policy for transient failures, no
+          retries by default; RetryPolicy
+        - credentials: (optional) API keys to spread the requests over,
+          instead of api_key; the parameters must not set an API key;
+          CredentialPool
+        One of the following parameters (required):
+        - api_key: Your API key; str
+        - parameters: RequestParameters
+        """
+        self._base_url = ''
+        self._parameters = None
+        self.timeout = 30
+
+        if 'url' in kwargs:
+            self.base_url = kwargs.get('url')
+        if 'api_key' in kwargs and 'parameters' not in kwargs:
+            self.parameters = RequestParameters(
+                api_key=kwargs.get('api_key')
+            )
+        if 'parameters' in kwargs \
+                and isinstance(kwargs['parameters'], RequestParameters):
+            self.parameters = kwargs['parameters']
+        if 'timeout' in kwargs:
+            self.timeout = kwargs['timeout']
+
+        self.credentials = kwargs.get('credentials')
+        if self._credentials is not None:
+            if self.parameters is None:
+                self.parameters = RequestParameters()
+            elif self.parameters.api_key:
+                raise ParameterError(
+                    "API keys should be set in the credential pool only.")
+
+        if self.parameters is None:
+            raise ParameterError("Either 'api_key' or 'parameters' required.")
+
+        self.retry_policy = kwargs.get('retry')
+
+        self._rate_limiter = None
+        rate_limit = kwargs.get('rate_limit')
+        if isinstance(rate_limit, TokenBucket):
+            self._rate_limiter = rate_limit
+        elif rate_limit is not None:
+            owner = self.parameters.api_key
+            if self._credentials is not None:
+                owner = ' '.join(sorted(
+                    c.api_key for c in self._credentials))
+            self._rate_limiter = shared_rate_limiter(
+                owner,
+                rate_limit,
+                kwargs.get('rate_limit_burst', 1),
+                kwargs.get('adaptive_rate_limit', False)
+            )
+
+    @property
+    def base_url(self) -> str:
+        return self._base_url
+
+    @base_url.setter
+    def base_url(self, url: str):
+        if url is None or len(url) <= 8 or not url.startswith('http'):
+            raise ValueError("Invalid URL specified.")
+        self._base_url = url
+
+    @property
+    def parameters(self) -> RequestParameters or None:
+        return self._parameters
+
+    @parameters.setter
+    def parameters(self, params: RequestParameters):
+        if params is not None and isinstance(params, RequestParameters):
+            self._parameters = params
+        else:
+            raise TypeError(
+                "params should instance of RequestParameters class")
+
+    @property
+    def timeout(self) -> float:
+        """API call timeout in seconds"""
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value: float):
+        """API call timeout in seconds"""
+        if value is not None and 1 <= value <= 60:
+            self._timeout = value
+        else:
+            raise ValueError("Timeout value should be in [1, 60]")
+
+    @property
+    def rate_limiter(self) -> TokenBucket or None:
+        return self._rate_limiter
+
+    @property
+    def retry_policy(self) -> RetryPolicy or None:
+        return self._retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, value: RetryPolicy or None):
+        if value is None or isinstance(value, RetryPolicy):
+            self._retry_policy = value
+        else:
+            raise TypeError(
+                "retry should be an instance of RetryPolicy class")
+
+    @property
+    def credentials(self) -> CredentialPool or None:
+        return self._credentials
+
+    @credentials.setter
+    def credentials(self, value: CredentialPool or None):
+        if value is None or isinstance(value, CredentialPool):
+            self._credentials = value
+        else:
+            raise TypeError(
+                "credentials should be an instance of CredentialPool class")
+
+    def api_key(self, key: str):
+        self.parameters['api_key'] = key
+
+    def _check_pooled(self, params):
+        """A key in the parameters would be sent instead of the one the
+        credential pool picked"""
+        if isinstance(params, RequestParameters) and params.api_key:
+            raise ParameterError(
+                "API keys should be set in the credential pool only.")
+
+    def _url(self, domain, params=None, api_key: str or None = None) -> str:
+        if api_key is None:
+            api_key = self.parameters.api_key
+        if params is None or not isinstance(params, RequestParameters):
+            params = self.parameters
+        query = params.get_query_string(domain, api_key)
+        separator = '&' if '?' in self._base_url else '?'
+        return self._base_url + separator + query
+
+    def _timeouts(self, deadline=None) -> tuple:
+        """
+        :param deadline: (optional) Deadline
+        :return: tuple - (connect, read) timeouts in seconds, capped by
+          the time left before the deadline
+        :raises DeadlineExceededError: when the deadline has passed
+        """
+        if deadline is None:
+            return self._connect_timeout, self.timeout
+        remaining = deadline.check('connect')
+        return min(self._connect_timeout, remaining), \
+            min(self.timeout, remaining)
+
+    def _observe(self, status_code: int, headers) -> float or None:
+        """Report the response status to the rate limiter
+        :return: float - parsed Retry-After of a throttled response"""
+        retry_after = None
+        if status_code in (429, 503):
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+            if self._rate_limiter is not None:
+                self._rate_limiter.on_throttle(retry_after)
+        elif self._rate_limiter is not None and status_code < 300:
+            self._rate_limiter.on_success()
+        return retry_after
+
+    @staticmethod
+    def _check_status(status_code: int, text: str,
+                      retry_after: float or None = None):
+        if status_code == 429:
+            raise RateLimitError(text, retry_after)
+
+        if status_code == 401:
+            raise ApiAuthError(text)
+
+        if status_code >= 300:
+            raise HttpApiError(text, status_code)
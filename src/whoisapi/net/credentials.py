@@ -0,0 +1,247 @@
+import threading
+import time
+from .ratelimit import TokenBucket
+from ..models.request import RequestParameters
+from ..exceptions.error import ParameterError, ApiAuthError, HttpApiError, \
+    RateLimitError, ResponseError, DeadlineExceededError
+
+
+class Credential:
+    """
+    One API key of a CredentialPool with its share of the requests,
+    remaining quota, own rate limiter and counters.
+    - requests: requests the API answered
+    - failures: requests rejected because of the key (auth, quota or
+      rate limit errors)
+    """
+
+    def __init__(self, api_key: str, weight: float or None = None,
+                 quota: int or None = None,
+                 rate_limit: float or TokenBucket or None = None,
+                 rate_limit_burst: int = 1):
+        """
+
+        :param api_key: the API key; str
+        :param weight: (optional) relative share of the requests,
+          rate_limit when it's a number, 1 otherwise; float
+        :param quota: (optional) lookups left on the key, unknown by
+          default. The key leaves the rotation when it reaches 0 and
+          returns when a new quota is set; int
+        :param rate_limit: (optional) requests per second of the key, or
+          a TokenBucket to use as is; float or TokenBucket
+        :param rate_limit_burst: (optional) see TokenBucket; int
+        """
+        if RequestParameters._re_api_key.search(str(api_key)) is None:
+            raise ParameterError("Invalid API key format.")
+        self.api_key = str(api_key)
+        if isinstance(rate_limit, TokenBucket) or rate_limit is None:
+            self.rate_limiter = rate_limit
+        else:
+            self.rate_limiter = TokenBucket(rate_limit, rate_limit_burst)
+        if weight is None:
+            weight = 1.0 if rate_limit is None \
+                or isinstance(rate_limit, TokenBucket) else rate_limit
+        if float(weight) <= 0:
+            raise ValueError("Weight should be positive.")
+        self.weight = float(weight)
+        self.quota = quota
+        self.requests = 0
+        self.failures = 0
+        self._cooldown_until = 0.0
+        self._current = 0.0
+
+    @property
+    def quota(self) -> int or None:
+        return self._quota
+
+    @quota.setter
+    def quota(self, value: int or None):
+        if value is not None and int(value) < 0:
+            raise ValueError("Quota should be non-negative.")
+        self._quota = None if value is None else int(value)
+
+    def cooldown(self) -> float:
+        """Seconds until the key is back in rotation, 0 if it is"""
+        return max(0.0, self._cooldown_until - time.monotonic())
+
+    def _share(self) -> float:
+        if self._quota is None:
+            return self.weight
+        return self.weight * self._quota
+
+    def __repr__(self):
+        return 'Credential({}..., weight={}, quota={})'.format(
+            self.api_key[:6], self.weight, self._quota)
+
+
+class CredentialPool:
+    """
+    Spreads requests over several API keys.
+
+    Keys are picked by smooth weighted round robin among the keys in
+    rotation: a key's share is its weight, times its remaining quota
+    when the quota is known, so keys with quotas drain evenly. Each key
+    waits for its own rate limiter, the combined rate is the sum of the
+    per-key rates.
+
+    A key rejected by the API leaves the rotation for a while: for
+    auth_cooldown seconds on ApiAuthError or a quota error status, for
+    the Retry-After time or cooldown seconds on RateLimitError.
+    Requesters using the pool then retry the lookup with another key.
+
+    Usage:
+        pool = CredentialPool([
+            Credential('at_...', quota=10000, rate_limit=10),
+            Credential('at_...', quota=2000, rate_limit=5),
+        ])
+        client = Client(credentials=pool)
+    """
+
+    def __init__(self, credentials, cooldown: float = 60.0,
+                 auth_cooldown: float = 3600.0,
+                 quota_statuses: tuple = (402, 403)):
+        """
+
+        :param credentials: API keys; iterable of str or Credential, or
+          dict of API key to weight
+        :param cooldown: (optional) seconds a throttled key stays out of
+          rotation when the response has no Retry-After; float
+        :param auth_cooldown: (optional) seconds a rejected or exhausted
+          key stays out of rotation; float
+        :param quota_statuses: (optional) HTTP status codes meaning the
+          key has no lookups left; tuple of int
+        """
+        if isinstance(credentials, dict):
+            credentials = [Credential(key, weight)
+                           for key, weight in credentials.items()]
+        self._credentials = [
+            c if isinstance(c, Credential) else Credential(c)
+            for c in credentials]
+        if not self._credentials:
+            raise ParameterError("At least one API key required.")
+        if len({c.api_key for c in self._credentials}) \
+                != len(self._credentials):
+            raise ParameterError("Duplicate API key.")
+        if cooldown < 0 or auth_cooldown < 0:
+            raise ValueError("Cooldowns should be non-negative.")
+        self.cooldown = float(cooldown)
+        self.auth_cooldown = float(auth_cooldown)
+        self.quota_statuses = tuple(quota_statuses)
+        self._lock = threading.Lock()
+
+    @property
+    def credentials(self) -> list:
+        return list(self._credentials)
+
+    def __len__(self):
+        return len(self._credentials)
+
+    def __iter__(self):
+        return iter(self.credentials)
+
+    def available(self) -> list:
+        """Credentials in rotation now"""
+        with self._lock:
+            return self._available(time.monotonic())
+
+    def _available(self, now: float) -> list:
+        return [c for c in self._credentials
+                if c._cooldown_until <= now and c.quota != 0]
+
+    def reserve(self, max_wait: float or None = None) -> tuple:
+        """
+        Pick the next key and take a token from its rate limiter
+        :param max_wait: (optional) see TokenBucket.reserve(); float
+        :return: tuple (Credential, seconds to wait before sending the
+          request, or None if no token was taken because of max_wait)
+        :raises RateLimitError: when no key is in rotation; retry_after
+          is the time until the first one is back, None if all keys are
+          out of quota
+        """
+        with self._lock:
+            now = time.monotonic()
+            available = self._available(now)
+            if not available:
+                cooling = [c._cooldown_until - now
+                           for c in self._credentials if c.quota != 0]
+                raise RateLimitError(
+                    "No API key in rotation.",
+                    min(cooling) if cooling else None)
+            total = 0.0
+            for credential in available:
+                credential._current += credential._share()
+                total += credential._share()
+            chosen = max(available, key=lambda c: c._current)
+            chosen._current -= total
+        if chosen.rate_limiter is None:
+            return chosen, 0.0
+        return chosen, chosen.rate_limiter.reserve(max_wait)
+
+    def acquire(self, deadline=None) -> Credential:
+        """
+        Pick the next key, sleeping until its rate limiter allows a
+        request
+        :param deadline: (optional) Deadline for the wait
+        :return: Credential
+        :raises RateLimitError: see reserve()
+        :raises DeadlineExceededError: when the wait would pass the
+          deadline
+        """
+        credential, delay = self.reserve(
+            deadline.check('rate limiting') if deadline is not None
+            else None)
+        if delay is None:
+            raise DeadlineExceededError(
+                "Deadline exceeded waiting for the rate limiter")
+        if delay > 0:
+            time.sleep(delay)
+        return credential
+
+    def report(self, credential: Credential,
+               error: Exception or None = None) -> bool:
+        """
+        Record the outcome of a request sent with a key
+        :param credential: Credential the request was sent with
+        :param error: (optional) the raised error, None on success
+        :return: bool - True if the key was taken out of rotation, the
+          request may be repeated with another key
+        """
+        with self._lock:
+            if error is None or isinstance(error, ResponseError):
+                credential.requests += 1
+                if credential.quota:
+                    credential.quota -= 1
+                rejected = False
+            elif isinstance(error, RateLimitError):
+                cooldown = error.retry_after
+                self._reject(credential, self.cooldown
+                             if cooldown is None else cooldown)
+                rejected = True
+            elif isinstance(error, ApiAuthError) or (
+                    isinstance(error, HttpApiError)
+                    and error.status_code in self.quota_statuses):
+                self._reject(credential, self.auth_cooldown)
+                rejected = True
+            else:
+                return False
+        if credential.rate_limiter is not None:
+            if error is None:
+                credential.rate_limiter.on_success()
+            elif isinstance(error, RateLimitError):
+                credential.rate_limiter.on_throttle(error.retry_after)
+        return rejected
+
+    @staticmethod
+    def _reject(credential: Credential, cooldown: float):
+        credential.failures += 1
+        credential._cooldown_until = max(credential._cooldown_until,
+                                         time.monotonic() + cooldown)
+        credential._current = 0.0
+
+    def __str__(self):
+        return str({c.api_key[:6] + '...': {
+            'requests': c.requests,
+            'failures': c.failures,
+            'quota': c.quota,
+            'cooldown': c.cooldown()
+        } for c in self._credentials})
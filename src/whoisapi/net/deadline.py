@@ -0,0 +1,135 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from ..exceptions.error import DeadlineExceededError
+
+_logger = logging.getLogger('whois-api-deadline')
+
+
+class Deadline:
+    """
+    Point in time, on the time.monotonic() clock, by which a lookup has
+    to be finished, including rate limiting, retries, reading the body
+    and parsing.
+    """
+    __slots__ = ('expires',)
+
+    def __init__(self, expires: float):
+        """
+
+        :param expires: time.monotonic() value; float
+        """
+        self.expires = float(expires)
+
+    @staticmethod
+    def after(seconds: float) -> 'Deadline':
+        """Deadline the given number of seconds from now"""
+        if seconds is None or seconds <= 0:
+            raise ValueError("The time budget should be positive.")
+        return Deadline(time.monotonic() + seconds)
+
+    @staticmethod
+    def of(budget: float or None = None,
+           deadline: 'Deadline' or float or None = None) -> 'Deadline' or None:
+        """
+        :param budget: seconds from now; float
+        :param deadline: Deadline or time.monotonic() value; float
+        :return: Deadline - the earlier of both, None if neither is set
+        """
+        if deadline is not None and not isinstance(deadline, Deadline):
+            deadline = Deadline(deadline)
+        if budget is None:
+            return deadline
+        limit = Deadline.after(budget)
+        if deadline is None or limit.expires < deadline.expires:
+            return limit
+        return deadline
+
+    def remaining(self) -> float:
+        """Seconds left, 0 once expired"""
+        return max(0.0, self.expires - time.monotonic())
+
+    def check(self, phase: str) -> float:
+        """
+        :param phase: str - what the lookup was doing, for the message
+        :return: float - seconds left
+        :raises DeadlineExceededError: when the deadline has passed
+        """
+        remaining = self.expires - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceededError(
+                "Deadline exceeded during {}".format(phase))
+        return remaining
+
+    def __repr__(self):
+        return 'Deadline(remaining={:.3f})'.format(self.remaining())
+
+
+class Watchdog:
+    """
+    Calls back when deadlines pass, from a single daemon thread started
+    on first use, so watching a lookup doesn't cost a thread of its own.
+    Callbacks run with the watchdog locked and should return quickly.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._queue = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._thread = None
+
+    def watch(self, deadline: Deadline, callback) -> list:
+        """
+        :param deadline: Deadline
+        :param callback: callable() invoked once the deadline passes
+        :return: handle for cancel()
+        """
+        entry = [deadline.expires, next(self._counter), callback]
+        with self._condition:
+            heapq.heappush(self._queue, entry)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='whois-api-watchdog',
+                    daemon=True)
+                self._thread.start()
+            elif self._queue[0] is entry:
+                self._condition.notify()
+        return entry
+
+    def cancel(self, entry: list):
+        """Drop a watch; the callback has either run or never will once
+        this returns"""
+        with self._condition:
+            if entry[2] is None:
+                return
+            entry[2] = None
+            self._cancelled += 1
+            # most lookups finish in time, don't let their entries pile up
+            if self._cancelled > len(self._queue) // 2:
+                self._queue = [e for e in self._queue if e[2] is not None]
+                heapq.heapify(self._queue)
+                self._cancelled = 0
+
+    def _run(self):
+        with self._condition:
+            while True:
+                while self._queue and self._queue[0][2] is None:
+                    heapq.heappop(self._queue)
+                    self._cancelled -= 1
+                if not self._queue:
+                    self._condition.wait()
+                    continue
+                wait = self._queue[0][0] - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                entry = heapq.heappop(self._queue)
+                callback, entry[2] = entry[2], None
+                try:
+                    callback()
+                except Exception:
+                    _logger.exception("Deadline callback %r failed",
+                                      callback)
@@ -1,16 +1,21 @@
-from requests import request
-from ..models.request import RequestParameters
-from ..exceptions.error import ParameterError, \
-    ApiAuthError, HttpApiError
+from requests import Session, RequestException, Timeout
+from requests.adapters import HTTPAdapter
+from time import perf_counter
+import os
+import socket
+import threading
+from .base import BaseApiRequester
+from .deadline import Watchdog
+from ..exceptions.error import DeadlineExceededError, WhoisApiError, \
+    RateLimitError
 import logging
 
+_watchdog = Watchdog()
 
-class ApiRequester:
+
+class ApiRequester(BaseApiRequester):
     __logger = logging.getLogger("whois-api-requester")
-    __connect_timeout = 5
-    _base_url: str
-    _parameters: RequestParameters or None
-    _timeout: float
+    _session: Session or None
 
     def __init__(self, **kwargs):
         """
@@ -18,88 +23,291 @@ class ApiRequester:
         :param kwargs: Supported parameters:
         - url: API endpoint URL; str
         - timeout: (optional) API call timeout in seconds; float
+        - pool_connections: (optional) number of per-host connection
+          pools to keep, default 10; int
+        - pool_maxsize: (optional) maximum number of kept-alive
+          connections per host, default 10; int
+        - pool_block: (optional) block when all connections of a host
+          are in use instead of opening a throw-away one, default False;
+          bool
+        - max_retries: (optional) number of transport-level retries on
+          connection failures, default 0; int
+        - keep_alive: (optional) reuse connections between calls,
+          default True; bool
+        - rate_limit, rate_limit_burst, adaptive_rate_limit: (optional)
+          client-side rate limiting, see BaseApiRequester
+        - retry: (optional) retry policy for transient failures; RetryPolicy
+        - credentials: (optional) API keys to spread the requests over;
+          CredentialPool
         One of the following parameters (required):
         - api_key: Your API key; str
         - parameters: RequestParameters
         """
-        self._base_url = ''
-        self._parameters = None
-        self.timeout = 30
-
-        if 'url' in kwargs:
-            self.base_url = kwargs.get('url')
-        if 'api_key' in kwargs and 'parameters' not in kwargs:
-            self.parameters = RequestParameters(
-                api_key=kwargs.get('api_key')
-            )
-        if 'parameters' in kwargs \
-                and isinstance(kwargs['parameters'], RequestParameters):
-            self.parameters = kwargs['parameters']
-        if 'timeout' in kwargs:
-            self.timeout = kwargs['timeout']
+        self._session = None
+        super().__init__(**kwargs)
 
-        if self.parameters is None:
-            raise ParameterError("Either 'api_key' or 'parameters' required.")
+        self._session = ApiRequester._create_session(
+            pool_connections=kwargs.get('pool_connections', 10),
+            pool_maxsize=kwargs.get('pool_maxsize', 10),
+            pool_block=kwargs.get('pool_block', False),
+            max_retries=kwargs.get('max_retries', 0),
+            keep_alive=kwargs.get('keep_alive', True)
+        )
 
-    @property
-    def base_url(self) -> str:
-        return self._base_url
+    @staticmethod
+    def _create_session(pool_connections: int, pool_maxsize: int,
+                        pool_block: bool, max_retries: int,
+                        keep_alive: bool) -> Session:
+        if int(pool_connections) < 1 or int(pool_maxsize) < 1:
+            raise ValueError("Pool sizes should be positive.")
+        if int(max_retries) < 0:
+            raise ValueError("'max_retries' should be non-negative.")
 
-    @base_url.setter
-    def base_url(self, url: str):
-        if url is None or len(url) <= 8 or not url.startswith('http'):
-            raise ValueError("Invalid URL specified.")
-        self._base_url = url
+        adapter = HTTPAdapter(
+            pool_connections=int(pool_connections),
+            pool_maxsize=int(pool_maxsize),
+            pool_block=bool(pool_block),
+            max_retries=int(max_retries)
+        )
+        session = Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if not keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
 
     @property
-    def parameters(self) -> RequestParameters or None:
-        return self._parameters
+    def session(self) -> Session or None:
+        """The pooled HTTP session, None once the requester is closed"""
+        return self._session
 
-    @parameters.setter
-    def parameters(self, params: RequestParameters):
-        if params is not None and isinstance(params, RequestParameters):
-            self._parameters = params
-        else:
-            raise TypeError(
-                "params should instance of RequestParameters class")
+    def close(self):
+        """Close all pooled connections. The requester can't be used after"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
-    @property
-    def timeout(self) -> float:
-        """API call timeout in seconds"""
-        return self._timeout
-
-    @timeout.setter
-    def timeout(self, value: float):
-        """API call timeout in seconds"""
-        if value is not None and 1 <= value <= 60:
-            self._timeout = value
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get_data(self, domain, params=None, as_bytes=False, event=None,
+                 deadline=None):
+        """
+        :param domain: str - the domain name
+        :param params: RequestParameters instance (optional)
+        :param as_bytes: bool - return the undecoded response body
+        :param event: (optional) RequestEvent to record the network
+          timings in
+        :param deadline: (optional) Deadline for the rate limiter wait,
+          all attempts and reading the body
+        :return: str, or bytes if as_bytes is set
+        :raises DeadlineExceededError: when the deadline passes
+        """
+        if self._session is None:
+            raise RuntimeError("The API requester is closed.")
+
+        if self._credentials is not None:
+            self._check_pooled(params)
+            fn, args = self._pooled, (self._request, domain, params,
+                                      as_bytes, event, deadline)
         else:
-            raise ValueError("Timeout value should be in [1, 60]")
+            fn, args = self._request, (self._url(domain, params), as_bytes,
+                                       event, deadline)
+        if self._retry_policy is not None:
+            return self._retry_policy.call(fn, *args, deadline=deadline)
+        return fn(*args)
 
-    def api_key(self, key: str):
-        self.parameters['api_key'] = key
+    def iter_data(self, domain, params=None, chunk_size: int = 8192,
+                  event=None, deadline=None):
+        """
+        Read the response body incrementally instead of loading it whole
+        :param domain: str - the domain name
+        :param params: RequestParameters instance (optional)
+        :param chunk_size: int - maximum size of the yielded chunks
+        :param event: (optional) RequestEvent to record the timings up
+          to the response headers in
+        :param deadline: (optional) Deadline, also checked after every
+          chunk
+        :return: generator of bytes. The API call, including retries, is
+          made before the first chunk is yielded; the connection is
+          released when the generator is exhausted or closed
+        """
+        if self._session is None:
+            raise RuntimeError("The API requester is closed.")
 
-    def get_data(self, domain, params=None):
-        if params is not None and isinstance(params, RequestParameters):
-            if params.api_key == '':
-                params.api_key = self.parameters.api_key
-            payload = params.get_request_parameters()
+        if self._credentials is not None:
+            self._check_pooled(params)
+            fn, args = self._pooled, (self._open, domain, params, event,
+                                      deadline)
         else:
-            payload = self.parameters.get_request_parameters()
-        payload['domainName'] = domain or payload['domainName']
-
-        response = request(
-            "GET",
-            self.base_url,
-            params=payload,
-            timeout=(ApiRequester.__connect_timeout, self.timeout)
-        )
+            fn, args = self._open, (self._url(domain, params), event,
+                                    deadline)
+        if self._retry_policy is not None:
+            response = self._retry_policy.call(fn, *args, deadline=deadline)
+        else:
+            response = fn(*args)
+        return ApiRequester._iter_response(response, chunk_size, deadline)
+
+    def _pooled(self, fn, domain, params, *args):
+        """
+        Call fn(url, *args) with the URL built for the next key of the
+        credential pool, moving on to another key while keys are
+        rejected. The last argument is the deadline
+        """
+        error = None
+        for _ in range(len(self._credentials)):
+            try:
+                credential = self._credentials.acquire(args[-1])
+            except RateLimitError:
+                if error is None:
+                    raise
+                break
+            url = self._url(domain, params, credential.api_key)
+            try:
+                result = fn(url, *args)
+            except WhoisApiError as rejected:
+                if not self._credentials.report(credential, rejected):
+                    raise
+                error = rejected
+                continue
+            self._credentials.report(credential)
+            return result
+        raise error
+
+    @staticmethod
+    def _iter_response(response, chunk_size: int, deadline=None):
+        if deadline is None:
+            try:
+                for chunk in response.iter_content(chunk_size):
+                    yield chunk
+            finally:
+                response.close()
+            return
+
+        # The read timeout applies to every socket read, a slowly
+        # dripping body would never hit it: the watchdog cuts the
+        # connection when the deadline passes instead
+        expired = threading.Event()
+
+        def cut():
+            expired.set()
+            ApiRequester._shutdown(response)
 
+        watch = _watchdog.watch(deadline, cut)
+        try:
+            deadline.check('body read')
+            for chunk in response.iter_content(chunk_size):
+                if expired.is_set():
+                    break
+                deadline.check('body read')
+                yield chunk
+        except RequestException as error:
+            if expired.is_set() or deadline.remaining() == 0:
+                raise DeadlineExceededError(
+                    "Deadline exceeded during body read") from error
+            raise
+        finally:
+            _watchdog.cancel(watch)
+            response.close()
+        if expired.is_set():
+            raise DeadlineExceededError("Deadline exceeded during body read")
+
+    @staticmethod
+    def _shutdown(response):
+        """Wake up a read blocked on the response socket; closing the
+        response from another thread doesn't. The socket is reached
+        through a duplicate of its file descriptor"""
+        try:
+            sock = socket.socket(fileno=os.dup(response.raw.fileno()))
+        except (OSError, ValueError):
+            response.close()
+            return
+        with sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                response.close()
+
+    def _open(self, url: str, event=None, deadline=None):
+        response = self._send(url, True, event, deadline)
+        retry_after = self._observe(response.status_code, response.headers)
         if 200 <= response.status_code < 300:
-            return response.text
+            return response
+        try:
+            self._check_status(response.status_code, response.text,
+                               retry_after)
+        finally:
+            response.close()
+
+    def _send(self, url: str, stream: bool = False, event=None,
+              deadline=None):
+        if event is None and deadline is None:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
+            return self._session.get(
+                url,
+                timeout=(self._connect_timeout, self.timeout),
+                stream=stream
+            )
 
-        if response.status_code == 401:
-            raise ApiAuthError(response.text)
+        start = perf_counter()
+        self._acquire(deadline)
+        sent = perf_counter()
+        if event is not None:
+            event.queue += sent - start
+            event.attempts += 1
+
+        timeout = self._timeouts(deadline)
+        capped = timeout != (self._connect_timeout, self.timeout)
+        try:
+            response = self._session.get(url, timeout=timeout, stream=True)
+        except RequestException as error:
+            ApiRequester._raise_if_capped(error, capped, 'the request')
+            raise
+        received = perf_counter()
+        if event is not None:
+            event.ttfb = received - sent
+            event.status = response.status_code
+        if stream:
+            return response
+
+        if deadline is None:
+            response.content
+        else:
+            response._content = b''.join(
+                ApiRequester._iter_response(response, 16384, deadline))
+        if event is not None:
+            event.size = len(response.content)
+            event.transfer = perf_counter() - received
+        return response
+
+    def _acquire(self, deadline=None):
+        if self._rate_limiter is None:
+            return
+        if deadline is None:
+            self._rate_limiter.acquire()
+        elif self._rate_limiter.acquire(
+                deadline.check('rate limiting')) is None:
+            raise DeadlineExceededError(
+                "Deadline exceeded waiting for the rate limiter")
+
+    @staticmethod
+    def _raise_if_capped(error: Exception, capped: bool, phase: str):
+        """A timeout shortened to the remaining budget means the deadline
+        has passed"""
+        if capped and isinstance(error, Timeout):
+            raise DeadlineExceededError(
+                "Deadline exceeded during {}".format(phase)) from error
+
+    def _request(self, url: str, as_bytes: bool = False, event=None,
+                 deadline=None):
+        response = self._send(url, False, event, deadline)
+        retry_after = self._observe(response.status_code, response.headers)
+
+        if 200 <= response.status_code < 300:
+            return response.content if as_bytes else response.text
 
-        if response.status_code >= 300:
-            raise HttpApiError(response.text)
+        self._check_status(response.status_code, response.text, retry_after)
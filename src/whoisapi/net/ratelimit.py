@@ -0,0 +1,195 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import datetime
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens are handed out by reservation: reserve() books the next free
+    slot and returns how long the caller has to wait for it, so the same
+    bucket serves blocking and asyncio callers.
+    """
+    _rate: float
+    _burst: int
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+
+        :param rate: requests per second; float
+        :param burst: (optional) number of requests allowed at once
+          after an idle period, default 1; int
+        """
+        self._lock = threading.Lock()
+        self._tat = 0.0
+        self._blocked_until = 0.0
+        self.rate = rate
+        self.burst = burst
+
+    @property
+    def rate(self) -> float:
+        """Requests per second"""
+        return self._rate
+
+    @rate.setter
+    def rate(self, value: float):
+        if value is not None and float(value) > 0:
+            self._rate = float(value)
+        else:
+            raise ValueError("Rate should be positive.")
+
+    @property
+    def burst(self) -> int:
+        return self._burst
+
+    @burst.setter
+    def burst(self, value: int):
+        if value is not None and int(value) >= 1:
+            self._burst = int(value)
+        else:
+            raise ValueError("Burst should be positive.")
+
+    def reserve(self, max_wait: float or None = None) -> float or None:
+        """
+        Take a token
+        :param max_wait: (optional) don't take a token that is available
+          later than this many seconds from now; float
+        :return: float - seconds to wait before sending the request,
+          None if no token was taken because of max_wait
+        """
+        with self._lock:
+            now = time.monotonic()
+            interval = 1.0 / self._rate
+            tolerance = (self._burst - 1) * interval
+            tat = max(self._tat, now, self._blocked_until + tolerance)
+            delay = max(0.0, tat - tolerance - now)
+            if max_wait is not None and delay > max_wait:
+                return None
+            self._tat = tat + interval
+            return delay
+
+    def acquire(self, max_wait: float or None = None) -> float or None:
+        """
+        Take a token, sleeping until it is available
+        :param max_wait: (optional) see reserve(); float
+        :return: float - seconds waited, None if no token was taken
+        """
+        delay = self.reserve(max_wait)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for the given number of seconds"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until,
+                                      time.monotonic() + seconds)
+
+    def on_success(self):
+        """Called after a response that was not throttled"""
+        pass
+
+    def on_throttle(self, retry_after: float or None = None):
+        """Called after a 429 or 503 response"""
+        if retry_after:
+            self.pause(retry_after)
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    Token bucket with AIMD (additive increase, multiplicative decrease)
+    rate control.
+
+    The rate grows by about `increase` requests per second for every
+    second of unthrottled traffic and is multiplied by `decrease` when
+    the API throttles, at most once per `cooldown` seconds so a burst of
+    throttled in-flight requests counts as one signal.
+    """
+
+    def __init__(self, rate: float, burst: int = 1,
+                 min_rate: float = 0.5, increase: float = 1.0,
+                 decrease: float = 0.5, cooldown: float = 1.0):
+        """
+
+        :param rate: maximum (and initial) requests per second; float
+        :param burst: (optional) see TokenBucket; int
+        :param min_rate: (optional) the rate never drops below; float
+        :param increase: (optional) additive increase step in requests
+          per second; float
+        :param decrease: (optional) multiplicative decrease factor in
+          (0, 1); float
+        :param cooldown: (optional) seconds between two decreases; float
+        """
+        super().__init__(rate, burst)
+        if not 0 < decrease < 1:
+            raise ValueError("'decrease' should be in (0, 1).")
+        if not 0 < min_rate <= rate:
+            raise ValueError("'min_rate' should be in (0, rate].")
+        self.max_rate = float(rate)
+        self.min_rate = float(min_rate)
+        self.increase = float(increase)
+        self.decrease = float(decrease)
+        self.cooldown = float(cooldown)
+        self._last_decrease = 0.0
+
+    def on_success(self):
+        with self._lock:
+            self._rate = min(self.max_rate,
+                             self._rate + self.increase / self._rate)
+
+    def on_throttle(self, retry_after: float or None = None):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.cooldown:
+                self._rate = max(self.min_rate, self._rate * self.decrease)
+                self._last_decrease = now
+        super().on_throttle(retry_after)
+
+
+_shared_limiters = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def shared_rate_limiter(api_key: str, rate: float, burst: int = 1,
+                        adaptive: bool = False) -> TokenBucket:
+    """
+    Get the rate limiter shared by all requesters using the API key.
+    The first call for a key creates the limiter with the given settings,
+    later calls return it unchanged.
+    """
+    with _shared_limiters_lock:
+        limiter = _shared_limiters.get(api_key)
+        if limiter is None:
+            if adaptive:
+                limiter = AdaptiveRateLimiter(
+                    rate, burst, min_rate=min(0.5, rate))
+            else:
+                limiter = TokenBucket(rate, burst)
+            _shared_limiters[api_key] = limiter
+        return limiter
+
+
+def parse_retry_after(value: str or None) -> float or None:
+    """
+    Parse a Retry-After header value
+    :return: float - seconds, or None if absent or unparsable
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date is None:
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max(0.0, (date - now).total_seconds())
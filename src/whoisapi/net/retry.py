@@ -0,0 +1,200 @@
+import asyncio
+import random
+import threading
+import time
+from requests import ConnectionError, Timeout
+from ..exceptions.error import ApiAuthError, HttpApiError, \
+    RateLimitError, ResponseError, DeadlineExceededError
+
+_transient_errors = (ConnectionError, Timeout, asyncio.TimeoutError)
+
+
+def register_transient_errors(*types):
+    """
+    Retry these exception types too. AsyncApiRequester registers the
+    aiohttp connection errors, so aiohttp isn't imported here
+    :param types: exception classes
+    """
+    global _transient_errors
+    _transient_errors += tuple(
+        t for t in types if t not in _transient_errors)
+
+
+class RetryStats:
+    """
+    Counters of a RetryPolicy, shared by all requests it serves.
+    - calls: number of retried operations
+    - attempts: total number of tries
+    - retries: tries after the first one
+    - giveups: operations failed after retrying
+    - backoff_time: seconds spent sleeping between tries
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.giveups = 0
+        self.backoff_time = 0.0
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.attempts = 0
+            self.retries = 0
+            self.giveups = 0
+            self.backoff_time = 0.0
+
+    def _record(self, attempts: int, backoff_time: float, gave_up: bool):
+        with self._lock:
+            self.calls += 1
+            self.attempts += attempts
+            self.retries += attempts - 1
+            self.backoff_time += backoff_time
+            if gave_up:
+                self.giveups += 1
+
+    def __str__(self):
+        return str({
+            'calls': self.calls,
+            'attempts': self.attempts,
+            'retries': self.retries,
+            'giveups': self.giveups,
+            'backoff_time': self.backoff_time
+        })
+
+
+class RetryPolicy:
+    """
+    Retries transient failures with exponential backoff and full jitter.
+
+    Retried: connection errors, timeouts, RateLimitError and HttpApiError
+    with a status code from `retry_statuses`. Never retried: ApiAuthError,
+    ResponseError (the API answered with an ErrorMessage) and any other
+    error.
+    """
+    _default_statuses = (429, 500, 502, 503, 504)
+
+    def __init__(self, max_attempts: int = 3, backoff_factor: float = 0.5,
+                 max_backoff: float = 30.0, jitter: bool = True,
+                 deadline: float or None = None,
+                 retry_statuses: tuple or None = None):
+        """
+
+        :param max_attempts: (optional) tries per request including the
+          first one; int
+        :param backoff_factor: (optional) the n-th retry waits up to
+          backoff_factor * 2 ** (n - 1) seconds; float
+        :param max_backoff: (optional) upper bound of one wait; float
+        :param jitter: (optional) wait a random time in [0, backoff]
+          instead of the full backoff; bool
+        :param deadline: (optional) give up when the next try would
+          start later than this many seconds after the first one; float
+        :param retry_statuses: (optional) HTTP status codes to retry;
+          tuple of int
+        """
+        if max_attempts is None or int(max_attempts) < 1:
+            raise ValueError("'max_attempts' should be positive.")
+        if backoff_factor < 0 or max_backoff < 0:
+            raise ValueError("Backoff values should be non-negative.")
+        if deadline is not None and deadline <= 0:
+            raise ValueError("'deadline' should be positive.")
+        self.max_attempts = int(max_attempts)
+        self.backoff_factor = float(backoff_factor)
+        self.max_backoff = float(max_backoff)
+        self.jitter = bool(jitter)
+        self.deadline = deadline
+        self.retry_statuses = tuple(retry_statuses) \
+            if retry_statuses is not None else RetryPolicy._default_statuses
+        self.stats = RetryStats()
+
+    def is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, (ApiAuthError, ResponseError)):
+            return False
+        if isinstance(error, RateLimitError):
+            return True
+        if isinstance(error, HttpApiError):
+            return error.status_code in self.retry_statuses
+        return isinstance(error, _transient_errors)
+
+    def backoff(self, retry: int, error: Exception or None = None) -> float:
+        """
+        :param retry: int - number of the retry, starting from 1
+        :param error: the error that caused the retry
+        :return: float - seconds to wait before the retry
+        """
+        delay = min(self.max_backoff,
+                    self.backoff_factor * (2 ** (retry - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if isinstance(error, RateLimitError) and error.retry_after:
+            delay = max(delay, min(self.max_backoff, error.retry_after))
+        return delay
+
+    def _next_delay(self, attempt: int, error: Exception,
+                    started: float) -> float or None:
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return None
+        delay = self.backoff(attempt, error)
+        if self.deadline is not None \
+                and time.monotonic() + delay - started > self.deadline:
+            return None
+        return delay
+
+    def _check_deadline(self, delay: float, error: Exception,
+                        deadline, attempt: int, backoff_time: float):
+        if deadline is not None and delay >= deadline.remaining():
+            self.stats._record(attempt, backoff_time, True)
+            raise DeadlineExceededError(
+                "Deadline exceeded before retry {}".format(attempt)) \
+                from error
+
+    def call(self, fn, *args, deadline=None, **kwargs):
+        """
+        Call fn(*args, **kwargs), retrying according to the policy
+        :param deadline: (optional) Deadline; a retry that couldn't start
+          before it raises DeadlineExceededError instead
+        """
+        started = time.monotonic()
+        backoff_time = 0.0
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as error:
+                delay = self._next_delay(attempt, error, started)
+                if delay is None:
+                    self.stats._record(attempt, backoff_time, attempt > 1)
+                    raise
+                self._check_deadline(
+                    delay, error, deadline, attempt, backoff_time)
+                backoff_time += delay
+                time.sleep(delay)
+                continue
+            self.stats._record(attempt, backoff_time, False)
+            return result
+
+    async def call_async(self, fn, *args, deadline=None, **kwargs):
+        """Await fn(*args, **kwargs), retrying according to the policy
+        :param deadline: (optional) Deadline, see call()"""
+        started = time.monotonic()
+        backoff_time = 0.0
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as error:
+                delay = self._next_delay(attempt, error, started)
+                if delay is None:
+                    self.stats._record(attempt, backoff_time, attempt > 1)
+                    raise
+                self._check_deadline(
+                    delay, error, deadline, attempt, backoff_time)
+                backoff_time += delay
+                await asyncio.sleep(delay)
+                continue
+            self.stats._record(attempt, backoff_time, False)
+            return result
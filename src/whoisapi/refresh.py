@@ -0,0 +1,372 @@
+import datetime
+import heapq
+import itertools
+import logging
+import threading
+import time
+from requests import RequestException
+from .client import Client
+from .models.request import RequestParameters
+from .net.ratelimit import TokenBucket
+from .exceptions.error import WhoisApiError
+
+DAY = 86400.0
+_logger = logging.getLogger('whois-api-refresh')
+
+
+def _timestamp(value: datetime.datetime or None) -> float or None:
+    """time.time() value of a date, naive dates are taken as UTC"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()
+
+
+class RefreshStats:
+    """
+    Counters of a RefreshScheduler.
+    - refreshes: background lookups that succeeded
+    - failures: background lookups that failed
+    - fresh_hits: get() calls served a record that wasn't due yet
+    - stale_hits: get() calls served a due record awaiting its refresh
+    - misses: get() calls that had to look the domain up first
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.refreshes = 0
+        self.failures = 0
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def reset(self):
+        with self._lock:
+            self.refreshes = 0
+            self.failures = 0
+            self.fresh_hits = 0
+            self.stale_hits = 0
+            self.misses = 0
+
+    def _add(self, counter: str, value: int = 1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def __str__(self):
+        return str({
+            'refreshes': self.refreshes,
+            'failures': self.failures,
+            'fresh_hits': self.fresh_hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses
+        })
+
+
+class RefreshScheduler:
+    """
+    Keeps the records of tracked domains up to date with a limited number
+    of lookups per hour.
+
+    Domains sit in a priority queue ordered by their next-due time, which
+    is derived from the last record:
+    - around the expiry date, from renewal_window before it to
+      grace_period after it, the domain is refreshed every min_interval,
+      as that's when registrations change
+    - otherwise the interval is a tenth of the time since the last
+      change, the latest of updated_date and audit.updated_date, within
+      [min_interval, max_interval]; a domain about to enter the renewal
+      window is due when it does
+    - failed lookups are retried after min_interval
+
+    get() serves the last record even when it's due (stale while
+    revalidate); the background worker started by start() refreshes due
+    domains, taking one token per lookup from the hourly budget.
+
+    Usage:
+        with RefreshScheduler(client, lookups_per_hour=500) as scheduler:
+            scheduler.track_all(domains)
+            ...
+            whois = scheduler.get('whoisxmlapi.com')
+    """
+    def __init__(self, client: Client, lookups_per_hour: float = 100,
+                 params: RequestParameters or None = None,
+                 min_interval: float = DAY, max_interval: float = 30 * DAY,
+                 renewal_window: float = 30 * DAY,
+                 grace_period: float = 45 * DAY, on_refresh=None):
+        """
+
+        :param client: Client used for the lookups
+        :param lookups_per_hour: (optional) background lookup budget, or a
+          TokenBucket to take the tokens from; float or TokenBucket
+        :param params: (optional) RequestParameters of the lookups;
+          refreshes are sent with prefer_fresh=1, bypassing the client
+          cache
+        :param min_interval: (optional) seconds; float
+        :param max_interval: (optional) seconds; float
+        :param renewal_window: (optional) seconds before the expiry date
+          refreshed every min_interval; float
+        :param grace_period: (optional) seconds after the expiry date
+          refreshed every min_interval; float
+        :param on_refresh: (optional) callable(domain, result) invoked
+          after every background lookup with the new record or the
+          raised exception; exceptions it raises are logged
+        """
+        if not 0 < min_interval <= max_interval:
+            raise ValueError(
+                "Intervals should be positive, min <= max.")
+        if isinstance(lookups_per_hour, TokenBucket):
+            self._budget = lookups_per_hour
+        elif lookups_per_hour is not None and lookups_per_hour > 0:
+            self._budget = TokenBucket(lookups_per_hour / 3600.0)
+        else:
+            raise ValueError("'lookups_per_hour' should be positive.")
+        if params is None:
+            params = client.parameters
+        self.client = client
+        self.params = params
+        self._refresh_params = params.copy(prefer_fresh=1)
+        self.min_interval = float(min_interval)
+        self.max_interval = float(max_interval)
+        self.renewal_window = float(renewal_window)
+        self.grace_period = float(grace_period)
+        self.on_refresh = on_refresh
+        self.stats = RefreshStats()
+
+        self._condition = threading.Condition()
+        self._queue = []
+        self._counter = itertools.count()
+        self._due = {}
+        self._records = {}
+        self._refreshing = set()
+        self._worker = None
+        self._stopped = False
+
+    def next_due(self, record, now: float or None = None) -> float:
+        """
+        :param record: WhoisRecord
+        :param now: (optional) time.time() value
+        :return: float - time.time() value the record should be
+          refreshed at
+        """
+        if now is None:
+            now = time.time()
+        expires = _timestamp(record.expires_date)
+        if expires is not None and \
+                expires - self.renewal_window <= now \
+                < expires + self.grace_period:
+            return now + self.min_interval
+
+        changes = [_timestamp(record.updated_date)]
+        if record.audit is not None:
+            changes.append(_timestamp(record.audit.updated_date))
+        changes = [c for c in changes if c is not None and c <= now]
+        if changes:
+            interval = (now - max(changes)) / 10
+        else:
+            interval = self.max_interval
+        due = now + min(max(interval, self.min_interval), self.max_interval)
+
+        if expires is not None and now < expires - self.renewal_window:
+            due = min(due, expires - self.renewal_window)
+        return due
+
+    def track(self, domain: str, record=None):
+        """
+        Start refreshing a domain
+        :param domain: str - the domain name
+        :param record: (optional) the current record, e.g. from a cache;
+          the domain is due at once without it
+        """
+        domain = domain.lower()
+        with self._condition:
+            if record is not None:
+                self._records[domain] = record
+                self._schedule(domain, self.next_due(record))
+            elif domain not in self._due:
+                self._schedule(domain, time.time())
+
+    def track_all(self, domains):
+        """Track every domain of an iterable"""
+        for domain in domains:
+            self.track(domain)
+
+    def untrack(self, domain: str):
+        domain = domain.lower()
+        with self._condition:
+            self._due.pop(domain, None)
+            self._records.pop(domain, None)
+            self._refreshing.discard(domain)
+
+    def __len__(self):
+        with self._condition:
+            return len(self._due) + len(self._refreshing)
+
+    def __contains__(self, domain: str):
+        with self._condition:
+            domain = domain.lower()
+            return domain in self._due or domain in self._refreshing
+
+    def due(self, domain: str) -> float or None:
+        """time.time() value the domain is due at, None if untracked"""
+        with self._condition:
+            return self._due.get(domain.lower())
+
+    def get(self, domain: str):
+        """
+        The last record of a domain, which is tracked from now on.
+        Due records are served while they wait for their refresh; a
+        domain without a record is looked up at once, outside the budget.
+        :param domain: str - the domain name
+        :return: WhoisRecord
+        :raises: see Client.data
+        """
+        key = domain.lower()
+        with self._condition:
+            record = self._records.get(key)
+            due = self._due.get(key)
+        if record is not None:
+            # a record without a due time is being refreshed
+            stale = due is None or due <= time.time()
+            self.stats._add('stale_hits' if stale else 'fresh_hits')
+            return record
+
+        self.stats._add('misses')
+        record = self.client.data(domain, self.params)
+        self.track(key, record)
+        return record
+
+    def refresh_due(self, limit: int or None = None) -> int:
+        """
+        Refresh the due domains in the calling thread, waiting for the
+        budget between lookups
+        :param limit: (optional) maximum number of lookups; int
+        :return: int - number of lookups made
+        """
+        count = 0
+        while limit is None or count < limit:
+            with self._condition:
+                domain = self._pop_due(time.time())
+            if domain is None:
+                break
+            delay = self._budget.reserve()
+            if delay > 0:
+                time.sleep(delay)
+            self._refresh(domain)
+            count += 1
+        return count
+
+    def start(self):
+        """Start the background worker"""
+        with self._condition:
+            if self._worker is not None and self._worker.is_alive():
+                raise RuntimeError("The scheduler is already running.")
+            self._stopped = False
+            self._worker = threading.Thread(
+                target=self._run, name='whois-api-refresh', daemon=True)
+            self._worker.start()
+        return self
+
+    def stop(self, timeout: float or None = None):
+        """Stop the background worker; a lookup in progress finishes"""
+        with self._condition:
+            worker = self._worker
+            self._stopped = True
+            self._condition.notify_all()
+        if worker is not None:
+            worker.join(timeout)
+        with self._condition:
+            self._worker = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _schedule(self, domain: str, due: float):
+        self._due[domain] = due
+        heapq.heappush(self._queue, (due, next(self._counter), domain))
+        self._condition.notify_all()
+
+    def _wait_time(self, now: float) -> float or None:
+        """
+        Seconds until the first tracked domain is due, 0 when one is due
+        and None when nothing is tracked; drops stale queue entries
+        """
+        while self._queue:
+            due, _, domain = self._queue[0]
+            if self._due.get(domain) != due:
+                heapq.heappop(self._queue)
+                continue
+            return max(0.0, due - now)
+        return None
+
+    def _pop_due(self, now: float) -> str or None:
+        """Take the first due domain off the queue"""
+        if self._wait_time(now) != 0.0:
+            return None
+        _, _, domain = heapq.heappop(self._queue)
+        del self._due[domain]
+        self._refreshing.add(domain)
+        return domain
+
+    def _finish(self, domain: str) -> bool:
+        """End a refresh, False if the domain was untracked meanwhile"""
+        if domain not in self._refreshing:
+            return False
+        self._refreshing.discard(domain)
+        return True
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    wait = self._wait_time(time.time())
+                    if wait == 0.0:
+                        break
+                    self._condition.wait(wait)
+                if self._stopped:
+                    return
+            # the token is taken first, an interrupted wait loses it
+            delay = self._budget.reserve()
+            with self._condition:
+                if delay > 0:
+                    self._condition.wait_for(lambda: self._stopped, delay)
+                if self._stopped:
+                    return
+                domain = self._pop_due(time.time())
+            if domain is not None:
+                self._refresh(domain)
+
+    def _refresh(self, domain: str):
+        try:
+            record = self.client.data(domain, self._refresh_params)
+            due = self.next_due(record)
+        except Exception as error:
+            self.stats._add('failures')
+            if isinstance(error, (WhoisApiError, RequestException)):
+                _logger.info("Refreshing %s failed: %s", domain, error)
+            else:
+                _logger.exception("Refreshing %s failed", domain)
+            with self._condition:
+                if not self._finish(domain):
+                    return
+                if domain not in self._due:
+                    self._schedule(domain, time.time() + self.min_interval)
+            result = error
+        else:
+            self.stats._add('refreshes')
+            with self._condition:
+                if not self._finish(domain):
+                    return
+                self._records[domain] = record
+                if domain not in self._due:
+                    self._schedule(domain, due)
+            result = record
+        if self.on_refresh is not None:
+            try:
+                self.on_refresh(domain, result)
+            except Exception:
+                _logger.exception("Refresh callback %r failed",
+                                  self.on_refresh)
@@ -0,0 +1,216 @@
+import calendar
+import datetime
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from .decoders import XmlDecoder, get_decoder
+from .models.projection import Projection
+from .models.response import WhoisRecord
+
+StoredRecord = namedtuple('StoredRecord', [
+    'domain_name', 'expires_date', 'registrar_name', 'country_code',
+    'fetched'])
+StoredRecord.__doc__ = """Indexed fields of a stored record; expires_date
+is a UTC datetime or None, fetched a time.time() value"""
+
+INDEXED_FIELDS = ('domain_name', 'expires_date', 'registrar_name',
+                  'registrant.country_code')
+
+
+def _epoch(value: datetime.datetime or None) -> int or None:
+    """Seconds since the epoch, naive datetimes are taken as UTC"""
+    if value is None:
+        return None
+    return calendar.timegm(value.utctimetuple())
+
+
+def _from_epoch(value: int or None) -> datetime.datetime or None:
+    if value is None:
+        return None
+    return datetime.datetime.fromtimestamp(value, datetime.timezone.utc)
+
+
+class RecordStore:
+    """
+    Local copy of fetched whois records in a SQLite database.
+
+    The raw response of every stored domain is kept, one row per domain,
+    together with its domain name, expiry date, registrar name and
+    registrant country code in indexed columns. Queries on those fields
+    use the indexes and return StoredRecord rows without parsing the
+    responses; get() parses the full record.
+
+    Usage:
+        store = RecordStore('records.db')
+        client = Client(api_key=..., store=store)
+        ...
+        store.expiring(days=30)
+        store.find(registrar_name='GoDaddy.com, LLC')
+    """
+    _schema = (
+        'CREATE TABLE IF NOT EXISTS whois_records ('
+        'domain_name TEXT PRIMARY KEY, '
+        'expires_date INTEGER, '
+        'registrar_name TEXT COLLATE NOCASE, '
+        'country_code TEXT COLLATE NOCASE, '
+        'fetched REAL NOT NULL, '
+        'format TEXT NOT NULL, '
+        'response BLOB NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS whois_records_expires '
+        'ON whois_records (expires_date)',
+        'CREATE INDEX IF NOT EXISTS whois_records_registrar '
+        'ON whois_records (registrar_name)',
+        'CREATE INDEX IF NOT EXISTS whois_records_country '
+        'ON whois_records (country_code)',
+    )
+    _columns = 'domain_name, expires_date, registrar_name, country_code, ' \
+               'fetched'
+
+    def __init__(self, path: str, record_class=WhoisRecord):
+        """
+
+        :param path: database file path, ':memory:' for a temporary
+          store; str
+        :param record_class: (optional) class of the records get()
+          returns, e.g. LazyWhoisRecord
+        """
+        self.record_class = record_class
+        self._index_projection = Projection(INDEXED_FIELDS)
+        self._decoders = {'json': get_decoder('auto'), 'xml': XmlDecoder()}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            for statement in RecordStore._schema:
+                self._db.execute(statement)
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                'SELECT COUNT(*) FROM whois_records').fetchone()[0]
+
+    def __contains__(self, domain: str):
+        with self._lock:
+            return self._db.execute(
+                'SELECT 1 FROM whois_records WHERE domain_name = ?',
+                (domain.lower(),)).fetchone() is not None
+
+    def put(self, domain: str, response: bytes or str,
+            output_format: str = 'json', record=None):
+        """
+        Store or replace the record of a domain
+        :param domain: str - the looked up domain name
+        :param response: bytes or str - the raw API response
+        :param output_format: (optional) 'json' or 'xml'; str
+        :param record: (optional) the WhoisRecord built from the
+          response, decoded again when not given
+        """
+        output_format = output_format.lower()
+        if isinstance(response, str):
+            response = response.encode('utf-8')
+        if record is None:
+            values = self._decoders[output_format].decode(response)
+            record = self._index_projection.build(values.get('WhoisRecord'))
+        country_code = None
+        if record.registrant is not None:
+            country_code = record.registrant.country_code or None
+        row = (domain.lower(), _epoch(record.expires_date),
+               record.registrar_name or None, country_code, time.time(),
+               output_format, response)
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO whois_records ({}, format, response) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)'.format(RecordStore._columns),
+                row)
+
+    def get(self, domain: str):
+        """
+        :param domain: str - the domain name
+        :return: the parsed record, None if the domain isn't stored
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT format, response FROM whois_records '
+                'WHERE domain_name = ?', (domain.lower(),)).fetchone()
+        if row is None:
+            return None
+        values = self._decoders[row[0]].decode(row[1])
+        return self.record_class(values['WhoisRecord'])
+
+    def get_raw(self, domain: str) -> bytes or None:
+        """The stored raw response, None if the domain isn't stored"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT response FROM whois_records WHERE domain_name = ?',
+                (domain.lower(),)).fetchone()
+        return row[0] if row is not None else None
+
+    def find(self, expires_after: datetime.datetime or None = None,
+             expires_before: datetime.datetime or None = None,
+             registrar_name: str or None = None,
+             country_code: str or None = None,
+             limit: int or None = None) -> list:
+        """
+        Stored records matching all given conditions, ordered by expiry
+        date. Name and country code comparisons ignore case.
+        :param expires_after: (optional) expiring at or after; datetime
+        :param expires_before: (optional) expiring before; datetime
+        :param registrar_name: (optional) exact registrar name; str
+        :param country_code: (optional) registrant country code; str
+        :param limit: (optional) maximum number of rows; int
+        :return: list of StoredRecord
+        """
+        conditions = []
+        args = []
+        if expires_after is not None:
+            conditions.append('expires_date >= ?')
+            args.append(_epoch(expires_after))
+        if expires_before is not None:
+            conditions.append('expires_date < ?')
+            args.append(_epoch(expires_before))
+        if registrar_name is not None:
+            conditions.append('registrar_name = ?')
+            args.append(registrar_name)
+        if country_code is not None:
+            conditions.append('country_code = ?')
+            args.append(country_code)
+        query = 'SELECT {} FROM whois_records'.format(RecordStore._columns)
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY expires_date, domain_name'
+        if limit is not None:
+            query += ' LIMIT ?'
+            args.append(int(limit))
+        with self._lock:
+            rows = self._db.execute(query, args).fetchall()
+        return [StoredRecord(domain, _from_epoch(expires), registrar,
+                             country, fetched)
+                for domain, expires, registrar, country, fetched in rows]
+
+    def expiring(self, days: float = 30, now=None) -> list:
+        """
+        Stored records expiring within the given number of days
+        :param days: (optional) float
+        :param now: (optional) reference time, the current time by
+          default; datetime
+        :return: list of StoredRecord, soonest first
+        """
+        if now is None:
+            now = datetime.datetime.now(datetime.timezone.utc)
+        return self.find(expires_after=now,
+                         expires_before=now + datetime.timedelta(days=days))
+
+    def delete(self, domain: str):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM whois_records WHERE domain_name = ?',
+                             (domain.lower(),))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,229 @@
+import re
+
+_re_string_special = re.compile(rb'["\\]')
+_whitespace = b' \t\r\n'
+_max_key_length = 64
+_escapes = {
+    ord('"'): b'"', ord('\\'): b'\\', ord('/'): b'/', ord('b'): b'\b',
+    ord('f'): b'\f', ord('n'): b'\n', ord('r'): b'\r', ord('t'): b'\t',
+}
+
+_OUTSIDE = 0
+_STRING = 1
+_SKIPPED = 2
+
+
+class _TextDecoder:
+    """Writes the unescaped UTF-8 bytes of a JSON string to a file"""
+
+    def __init__(self, file):
+        self.file = file
+        self._escape = b''
+        self._high_surrogate = None
+
+    def write(self, data: bytes):
+        if data:
+            self._flush_surrogate()
+            self.file.write(data)
+
+    def escape(self, data: bytes) -> int:
+        """
+        Feed bytes following a backslash
+        :return: int - number of bytes consumed, the escape is complete
+          when self.pending is False
+        """
+        if not self._escape:
+            code = data[0]
+            if code != ord('u'):
+                self._flush_surrogate()
+                self.file.write(_escapes.get(code, bytes((code,))))
+                return 1
+        needed = 5 - len(self._escape)
+        self._escape += data[:needed]
+        if len(self._escape) == 5:
+            self._unicode(int(self._escape[1:], 16))
+            self._escape = b''
+        return min(needed, len(data))
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._escape)
+
+    def _unicode(self, code: int):
+        if 0xD800 <= code < 0xDC00:
+            self._flush_surrogate()
+            self._high_surrogate = code
+            return
+        if 0xDC00 <= code < 0xE000 and self._high_surrogate is not None:
+            code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) \
+                + (code - 0xDC00)
+            self._high_surrogate = None
+        self._flush_surrogate()
+        self.file.write(chr(code).encode('utf-8', 'replace'))
+
+    def _flush_surrogate(self):
+        if self._high_surrogate is not None:
+            self._high_surrogate = None
+            self.file.write('�'.encode('utf-8'))
+
+    def close(self):
+        self._flush_surrogate()
+        self.file.close()
+
+
+class TextFieldFilter:
+    """
+    Incrementally copies a JSON document while cutting out the string
+    values of the given keys, so large texts such as rawText are never
+    held in memory. A cut value becomes an empty string in the copy.
+
+    The cut values can be spilled: spill(path) is called with the dotted
+    path of each one, e.g. 'WhoisRecord.registryData.rawText', and may
+    return a writable binary file that receives the UTF-8 encoded text,
+    or None to drop it. The file is closed after the value is written.
+    """
+
+    def __init__(self, skip_keys=('rawText', 'strippedText'), spill=None):
+        """
+
+        :param skip_keys: (optional) keys whose string values are cut out;
+          iterable of str
+        :param spill: (optional) callable(path: str) returning a binary
+          file or None
+        """
+        self._skip_keys = frozenset(k.encode('utf-8') for k in skip_keys)
+        self._spill = spill
+        self._output = []
+        self._state = _OUTSIDE
+        self._escaped = False
+        self._key = bytearray()
+        self._key_too_long = False
+        self._last_string = None
+        self._after_string = False
+        self._colon = False
+        self._stack = []
+        self._text = None
+        self.skipped_bytes = 0
+
+    def feed(self, chunk: bytes):
+        """Process the next part of the document"""
+        position = 0
+        length = len(chunk)
+        while position < length:
+            if self._state == _OUTSIDE:
+                position = self._outside(chunk, position)
+            elif self._state == _STRING:
+                position = self._string(chunk, position)
+            else:
+                position = self._skipped(chunk, position)
+
+    def close(self) -> bytes:
+        """
+        :return: bytes - the document without the cut values
+        """
+        if self._text is not None:
+            self._text.close()
+            self._text = None
+        output = b''.join(self._output)
+        self._output = []
+        return output
+
+    def _path(self, key: bytes) -> str:
+        names = [k.decode('utf-8', 'replace') for k in self._stack if k]
+        names.append(key.decode('utf-8', 'replace'))
+        return '.'.join(names)
+
+    def _outside(self, chunk: bytes, position: int) -> int:
+        end = chunk.find(b'"', position)
+        gap = chunk[position:] if end < 0 else chunk[position:end]
+        self._output.append(gap)
+        for code in gap:
+            if code in _whitespace:
+                continue
+            if code == 58 and self._after_string and not self._colon:  # :
+                self._colon = True
+                continue
+            if code == 123 or code == 91:  # { [
+                self._stack.append(self._last_string if self._colon else None)
+            elif (code == 125 or code == 93) and self._stack:  # } ]
+                self._stack.pop()
+            self._after_string = False
+            self._colon = False
+        if end < 0:
+            return len(chunk)
+
+        key = self._last_string \
+            if self._after_string and self._colon else None
+        self._after_string = False
+        self._colon = False
+        if key is not None and key in self._skip_keys:
+            self._output.append(b'""')
+            self._state = _SKIPPED
+            file = self._spill(self._path(key)) \
+                if self._spill is not None else None
+            self._text = _TextDecoder(file) if file is not None else None
+        else:
+            self._output.append(b'"')
+            self._state = _STRING
+            self._key = bytearray()
+            self._key_too_long = False
+        return end + 1
+
+    def _string(self, chunk: bytes, position: int) -> int:
+        start = position
+        if self._escaped:
+            self._escaped = False
+            position += 1
+        while True:
+            match = _re_string_special.search(chunk, position)
+            if match is None:
+                position = len(chunk)
+                break
+            position = match.end()
+            if match.group() == b'\\':
+                if position == len(chunk):
+                    self._escaped = True
+                    break
+                position += 1
+                continue
+            self._state = _OUTSIDE
+            break
+
+        piece = chunk[start:position]
+        self._output.append(piece)
+        if not self._key_too_long:
+            self._key += piece
+            if len(self._key) > _max_key_length:
+                self._key_too_long = True
+        if self._state == _OUTSIDE:
+            self._last_string = None if self._key_too_long \
+                else bytes(self._key[:-1])
+            self._after_string = True
+        return position
+
+    def _skipped(self, chunk: bytes, position: int) -> int:
+        if self._escaped or (self._text is not None and self._text.pending):
+            self._escaped = False
+            consumed = self._text.escape(chunk[position:]) \
+                if self._text is not None else 1
+            self.skipped_bytes += consumed
+            return position + consumed
+
+        match = _re_string_special.search(chunk, position)
+        end = len(chunk) if match is None else match.start()
+        if self._text is not None:
+            self._text.write(chunk[position:end])
+        self.skipped_bytes += end - position
+        if match is None:
+            return end
+        if match.group() == b'\\':
+            self._escaped = True
+            self.skipped_bytes += 1
+            return end + 1
+
+        if self._text is not None:
+            self._text.close()
+            self._text = None
+        self._state = _OUTSIDE
+        self._last_string = None
+        return end + 1
@@ -0,0 +1,107 @@
+import asyncio
+import subprocess
+import sys
+import time
+import unittest
+from whoisapi import AsyncClient
+from whoisapi import ApiAuthError
+from whoisapi import CredentialPool
+from whoisapi import ResponseError
+from whoisapi import RequestParameters
+from stub_server import StubWhoisServer, API_KEY, ERROR_MESSAGE
+
+
+class TestAsyncClient(unittest.TestCase):
+    """
+    Offline tests against a local stub server.
+    """
+    def setUp(self):
+        self.server = StubWhoisServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def run_async(self, coroutine):
+        return asyncio.run(coroutine)
+
+    def test_data(self):
+        async def lookup():
+            async with AsyncClient(api_key=API_KEY,
+                                   url=self.server.url) as client:
+                return await client.data('whoisxmlapi.com')
+
+        whois = self.run_async(lookup())
+        assert whois.domain_name == 'whoisxmlapi.com'
+        assert whois.registrant.country_code == 'US'
+
+    def test_xml(self):
+        async def lookup():
+            async with AsyncClient(api_key=API_KEY,
+                                   url=self.server.url) as client:
+                return await client.data(
+                    'whoisxmlapi.com', RequestParameters(output_format='xml'))
+
+        whois = self.run_async(lookup())
+        assert whois.registrant.country_code == 'US'
+        assert whois.raw_text == 'Domain Name: whoisxmlapi.com'
+        assert self.server.queries[0]['outputFormat'] == 'xml'
+
+    def test_raw_data_and_errors(self):
+        self.server.respond('not-a-domain', body=ERROR_MESSAGE)
+        self.server.respond('denied.com', status=401, body='denied')
+
+        async def lookup():
+            async with AsyncClient(api_key=API_KEY,
+                                   url=self.server.url) as client:
+                raw = await client.raw_data('whoisxmlapi.com')
+                with self.assertRaises(ResponseError):
+                    await client.data('not-a-domain')
+                with self.assertRaises(ApiAuthError):
+                    await client.data('denied.com')
+                return raw
+
+        assert 'WhoisRecord' in self.run_async(lookup())
+
+    def test_concurrency_cap(self):
+        for i in range(4):
+            self.server.respond('slow{}.com'.format(i), delay=0.2,
+                                body={'WhoisRecord': {}})
+
+        async def lookup():
+            async with AsyncClient(api_key=API_KEY, url=self.server.url,
+                                   max_concurrency=2) as client:
+                return await asyncio.gather(*[
+                    client.data('slow{}.com'.format(i)) for i in range(4)])
+
+        started = time.monotonic()
+        records = self.run_async(lookup())
+        elapsed = time.monotonic() - started
+        assert len(records) == 4
+        assert elapsed >= 0.4
+
+    def test_credentials(self):
+        keys = ['at_' + c * 29 for c in 'ab']
+        self.server.respond('example.com', body=lambda query: (
+            401, 'denied', {}) if query['apiKey'] == keys[0] else (
+            200, '{"WhoisRecord": {"domainName": "example.com"}}', {}))
+        pool = CredentialPool(keys)
+
+        async def lookup():
+            async with AsyncClient(credentials=pool,
+                                   url=self.server.url) as client:
+                return await client.data('example.com')
+
+        assert self.run_async(lookup()).domain_name == 'example.com'
+        assert [q['apiKey'] for q in self.server.queries] == keys
+        assert [c.failures for c in pool] == [1, 0]
+
+    def test_lazy_import(self):
+        loaded = subprocess.check_output([
+            sys.executable, '-c',
+            'import sys, whoisapi, whoisapi.net; '
+            'print("aiohttp" in sys.modules)'])
+        assert loaded.strip() == b'False'
+
+
+if __name__ == '__main__':
+    unittest.main()
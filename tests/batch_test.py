@@ -0,0 +1,120 @@
+import datetime
+import json
+import subprocess
+import sys
+import unittest
+from whoisapi import WhoisRecord
+from whoisapi import WhoisRecordBatch
+from whoisapi import ResponseError
+from whoisapi import UnparsableApiResponseError
+from whoisapi.models.batch import NULL
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+try:
+    import pandas
+except ImportError:  # pragma: no cover
+    pandas = None
+from whoisapi.export import resolve_field
+from stub_server import whois_record, ERROR_MESSAGE
+
+FIELDS = ['domain_name', 'expires_date', 'estimated_domain_age',
+          'registrar_name', 'registrant.country_code',
+          'registry_data.status', 'domain_availability', 'audit.created_date']
+
+
+def responses():
+    available = whois_record('b.com')
+    available['WhoisRecord']['domainAvailability'] = 'AVAILABLE'
+    del available['WhoisRecord']['registrant']
+    del available['WhoisRecord']['expiresDate']
+    return [json.dumps(whois_record('a.com')).encode(),
+            json.dumps(available),
+            json.dumps(ERROR_MESSAGE).encode(),
+            json.dumps({'WhoisRecord': {'domainName': 'c.com'}})]
+
+
+class TestWhoisRecordBatch(unittest.TestCase):
+    def setUp(self):
+        self.batch = WhoisRecordBatch.from_responses(
+            responses(), FIELDS, skip_errors=True)
+
+    def test_columns(self):
+        batch = self.batch
+        assert (len(batch), batch.skipped) == (3, 1)
+        assert list(batch.column('expires_date')) == [1900187237, NULL, NULL]
+        assert list(batch.column('estimated_domain_age')) == [4600, 4600, 0]
+        assert list(batch.column('domain_availability')) == [0, 1, -1]
+        assert list(batch.column('registrar_name')) == [0, 0, 1]
+        assert batch.categories('registrar_name') == ['GoDaddy.com, LLC', '']
+        assert list(batch.column('registrant.country_code')) == [0, -1, -1]
+        assert batch.column('domain_name') == ['a.com', 'b.com', 'c.com']
+        assert batch.nbytes > 0
+        self.assertRaises(ValueError, batch.categories, 'domain_name')
+        self.assertRaises(KeyError, batch.column, 'registrant')
+
+    def test_rows_match_records(self):
+        records = [WhoisRecord(json.loads(r)['WhoisRecord'])
+                   for i, r in enumerate(responses()) if i != 2]
+        for record, row in zip(records, self.batch):
+            for field in FIELDS:
+                expected = resolve_field(record, field)
+                if isinstance(expected, datetime.datetime):
+                    expected = expected.replace(tzinfo=datetime.timezone.utc)
+                assert row[field] == expected, field
+
+    def test_fields(self):
+        for fields in ([], ['registrant'], ['name_servers.host_names'],
+                       ['registrant.unknown'], ['domain_name.x'],
+                       ['domain_name', 'domain_name']):
+            self.assertRaises(ValueError, WhoisRecordBatch, fields)
+        batch = WhoisRecordBatch(['registrar_name', 'whois_server'],
+                                 dictionary=['whois_server'])
+        batch.extend([{'registrarName': 'A', 'whoisServer': 'w'}, None])
+        assert batch.column('registrar_name') == ['A', '']
+        assert batch.categories('whois_server') == ['w', '']
+
+    def test_errors(self):
+        self.assertRaises(ResponseError, WhoisRecordBatch.from_responses,
+                          responses())
+        self.assertRaises(UnparsableApiResponseError,
+                          WhoisRecordBatch.from_responses, ['{'])
+        self.assertRaises(UnparsableApiResponseError,
+                          WhoisRecordBatch.from_responses, ['[]'])
+
+    @unittest.skipIf(numpy is None, 'numpy missing')
+    def test_numpy(self):
+        columns = self.batch.to_numpy()
+        assert str(columns['expires_date'][0]) == '2030-03-19T21:47:17'
+        assert numpy.isnat(columns['expires_date'][1])
+        assert list(columns['registrant.country_code']) == ['US', None, None]
+        assert columns['domain_availability'].dtype == numpy.int8
+        self.batch.append(None)
+        assert len(self.batch.column('expires_date')) == 4
+
+    @unittest.skipIf(pandas is None, 'pandas missing')
+    def test_pandas(self):
+        frame = self.batch.to_pandas()
+        assert list(frame.columns) == FIELDS
+        assert frame['expires_date'][0] == pandas.Timestamp(
+            '2030-03-19T21:47:17Z')
+        assert frame['registrant.country_code'].cat.categories.tolist() \
+            == ['US']
+        assert frame['domain_availability'].isna().tolist() == \
+            [False, False, True]
+        assert frame['domain_availability'][1]
+        assert frame['estimated_domain_age'].dtype == 'Int64'
+
+    def test_lazy_imports(self):
+        loaded = subprocess.check_output([
+            sys.executable, '-c',
+            'import sys, whoisapi; '
+            'print(sorted({"numpy", "pandas"} & set(sys.modules)))'])
+        assert loaded.strip() == b'[]'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from whoisapi import Client
+from whoisapi import WhoisRecord
+from whoisapi import ResponseError
+from whoisapi import HttpApiError
+from stub_server import StubWhoisServer, API_KEY, ERROR_MESSAGE
+
+
+class TestDataMany(unittest.TestCase):
+    """
+    Offline tests against a local stub server.
+    """
+    def setUp(self):
+        self.server = StubWhoisServer().start()
+        self.client = Client(api_key=API_KEY, url=self.server.url)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_ordered_results_with_errors(self):
+        self.server.respond('bad-domain', body=ERROR_MESSAGE)
+        self.server.respond('broken.com', status=500, body='oops')
+        domains = ['domain{}.com'.format(i) for i in range(20)]
+        domains[3] = 'bad-domain'
+        domains[7] = 'broken.com'
+        calls = []
+
+        results = list(self.client.data_many(
+            iter(domains), workers=4, ordered=True,
+            progress=lambda done, failed: calls.append((done, failed))))
+
+        assert [d for d, _ in results] == domains
+        assert isinstance(results[3][1], ResponseError)
+        assert isinstance(results[7][1], HttpApiError)
+        assert results[0][1].domain_name == 'domain0.com'
+        assert calls[-1] == (20, 2)
+
+    def test_unordered_results(self):
+        self.server.respond('slow.com', delay=0.3,
+                            body={'WhoisRecord': {'domainName': 'slow.com'}})
+        domains = ['slow.com', 'fast1.com', 'fast2.com']
+
+        results = list(self.client.data_many(domains, workers=3))
+
+        assert results[-1][0] == 'slow.com'
+        assert sorted(d for d, _ in results) == sorted(domains)
+        assert all(isinstance(r, WhoisRecord) for _, r in results)
+
+    def test_projection(self):
+        whois = self.client.data('whoisxmlapi.com',
+                                 fields=['registrant.country_code'])
+        assert whois.registrant.country_code == 'US'
+        self.assertRaises(AttributeError, getattr, whois, 'domain_name')
+
+        results = list(self.client.data_many(
+            ['a.com', 'b.com'], ordered=True, fields=['domain_name']))
+        assert [r.domain_name for _, r in results] == ['a.com', 'b.com']
+
+    def test_invalid_workers(self):
+        self.assertRaises(ValueError, list,
+                          self.client.data_many(['a.com'], workers=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
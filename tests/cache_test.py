@@ -0,0 +1,93 @@
+import os
+import tempfile
+import time
+import unittest
+from whoisapi import Client
+from whoisapi import MemoryCache
+from whoisapi import SqliteCache
+from whoisapi import RequestParameters
+from whoisapi import ResponseError
+from stub_server import StubWhoisServer, API_KEY, ERROR_MESSAGE
+
+
+class TestCacheBackends(unittest.TestCase):
+    def test_memory_lru(self):
+        cache = MemoryCache(maxsize=2)
+        cache.set('a', '1')
+        cache.set('b', '2')
+        assert cache.get('a') == '1'
+        cache.set('c', '3')
+        assert cache.get('b') is None
+        assert cache.get('c') == '3'
+        assert cache.stats.evictions == 1
+        assert cache.stats.hits == 2
+        assert cache.stats.misses == 1
+
+    def test_memory_ttl(self):
+        cache = MemoryCache(ttl=0.05)
+        cache.set('a', '1')
+        time.sleep(0.1)
+        assert cache.get('a') is None
+        assert len(cache) == 0
+
+    def test_sqlite(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.db')
+            cache = SqliteCache(path, maxsize=2)
+            cache.set('a', '1')
+            cache.set('b', '2')
+            cache.set('c', '3')
+            assert len(cache) == 2
+            assert cache.get('a') is None
+            cache.close()
+
+            cache = SqliteCache(path, ttl=0.05)
+            assert cache.get('c') == '3'
+            cache.set('d', '4')
+            time.sleep(0.1)
+            assert cache.get('d') is None
+            assert cache.stats.hits == 1
+            cache.close()
+
+
+class TestClientCache(unittest.TestCase):
+    """
+    Offline tests against a local stub server.
+    """
+    def setUp(self):
+        self.server = StubWhoisServer().start()
+        self.cache = MemoryCache()
+        self.client = Client(api_key=API_KEY, url=self.server.url,
+                             cache=self.cache)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_hit(self):
+        first = self.client.data('whoisxmlapi.com')
+        second = self.client.data('WhoisXmlApi.com')
+        assert len(self.server.queries) == 1
+        assert first.domain_name == second.domain_name
+        assert self.cache.stats.hits == 1
+
+    def test_parameters_in_key(self):
+        self.client.data('whoisxmlapi.com')
+        self.client.data('whoisxmlapi.com', RequestParameters(da=2))
+        assert len(self.server.queries) == 2
+
+    def test_prefer_fresh_bypass(self):
+        self.client.data('whoisxmlapi.com')
+        self.client.data('whoisxmlapi.com', RequestParameters(prefer_fresh=1))
+        assert len(self.server.queries) == 2
+        assert self.cache.stats.bypasses == 1
+
+    def test_errors_not_cached(self):
+        self.server.respond('bad-domain', body=ERROR_MESSAGE)
+        self.assertRaises(ResponseError, self.client.data, 'bad-domain')
+        self.assertRaises(ResponseError, self.client.data, 'bad-domain')
+        assert len(self.server.queries) == 2
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from whoisapi.cli import main
+from stub_server import StubWhoisServer, API_KEY, ERROR_MESSAGE
+
+
+class TestCli(unittest.TestCase):
+    """
+    Offline tests against a local stub server.
+    """
+    def setUp(self):
+        self.server = StubWhoisServer().start()
+        self.directory = tempfile.mkdtemp()
+        self.input = os.path.join(self.directory, 'domains.txt')
+        self.output = os.path.join(self.directory, 'results.ndjson')
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.directory)
+
+    def run_cli(self, *args):
+        return main([self.input, '-o', self.output, '-k', API_KEY,
+                     '--url', self.server.url, '-q'] + list(args))
+
+    def write_input(self, domains):
+        with open(self.input, 'w') as file:
+            file.write('\n'.join(domains) + '\n')
+
+    def read_output(self):
+        with open(self.output) as file:
+            return [json.loads(line) for line in file]
+
+    def test_resumed_run_skips_completed_domains(self):
+        self.write_input(['a.com', 'B.com', '', '# comment', 'b.com',
+                          'bad-domain', 'broken.com'])
+        self.server.respond('bad-domain', body=ERROR_MESSAGE)
+        self.server.respond('broken.com', status=500, body='oops')
+
+        status = self.run_cli('-w', '2', '-f', 'domain_name,expires_date',
+                              '--max-attempts', '1', '--flush-every', '1')
+        assert status == 1
+        assert len(self.server.queries) == 4
+        with open(self.output + '.checkpoint') as file:
+            assert sorted(file.read().split()) == \
+                ['a.com', 'b.com', 'bad-domain']
+        rows = {row['domain_name']: row for row in self.read_output()}
+        assert rows['a.com']['expires_date'] == '2030-03-19T21:47:17'
+        assert rows['broken.com']['error'] == 'oops'
+
+        self.server.respond('broken.com',
+                            body={'WhoisRecord': {'domainName': 'broken.com'}})
+        self.write_input(['a.com', 'b.com', 'bad-domain', 'broken.com',
+                          'c.com'])
+        assert self.run_cli('-f', 'domain_name') == 0
+        assert [q['domainName'] for q in self.server.queries[4:]] in \
+            (['broken.com', 'c.com'], ['c.com', 'broken.com'])
+        assert len(self.read_output()) == 6
+
+    def test_api_key_is_required(self):
+        self.write_input(['a.com'])
+        environ = os.environ.pop('WHOISAPI_KEY', None)
+        try:
+            self.assertRaises(SystemExit, main, [self.input])
+        finally:
+            if environ is not None:
+                os.environ['WHOISAPI_KEY'] = environ
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import json
+import time
+import unittest
+from collections import Counter
+from whoisapi import ApiAuthError
+from whoisapi import Client
+from whoisapi import Credential
+from whoisapi import CredentialPool
+from whoisapi import HttpApiError
+from whoisapi import ParameterError
+from whoisapi import RateLimitError
+from whoisapi import RequestParameters
+from stub_server import StubWhoisServer, API_KEY, whois_record
+
+KEYS = ['at_' + c * 29 for c in 'abcd']
+
+
+def by_key(statuses: dict):
+    """Answer with the status set for the API key, a record otherwise"""
+    def respond(query):
+        status = statuses.get(query['apiKey'], 200)
+        if status == 200:
+            return 200, json.dumps(whois_record(query['domainName'])), {}
+        headers = {'Retry-After': '0.2'} if status == 429 else {}
+        return status, 'rejected', headers
+
+    return respond
+
+
+class TestCredentialPool(unittest.TestCase):
+    """
+    Offline tests against a local stub server.
+    """
+    def setUp(self):
+        self.server = StubWhoisServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def client(self, pool: CredentialPool, **kwargs) -> Client:
+        return Client(credentials=pool, url=self.server.url, **kwargs)
+
+    def keys(self) -> list:
+        return [query['apiKey'] for query in self.server.queries]
+
+    def test_weights(self):
+        client = self.client(CredentialPool({KEYS[0]: 3, KEYS[1]: 1}))
+        for i in range(8):
+            client.data('domain{}.com'.format(i))
+        assert self.keys()[:4] == [KEYS[0], KEYS[0], KEYS[1], KEYS[0]]
+        assert Counter(self.keys()) == {KEYS[0]: 6, KEYS[1]: 2}
+
+    def test_quotas(self):
+        pool = CredentialPool([Credential(KEYS[0], quota=3),
+                               Credential(KEYS[1], quota=1)])
+        client = self.client(pool)
+        for i in range(4):
+            client.data('domain{}.com'.format(i))
+        assert Counter(self.keys()) == {KEYS[0]: 3, KEYS[1]: 1}
+        assert [c.quota for c in pool] == [0, 0]
+        with self.assertRaises(RateLimitError) as error:
+            client.data('example.com')
+        assert error.exception.retry_after is None
+
+        pool.credentials[1].quota = 10
+        assert client.data('example.com').domain_name == 'example.com'
+
+    def test_failover(self):
+        self.server.respond('example.com', body=by_key(
+            {KEYS[0]: 401, KEYS[1]: 403}))
+        pool = CredentialPool(KEYS[:3])
+        client = self.client(pool)
+
+        assert client.data('example.com').domain_name == 'example.com'
+        assert self.keys() == KEYS[:3]
+        assert [c.failures for c in pool] == [1, 1, 0]
+        assert [c.api_key for c in pool.available()] == [KEYS[2]]
+        client.data('example.com')
+        assert self.keys()[3:] == [KEYS[2]]
+
+        # the last rejection is raised once every key is out
+        client = self.client(CredentialPool(KEYS[:2]))
+        with self.assertRaises(HttpApiError) as error:
+            client.data('example.com')
+        assert error.exception.status_code == 403
+        self.assertRaises(RateLimitError, client.data, 'example.com')
+
+        client = self.client(CredentialPool(KEYS[:1]))
+        self.assertRaises(ApiAuthError, client.data, 'example.com')
+
+    def test_throttled_key(self):
+        self.server.respond('example.com', body=by_key({KEYS[0]: 429}))
+        pool = CredentialPool(KEYS[:2])
+        client = self.client(pool)
+        client.data('example.com')
+        assert self.keys() == KEYS[:2]
+        assert 0 < pool.credentials[0].cooldown() <= 0.2
+        time.sleep(0.25)
+        assert len(pool.available()) == 2
+
+    def test_rate_limits_per_key(self):
+        pool = CredentialPool([Credential(key, rate_limit=10)
+                               for key in KEYS[:2]])
+        client = self.client(pool)
+        started = time.monotonic()
+        for i in range(10):
+            client.data('domain{}.com'.format(i))
+        # five requests per key, 100 ms apart; one key would take 900 ms
+        assert 0.35 <= time.monotonic() - started < 0.8
+        assert [c.requests for c in pool] == [5, 5]
+
+    def test_shared_rate_limit(self):
+        clients = [self.client(CredentialPool(keys), rate_limit=5)
+                   for keys in (KEYS[:2], KEYS[2:], KEYS[1::-1])]
+        limiters = [c.api_requester.rate_limiter for c in clients]
+        assert limiters[0] is limiters[2]
+        assert limiters[0] is not limiters[1]
+
+    def test_invalid(self):
+        self.assertRaises(ParameterError, CredentialPool, [])
+        self.assertRaises(ParameterError, CredentialPool, [KEYS[0]] * 2)
+        self.assertRaises(ParameterError, Credential, 'not-a-key')
+        self.assertRaises(ValueError, Credential, KEYS[0], weight=0)
+        self.assertRaises(ParameterError, Client, api_key=API_KEY,
+                          credentials=CredentialPool(KEYS[:1]))
+        self.assertRaises(TypeError, Client, credentials=KEYS)
+        client = self.client(CredentialPool(KEYS[:1]))
+        self.assertRaises(ParameterError, client.data, 'example.com',
+                          RequestParameters(api_key=KEYS[1]))
+        assert self.server.queries == []
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+import unittest
+from whoisapi import Client
+from whoisapi import AsyncClient
+from whoisapi import Deadline
+from whoisapi import RetryPolicy
+from whoisapi import TokenBucket
+from whoisapi import DeadlineExceededError
+from whoisapi.net.deadline import Watchdog
+from retry_test import flaky
+from stub_server import StubWhoisServer, API_KEY, whois_record
+
+
+class TestDeadline(unittest.TestCase):
+    """
+    Offline tests against a local stub server.
+    """
+    def setUp(self):
+        self.server = StubWhoisServer().start()
+        self.server.respond('slow.com', delay=2)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_deadline_of(self):
+        self.assertRaises(ValueError, Deadline.after, 0)
+        assert Deadline.of() is None
+        later = Deadline(time.monotonic() + 60)
+        assert Deadline.of(1, later).remaining() <= 1
+        assert Deadline.of(120, later) is later
+        assert isinstance(Deadline.of(deadline=later.expires), Deadline)
+        self.assertRaises(DeadlineExceededError,
+                          Deadline(time.monotonic() - 1).check, 'test')
+
+    def test_watchdog(self):
+        watchdog = Watchdog()
+        fired = []
+        done = threading.Event()
+        started = threading.active_count()
+        watches = [watchdog.watch(Deadline.after(0.1 + i / 100),
+                                  lambda i=i: fired.append(i))
+                   for i in range(100)]
+        watchdog.watch(Deadline.after(0.2), done.set)
+        for watch in watches[1:]:
+            watchdog.cancel(watch)
+        assert threading.active_count() == started + 1
+        assert len(watchdog._queue) < 50
+
+        assert done.wait(5)
+        watchdog.cancel(watches[0])
+        assert fired == [0]
+
+    def test_slow_response(self):
+        with Client(api_key=API_KEY, url=self.server.url) as client:
+            start = time.monotonic()
+            self.assertRaises(DeadlineExceededError,
+                              client.data, 'slow.com', budget=0.3)
+            assert time.monotonic() - start < 1.5
+            whois = client.data('whoisxmlapi.com', budget=5)
+
+        assert whois.domain_name == 'whoisxmlapi.com'
+
+    def test_slow_body(self):
+        self.server.respond('drip.com', body=whois_record('drip.com'),
+                            drip=0.5)
+        for streaming in (False, True):
+            with Client(api_key=API_KEY, url=self.server.url,
+                        streaming=streaming) as client:
+                start = time.monotonic()
+                self.assertRaises(DeadlineExceededError,
+                                  client.data, 'drip.com', budget=1)
+                assert time.monotonic() - start < 1.3
+
+    def test_streaming(self):
+        with Client(api_key=API_KEY, url=self.server.url,
+                    streaming=True) as client:
+            self.assertRaises(DeadlineExceededError, client.data,
+                              'slow.com', deadline=time.monotonic() + 0.3)
+            whois = client.data('whoisxmlapi.com', budget=5)
+
+        assert whois.domain_name == 'whoisxmlapi.com'
+
+    def test_retry_backoff(self):
+        respond, calls = flaky(5)
+        self.server.respond('flaky.com', body=respond)
+        policy = RetryPolicy(max_attempts=5, backoff_factor=1, jitter=False)
+        with Client(api_key=API_KEY, url=self.server.url,
+                    retry=policy) as client:
+            self.assertRaises(DeadlineExceededError,
+                              client.data, 'flaky.com', budget=0.5)
+
+        assert len(calls) == 1
+        assert policy.stats.backoff_time == 0
+
+    def test_rate_limiter(self):
+        bucket = TokenBucket(rate=1)
+        with Client(api_key=API_KEY, url=self.server.url,
+                    rate_limit=bucket) as client:
+            client.data('whoisxmlapi.com', budget=1)
+            self.assertRaises(DeadlineExceededError,
+                              client.data, 'whoisxmlapi.com', budget=0.5)
+
+        assert len(self.server.queries) == 1
+        assert bucket.reserve() < 1
+
+    def test_data_many(self):
+        with Client(api_key=API_KEY, url=self.server.url) as client:
+            results = dict(client.data_many(
+                ['slow.com', 'whoisxmlapi.com'], budget=0.5))
+
+        assert isinstance(results['slow.com'], DeadlineExceededError)
+        assert results['whoisxmlapi.com'].domain_name == 'whoisxmlapi.com'
+
+    def test_async_client(self):
+        async def lookup():
+            async with AsyncClient(api_key=API_KEY,
+                                   url=self.server.url) as client:
+                start = time.monotonic()
+                with self.assertRaises(DeadlineExceededError):
+                    await client.data('slow.com', budget=0.3)
+                assert time.monotonic() - start < 1.5
+                return await client.data('whoisxmlapi.com', budget=5)
+
+        whois = asyncio.run(lookup())
+        assert whois.domain_name == 'whoisxmlapi.com'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+import unittest
+from whoisapi import WhoisRecord
+from whoisapi import LazyWhoisRecord
+from whoisapi import NdjsonExporter
+from whoisapi import Projection
+from whoisapi import CsvExporter
+from whoisapi import ErrorMessage
+from whoisapi import HttpApiError
+from whoisapi import ResponseError
+from whoisapi.export import export
+from stub_server import whois_record
+
+
+class FlushCountingIO(io.StringIO):
+    flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+def results():
+    yield 'a.com', WhoisRecord(whois_record('a.com')['WhoisRecord'])
+    yield 'bad', ResponseError('', ErrorMessage({'msg': 'Invalid domain'}))
+    yield 'c.com', HttpApiError('oops', 500)
+    yield 'd.com', LazyWhoisRecord(whois_record('d.com')['WhoisRecord'])
+
+
+class TestExport(unittest.TestCase):
+    def test_ndjson_projection(self):
+        output = FlushCountingIO()
+        fields = ['domain_name', 'expires_date', 'registrant.country_code',
+                  'billing_contact.email']
+        rows = export(results(), output, fields=fields, chunk_size=2)
+
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert rows == 4
+        assert output.flushes >= 2
+        assert lines[0] == {
+            'domain_name': 'a.com',
+            'expires_date': '2030-03-19T21:47:17',
+            'registrant.country_code': 'US',
+            'billing_contact.email': None
+        }
+        assert lines[1] == {'domain_name': 'bad', 'error': 'Invalid domain'}
+        assert lines[2] == {'domain_name': 'c.com', 'error': 'oops'}
+        assert lines[3]['domain_name'] == 'd.com'
+
+    def test_ndjson_full_record(self):
+        output = io.StringIO()
+        with NdjsonExporter(output, include_errors=False) as exporter:
+            exporter.write_all(results())
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert len(lines) == 2
+        assert lines[0]['registrant']['organization'] == 'Whois API, Inc'
+        assert lines[0]['registry_data']['status'] == \
+            'clientTransferProhibited'
+        assert lines[1]['domain_name'] == 'd.com'
+        assert lines[1]['expires_date'] == lines[0]['expires_date']
+
+    def test_ndjson_projected_record(self):
+        projection = Projection(['domain_name', 'registrant.country_code'])
+        record = projection.build(whois_record('a.com')['WhoisRecord'])
+        output = io.StringIO()
+        export([record], output)
+        assert json.loads(output.getvalue()) == {
+            'domain_name': 'a.com',
+            'registrant': {'country_code': 'US'}
+        }
+
+    def test_csv(self):
+        output = io.StringIO(newline='')
+        exporter = CsvExporter(output)
+        exporter.write_all(results())
+
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        assert rows[0] == ['domain_name', 'created_date', 'updated_date',
+                           'expires_date', 'registrar_name',
+                           'registrant.country_code', 'domain_availability',
+                           'error']
+        assert rows[1] == ['a.com', '2009-03-19T21:47:17',
+                           '2021-02-16T19:04:22', '2030-03-19T21:47:17',
+                           'GoDaddy.com, LLC', 'US', 'false', '']
+        assert rows[2] == ['bad', '', '', '', '', '', '', 'Invalid domain']
+        assert len(rows) == 5
+        assert exporter.errors == 2
+
+
+if __name__ == '__main__':
+    unittest.main()
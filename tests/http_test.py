@@ -0,0 +1,111 @@
+import json
+import unittest
+from whoisapi import Client
+from whoisapi import WhoisRecord
+from whoisapi import ResponseError
+from whoisapi import ApiRequester
+from whoisapi import RequestParameters
+from whoisapi import UnparsableApiResponseError
+from whoisapi.decoders import orjson
+from stub_server import StubWhoisServer, API_KEY, whois_record
+
+
+class TestApiRequester(unittest.TestCase):
+    """
+    Offline tests against a local stub server.
+    """
+    def setUp(self):
+        self.server = StubWhoisServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_connection_is_reused(self):
+        with Client(api_key=API_KEY, url=self.server.url) as client:
+            for _ in range(5):
+                client.data('whoisxmlapi.com')
+        assert len(self.server.queries) == 5
+        assert self.server.connections == 1
+
+    def test_keep_alive_disabled(self):
+        client = Client(api_key=API_KEY, url=self.server.url,
+                        keep_alive=False)
+        for _ in range(3):
+            client.raw_data('whoisxmlapi.com')
+        client.close()
+        assert self.server.connections == 3
+
+    def test_closed_requester(self):
+        requester = ApiRequester(api_key=API_KEY, url=self.server.url)
+        requester.close()
+        assert requester.session is None
+        self.assertRaises(RuntimeError, requester.get_data, 'whoisxmlapi.com')
+
+    def test_bytes_body(self):
+        with ApiRequester(api_key=API_KEY, url=self.server.url) as requester:
+            body = requester.get_data('whoisxmlapi.com', as_bytes=True)
+        assert isinstance(body, bytes)
+        assert body.startswith(b'{"WhoisRecord"')
+
+    def test_decoders(self):
+        self.server.respond('broken.com', body='{"WhoisRecord": ')
+        decoders = ['json', 'auto'] + (['orjson'] if orjson else [])
+        records = []
+        for decoder in decoders:
+            with Client(api_key=API_KEY, url=self.server.url,
+                        decoder=decoder) as client:
+                records.append(client.data('whoisxmlapi.com'))
+                self.assertRaises(UnparsableApiResponseError,
+                                  client.data, 'broken.com')
+        assert all(record == records[0] for record in records)
+        self.assertRaises(ValueError, Client, api_key=API_KEY,
+                          decoder='yaml')
+
+    def test_parameters_are_not_modified(self):
+        params = RequestParameters(output_format='xml', da=2)
+        with Client(api_key=API_KEY, url=self.server.url) as client:
+            defaults = client.parameters.get_request_parameters()
+            results = list(client.data_many(
+                ['domain{}.com'.format(i) for i in range(20)],
+                params=params, workers=4))
+            assert client.parameters.get_request_parameters() == defaults
+        assert all(r.domain_name == d for d, r in results)
+        assert (params.output_format, params.api_key) == ('xml', '')
+        assert all(q['outputFormat'] == 'xml' and q['da'] == '2'
+                   and q['apiKey'] == API_KEY for q in self.server.queries)
+
+    def test_xml_responses(self):
+        error = '<ErrorMessage><errorCode>WHOIS_01</errorCode>' \
+                '<msg>Invalid domain name</msg></ErrorMessage>'
+        self.server.respond('bad-domain', body=lambda q: (200, error, {}))
+        self.server.respond('broken.com', body=lambda q: (200, '<a>', {}))
+        values = whois_record('whoisxmlapi.com')['WhoisRecord']
+        skipped = WhoisRecord(json.loads(
+            json.dumps(values).replace('"rawText"', '"skipped"')))
+        params = RequestParameters(output_format='XML')
+        for streaming in (False, True):
+            with Client(api_key=API_KEY, url=self.server.url,
+                        streaming=streaming) as client:
+                whois = client.data('whoisxmlapi.com', params)
+                assert whois == (skipped if streaming else
+                                 client.data('whoisxmlapi.com'))
+                assert whois.name_servers.host_names == \
+                    ['ns1.example.net', 'ns2.example.net']
+                with self.assertRaises(ResponseError) as context:
+                    client.data('bad-domain', params)
+                assert context.exception.parsed_message.msg == \
+                    'Invalid domain name'
+                self.assertRaises(UnparsableApiResponseError,
+                                  client.data, 'broken.com', params)
+        assert self.server.queries[0]['outputFormat'] == 'XML'
+        with Client(api_key=API_KEY, url=self.server.url,
+                    skip_fields=['rawText']) as client:
+            assert client.data('whoisxmlapi.com', params).raw_text == ''
+
+    def test_invalid_pool_size(self):
+        self.assertRaises(ValueError, ApiRequester, api_key=API_KEY,
+                          url=self.server.url, pool_maxsize=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
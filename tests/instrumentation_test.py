@@ -0,0 +1,115 @@
+import asyncio
+import subprocess
+import sys
+import unittest
+from whoisapi import Client
+from whoisapi import AsyncClient
+from whoisapi import MemoryCache
+from whoisapi import RetryPolicy
+from whoisapi import ResponseError
+from whoisapi import PrometheusListener
+from retry_test import flaky
+from stub_server import StubWhoisServer, API_KEY, ERROR_MESSAGE
+
+try:
+    import prometheus_client
+except ImportError:  # pragma: no cover
+    prometheus_client = None
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    Offline tests against a local stub server.
+    """
+    def setUp(self):
+        self.server = StubWhoisServer().start()
+        self.events = []
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_phases_and_retries(self):
+        respond, calls = flaky(1)
+        self.server.respond('flaky.com', body=respond)
+        with Client(api_key=API_KEY, url=self.server.url,
+                    retry=RetryPolicy(backoff_factor=0.01),
+                    listeners=[self.events.append]) as client:
+            client.data('flaky.com')
+
+        event, = self.events
+        assert (event.domain, event.status, event.attempts,
+                event.retries, event.cached, event.error) == \
+            ('flaky.com', 200, 2, 1, False, None)
+        assert len(calls) == 2 and event.size > 0
+        for phase in ('ttfb', 'transfer', 'decode', 'build'):
+            assert 0 <= getattr(event, phase) <= event.total
+
+    def test_cache_hits_and_errors(self):
+        self.server.respond('bad-domain', body=ERROR_MESSAGE)
+        with Client(api_key=API_KEY, url=self.server.url,
+                    cache=MemoryCache(),
+                    listeners=[self.events.append]) as client:
+            client.data('whoisxmlapi.com')
+            client.data('whoisxmlapi.com')
+            self.assertRaises(ResponseError, client.data, 'bad-domain')
+
+        miss, hit, failed = self.events
+        assert (miss.cached, miss.attempts) == (False, 1)
+        assert (hit.cached, hit.attempts, hit.ttfb) == (True, 0, None)
+        assert hit.size == miss.size and hit.build is not None
+        assert isinstance(failed.error, ResponseError)
+        assert failed.decode is not None and failed.build is None
+
+    def test_streaming_and_failing_listener(self):
+        def broken(event):
+            raise RuntimeError(event)
+
+        with Client(api_key=API_KEY, url=self.server.url, streaming=True,
+                    listeners=[broken, self.events.append]) as client:
+            with self.assertLogs('whois-api-instrumentation'):
+                whois = client.data('whoisxmlapi.com')
+
+        assert whois.domain_name == 'whoisxmlapi.com'
+        assert self.events[0].size > 0 and self.events[0].transfer >= 0
+
+    def test_async_client(self):
+        async def lookup():
+            async with AsyncClient(api_key=API_KEY, url=self.server.url,
+                                   listeners=[self.events.append]) as client:
+                return await client.data('whoisxmlapi.com')
+
+        asyncio.run(lookup())
+        event, = self.events
+        assert (event.status, event.attempts) == (200, 1)
+        assert event.size > 0 and event.build is not None
+
+    @unittest.skipIf(prometheus_client is None, 'prometheus_client missing')
+    def test_prometheus_listener(self):
+        registry = prometheus_client.CollectorRegistry()
+        listener = PrometheusListener(registry=registry)
+        self.server.respond('bad-domain', body=ERROR_MESSAGE)
+        with Client(api_key=API_KEY, url=self.server.url,
+                    listeners=[listener]) as client:
+            client.data('whoisxmlapi.com')
+            self.assertRaises(ResponseError, client.data, 'bad-domain')
+
+        def sample(name, **labels):
+            return registry.get_sample_value(name, labels)
+
+        assert sample('whoisapi_requests_total', outcome='ok') == 1
+        assert sample('whoisapi_requests_total',
+                      outcome='ResponseError') == 1
+        assert sample('whoisapi_phase_seconds_count', phase='build') == 1
+        assert sample('whoisapi_phase_seconds_count', phase='total') == 2
+        assert sample('whoisapi_response_bytes_count') == 2
+
+    def test_lazy_import(self):
+        loaded = subprocess.check_output([
+            sys.executable, '-c',
+            'import sys, whoisapi; '
+            'print("prometheus_client" in sys.modules)'])
+        assert loaded.strip() == b'False'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+import datetime
+import pickle
+import unittest
+from urllib.parse import parse_qsl
+from whoisapi import WhoisRecord
+from whoisapi import LazyWhoisRecord
+from whoisapi import RequestParameters
+from whoisapi import Projection
+from whoisapi import ParameterError, EmptyApiKeyError
+from whoisapi.models.lazy import LazyRegistryData
+from whoisapi.models.response import _datetime_value
+from stub_server import whois_record
+
+
+def is_built(model, name: str) -> bool:
+    try:
+        object.__getattribute__(model, name)
+        return True
+    except AttributeError:
+        return False
+
+
+class TestLazyWhoisRecord(unittest.TestCase):
+    def setUp(self):
+        self.values = whois_record('whoisxmlapi.com')['WhoisRecord']
+
+    def test_same_values(self):
+        eager = WhoisRecord(self.values)
+        lazy = LazyWhoisRecord(self.values)
+        assert str(lazy) == str(eager)
+        assert lazy.registrant.country_code == 'US'
+        assert lazy['domain_name'] == 'whoisxmlapi.com'
+        assert isinstance(lazy, WhoisRecord)
+
+    def test_equals_eager_record(self):
+        eager = WhoisRecord(self.values)
+        lazy = LazyWhoisRecord(self.values)
+        assert lazy == eager and eager == lazy
+        assert lazy.registry_data == eager.registry_data
+        other = WhoisRecord(dict(self.values, domainName='example.com'))
+        assert lazy != other and other != lazy
+
+    def test_fields_built_on_access(self):
+        lazy = LazyWhoisRecord(self.values)
+        assert lazy.expires_date.year == 2030
+        assert is_built(lazy, 'expires_date')
+        assert not is_built(lazy, 'registrant')
+        assert not is_built(lazy, 'created_date')
+        assert isinstance(lazy.registry_data, LazyRegistryData)
+        assert lazy.registry_data.status == 'clientTransferProhibited'
+        self.assertRaises(AttributeError, getattr, lazy, 'no_such_field')
+
+    def test_defaults(self):
+        lazy = LazyWhoisRecord(None)
+        assert lazy.domain_name == ''
+        assert lazy.registry_data is None
+        assert lazy.estimated_domain_age == 0
+
+    def test_pickle(self):
+        lazy = LazyWhoisRecord(self.values)
+        assert pickle.loads(pickle.dumps(lazy)) == lazy
+
+
+class TestCompactModels(unittest.TestCase):
+    def setUp(self):
+        self.values = whois_record('whoisxmlapi.com')['WhoisRecord']
+
+    def test_no_instance_dict(self):
+        whois = WhoisRecord(self.values)
+        for model in (whois, whois.registrant, whois.audit,
+                      whois.name_servers, whois.registry_data):
+            assert not hasattr(model, '__dict__')
+
+    def test_equality_and_items(self):
+        whois = WhoisRecord(self.values)
+        assert whois == WhoisRecord(self.values)
+        assert whois != WhoisRecord(dict(self.values, registrarName='x'))
+        assert whois['registrar_name'] == 'GoDaddy.com, LLC'
+        assert whois.registrant['country_code'] == 'US'
+        self.assertRaises(KeyError, whois.__getitem__, 'no_such_field')
+        assert "'registrar_name': 'GoDaddy.com, LLC'" in str(whois)
+
+    def test_request_parameters(self):
+        params = RequestParameters(da=2)
+        assert params['_da'] == 2
+        assert "'_da': '2'" in str(params)
+        assert params == RequestParameters(da=2)
+
+
+class TestRequestParameters(unittest.TestCase):
+    def test_payload_follows_setters(self):
+        params = RequestParameters(api_key='at_' + '0' * 29)
+        payload = params.get_request_parameters()
+        payload['da'] = 2
+        assert params.get_request_parameters()['da'] == 0
+        params.da = 1
+        assert params.get_request_parameters()['da'] == 1
+        assert params == RequestParameters(api_key='at_' + '0' * 29, da=1)
+
+    def test_query_string(self):
+        params = RequestParameters(prefer_fresh=1)
+        key = 'at_' + '1' * 29
+        query = params.get_query_string('münchen.de', key)
+        assert dict(parse_qsl(query)) == {
+            k: str(v) for k, v in dict(params.get_request_parameters(key),
+                                       domainName='münchen.de').items()}
+        params.da = 2
+        assert 'da=2' in params.get_query_string('a.com', key)
+
+    def test_copy(self):
+        params = RequestParameters(da=2)
+        copy = params.copy(output_format='xml', prefer_fresh=1)
+        assert (copy.da, copy.output_format, copy.prefer_fresh) == \
+            (2, 'xml', 1)
+        assert params.get_request_parameters('at_' + '1' * 29) == dict(
+            copy.get_request_parameters('at_' + '1' * 29),
+            outputFormat='JSON', preferFresh=0)
+        self.assertRaises(ParameterError, params.copy, da=5)
+        self.assertRaises(ParameterError, params.copy, no_such_field=1)
+        self.assertRaises(EmptyApiKeyError, params.get_request_parameters)
+
+
+class TestProjection(unittest.TestCase):
+    def setUp(self):
+        self.values = whois_record('whoisxmlapi.com')['WhoisRecord']
+
+    def test_requested_fields_only(self):
+        projection = Projection(['domain_name', 'expires_date',
+                                 'registrant.country_code',
+                                 'registry_data.expires_date',
+                                 'billing_contact.email'])
+        record = projection.build(self.values)
+        full = WhoisRecord(self.values)
+
+        assert isinstance(record, WhoisRecord)
+        assert record.domain_name == 'whoisxmlapi.com'
+        assert record.expires_date == full.expires_date
+        assert record.registrant.country_code == 'US'
+        assert record.registry_data.expires_date == \
+            full.registry_data.expires_date
+        assert record.billing_contact is None
+        assert not is_built(record, 'created_date')
+        assert not is_built(record.registrant, 'name')
+        assert str(record).startswith("{'expires_date'")
+
+    def test_whole_nested_model(self):
+        record = Projection(['registrant.state', 'registrant']).build(
+            self.values)
+        assert record.registrant == WhoisRecord(self.values).registrant
+
+    def test_invalid_fields(self):
+        self.assertRaises(ValueError, Projection, ['no_such_field'])
+        self.assertRaises(ValueError, Projection, ['domain_name.x'])
+        self.assertRaises(ValueError, Projection, ['registrant.x'])
+        self.assertRaises(ValueError, Projection, [])
+
+
+class TestDatetimeValue(unittest.TestCase):
+    def parse(self, value):
+        return _datetime_value({'date': value}, 'date')
+
+    def test_formats(self):
+        utc = datetime.timezone.utc
+        minus_7 = datetime.timezone(datetime.timedelta(hours=-7))
+        assert self.parse('2009-03-19T21:47:17Z') == \
+            datetime.datetime(2009, 3, 19, 21, 47, 17)
+        assert self.parse('2009-03-19T14:47:17-07:00') == \
+            datetime.datetime(2009, 3, 19, 14, 47, 17, tzinfo=minus_7)
+        assert self.parse('2009-03-19T14:47:17.000-0700').tzinfo == minus_7
+        assert self.parse('1997-09-15T04:00:00+0000') == \
+            datetime.datetime(1997, 9, 15, 4, tzinfo=utc)
+        assert self.parse('2021-02-17 15:26:53.000 UTC') == \
+            datetime.datetime(2021, 2, 17, 15, 26, 53)
+        assert self.parse('2021-02-17 15:26:53 utc').tzinfo is None
+
+    def test_fallback_and_invalid(self):
+        assert self.parse('2009-3-9 1:47:17 UTC') == \
+            datetime.datetime(2009, 3, 9, 1, 47, 17)
+        assert self.parse('2009-03-19T21:47:17.000Z') is None
+        assert self.parse('2009-02-30T21:47:17+00:00') is None
+        assert self.parse('2009-03-19T21:47:17Z\n') is None
+        assert self.parse('2021-02-17') is None
+        assert self.parse(None) is None
+        assert _datetime_value({}, 'date') is None
+
+
+if __name__ == '__main__':
+    unittest.main()
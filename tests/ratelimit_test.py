@@ -0,0 +1,79 @@
+import time
+import unittest
+from whoisapi import Client
+from whoisapi import RateLimitError
+from whoisapi import TokenBucket
+from whoisapi import AdaptiveRateLimiter
+from whoisapi.net.ratelimit import parse_retry_after
+from stub_server import StubWhoisServer
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_rate(self):
+        bucket = TokenBucket(rate=20, burst=2)
+        started = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        # two requests are free, the next four are spaced by 50 ms
+        assert time.monotonic() - started >= 0.19
+
+    def test_pause(self):
+        bucket = TokenBucket(rate=1000)
+        bucket.on_throttle(0.2)
+        assert bucket.reserve() > 0.15
+
+    def test_adaptive(self):
+        limiter = AdaptiveRateLimiter(rate=10, min_rate=1, cooldown=60)
+        limiter.on_throttle()
+        limiter.on_throttle()
+        assert limiter.rate == 5
+        for _ in range(100):
+            limiter.on_success()
+        assert limiter.rate == 10
+
+    def test_retry_after(self):
+        assert parse_retry_after('3') == 3
+        assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+        assert parse_retry_after('soon') is None
+        assert parse_retry_after(None) is None
+
+
+class TestClientRateLimit(unittest.TestCase):
+    """
+    Offline tests against a local stub server.
+    """
+    def setUp(self):
+        self.server = StubWhoisServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_shared_by_api_key(self):
+        key = 'at_' + '1' * 29
+        first = Client(api_key=key, url=self.server.url, rate_limit=5)
+        second = Client(api_key=key, url=self.server.url, rate_limit=50)
+        other = Client(api_key='at_' + '2' * 29, url=self.server.url,
+                       rate_limit=5)
+        assert first.api_requester.rate_limiter \
+            is second.api_requester.rate_limiter
+        assert first.api_requester.rate_limiter \
+            is not other.api_requester.rate_limiter
+
+    def test_throttled(self):
+        self.server.respond('busy.com', status=429, body='slow down',
+                            headers={'Retry-After': '0.2'})
+        limiter = AdaptiveRateLimiter(rate=100, min_rate=1)
+        client = Client(api_key='at_' + '3' * 29, url=self.server.url,
+                        rate_limit=limiter)
+        with self.assertRaises(RateLimitError) as context:
+            client.data('busy.com')
+        assert context.exception.retry_after == 0.2
+        assert limiter.rate == 50
+
+        started = time.monotonic()
+        client.data('whoisxmlapi.com')
+        assert time.monotonic() - started >= 0.15
+
+
+if __name__ == '__main__':
+    unittest.main()
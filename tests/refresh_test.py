@@ -0,0 +1,181 @@
+import datetime
+import threading
+import time
+import unittest
+from whoisapi import Client
+from whoisapi import RecordStore
+from whoisapi import RefreshScheduler
+from whoisapi import ResponseError
+from whoisapi import TokenBucket
+from whoisapi import WhoisRecord
+from stub_server import StubWhoisServer, API_KEY, ERROR_MESSAGE, \
+    whois_record
+
+DAY = 86400
+NOW = datetime.datetime(2030, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def record(expires: str or None, updated: str or None,
+           audit_updated: str or None = None) -> WhoisRecord:
+    values = {'domainName': 'example.com', 'expiresDate': expires,
+              'updatedDate': updated}
+    if audit_updated is not None:
+        values['audit'] = {'updatedDate': audit_updated}
+    return WhoisRecord(values)
+
+
+class TestRefreshScheduler(unittest.TestCase):
+    """
+    Offline tests against a local stub server.
+    """
+    def setUp(self):
+        self.server = StubWhoisServer().start()
+        self.server.respond('bad-domain', body=ERROR_MESSAGE)
+        self.client = Client(api_key=API_KEY, url=self.server.url)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def lookups(self, domain: str) -> int:
+        return sum(1 for query in self.server.queries
+                   if query.get('domainName') == domain)
+
+    def test_next_due(self):
+        scheduler = RefreshScheduler(self.client)
+        now = NOW.timestamp()
+        # changed 100 days ago: every 10 days
+        assert scheduler.next_due(record(
+            '2031-01-01T00:00:00Z', '2029-09-23T00:00:00Z'), now) == \
+            now + 10 * DAY
+        # the audit date is more recent: at least every day
+        assert scheduler.next_due(record(
+            '2031-01-01T00:00:00Z', '2029-09-23T00:00:00Z',
+            '2029-12-31 00:00:00.000 UTC'), now) == now + DAY
+        # unchanged for years or never: every 30 days
+        assert scheduler.next_due(record(
+            '2031-01-01T00:00:00Z', '2020-01-01T00:00:00Z'), now) == \
+            now + 30 * DAY
+        assert scheduler.next_due(record(None, None), now) == now + 30 * DAY
+        # entering the renewal window in 5 days
+        assert scheduler.next_due(record(
+            '2030-02-05T00:00:00Z', '2020-01-01T00:00:00Z'), now) == \
+            now + 5 * DAY
+        # within the renewal window or the grace period: daily
+        for expires in ('2030-01-20T00:00:00Z', '2029-12-01 00:00:00 UTC'):
+            assert scheduler.next_due(record(expires, None), now) == \
+                now + DAY
+        # long expired
+        assert scheduler.next_due(record(
+            '2029-01-01T00:00:00Z', '2028-01-01T00:00:00Z'), now) == \
+            now + 30 * DAY
+
+    def test_stale_while_revalidate(self):
+        scheduler = RefreshScheduler(self.client)
+        first = scheduler.get('example.com')
+        assert first.domain_name == 'example.com'
+        assert scheduler.stats.misses == 1 and 'EXAMPLE.COM' in scheduler
+
+        # a due record is served as is until it's refreshed
+        with scheduler._condition:
+            scheduler._schedule('example.com', time.time() - 1)
+        self.server.respond('example.com', body=dict(
+            whois_record('example.com'), marker=1))
+        assert scheduler.get('example.com') is first
+        assert scheduler.stats.stale_hits == 1
+        assert self.lookups('example.com') == 1
+
+        assert scheduler.refresh_due() == 1
+        assert self.lookups('example.com') == 2
+        assert self.server.queries[-1]['preferFresh'] == '1'
+        assert scheduler.get('example.com') is not first
+        assert scheduler.stats.fresh_hits == 1
+        assert scheduler.due('example.com') > time.time()
+        assert scheduler.refresh_due() == 0
+
+    def test_budget(self):
+        refreshed = []
+        event = threading.Event()
+
+        def on_refresh(domain, result):
+            refreshed.append(domain)
+            event.set()
+
+        # two lookups at once, then one per second
+        scheduler = RefreshScheduler(
+            self.client, TokenBucket(rate=1, burst=2), on_refresh=on_refresh)
+        domains = ['domain{}.com'.format(i) for i in range(5)]
+        scheduler.track_all(domains)
+        assert len(scheduler) == 5
+        with scheduler:
+            event.wait(5)
+            time.sleep(0.3)
+        assert refreshed == domains[:2]
+        assert scheduler.stats.refreshes == 2
+        assert [scheduler.due(d) <= time.time() for d in domains] == \
+            [False, False, True, True, True]
+
+    def test_failures(self):
+        errors = []
+        scheduler = RefreshScheduler(
+            self.client, 3600 * 100, min_interval=60,
+            on_refresh=lambda domain, result: errors.append(result))
+        scheduler.track('bad-domain')
+        started = time.time()
+        assert scheduler.refresh_due() == 1
+        assert isinstance(errors[0], ResponseError)
+        assert scheduler.stats.failures == 1
+        assert 60 <= scheduler.due('bad-domain') - started < 61
+        self.assertRaises(ResponseError, scheduler.get, 'bad-domain')
+
+        scheduler.untrack('bad-domain')
+        assert 'bad-domain' not in scheduler and len(scheduler) == 0
+
+    def test_worker_survives_errors(self):
+        calls = []
+        done = threading.Event()
+
+        def on_refresh(domain, result):
+            calls.append(result)
+            if len(calls) == 4:
+                done.set()
+            raise RuntimeError('callback failed')
+
+        # writing to a closed store fails with a sqlite3 error
+        store = RecordStore(':memory:')
+        store.close()
+        failing = Client(api_key=API_KEY, url=self.server.url, store=store)
+        domains = ['domain{}.com'.format(i) for i in range(2)]
+        schedulers = [
+            RefreshScheduler(self.client, 3600 * 100, on_refresh=on_refresh),
+            RefreshScheduler(failing, 3600 * 100, min_interval=60,
+                             on_refresh=on_refresh)]
+        for scheduler in schedulers:
+            scheduler.track_all(domains)
+            scheduler.start()
+        done.wait(5)
+        try:
+            assert len(calls) == 4
+            assert all(s._worker.is_alive() for s in schedulers)
+            assert schedulers[0].stats.refreshes == 2
+            assert schedulers[1].stats.failures == 2
+            assert all(59 < schedulers[1].due(d) - time.time() <= 60
+                       for d in domains)
+        finally:
+            for scheduler in schedulers:
+                scheduler.stop()
+            failing.close()
+
+    def test_stop(self):
+        scheduler = RefreshScheduler(self.client, 1).start()
+        self.assertRaises(RuntimeError, scheduler.start)
+        started = time.monotonic()
+        scheduler.stop(timeout=5)
+        assert time.monotonic() - started < 1
+        self.assertRaises(ValueError, RefreshScheduler, self.client, 0)
+        self.assertRaises(ValueError, RefreshScheduler, self.client,
+                          min_interval=10, max_interval=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
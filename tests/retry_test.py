@@ -0,0 +1,92 @@
+import json
+import unittest
+from whoisapi import Client
+from whoisapi import RetryPolicy
+from whoisapi import ApiAuthError
+from whoisapi import HttpApiError
+from whoisapi import ResponseError
+from stub_server import StubWhoisServer, API_KEY, whois_record
+
+
+def flaky(failures: int, status: int = 503):
+    calls = []
+
+    def respond(query):
+        calls.append(query)
+        if len(calls) <= failures:
+            return status, 'unavailable', {}
+        return 200, json.dumps(whois_record(query['domainName'])), {}
+
+    return respond, calls
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """
+    Offline tests against a local stub server.
+    """
+    def setUp(self):
+        self.server = StubWhoisServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_retry_server_errors(self):
+        respond, calls = flaky(2)
+        self.server.respond('flaky.com', body=respond)
+        policy = RetryPolicy(max_attempts=3, backoff_factor=0.01)
+        client = Client(api_key=API_KEY, url=self.server.url, retry=policy)
+
+        whois = client.data('flaky.com')
+
+        assert whois.domain_name == 'flaky.com'
+        assert len(calls) == 3
+        assert policy.stats.retries == 2
+        assert policy.stats.giveups == 0
+
+    def test_give_up(self):
+        respond, calls = flaky(5, status=500)
+        self.server.respond('down.com', body=respond)
+        policy = RetryPolicy(max_attempts=2, backoff_factor=0.01)
+        client = Client(api_key=API_KEY, url=self.server.url, retry=policy)
+
+        with self.assertRaises(HttpApiError) as context:
+            client.data('down.com')
+        assert context.exception.status_code == 500
+        assert len(calls) == 2
+        assert policy.stats.giveups == 1
+
+    def test_not_retried(self):
+        respond, calls = flaky(5, status=401)
+        self.server.respond('denied.com', body=respond)
+        respond, bad_calls = flaky(5, status=400)
+        self.server.respond('bad.com', body=respond)
+        client = Client(api_key=API_KEY, url=self.server.url,
+                        retry=RetryPolicy(backoff_factor=0.01))
+
+        self.assertRaises(ApiAuthError, client.data, 'denied.com')
+        self.assertRaises(HttpApiError, client.data, 'bad.com')
+        assert len(calls) == 1
+        assert len(bad_calls) == 1
+        assert not RetryPolicy().is_retryable(ResponseError('', None))
+
+    def test_transient_errors(self):
+        from whoisapi.net.async_http import aiohttp
+        policy = RetryPolicy()
+        if aiohttp is not None:
+            assert policy.is_retryable(
+                aiohttp.ServerDisconnectedError())
+
+    def test_deadline(self):
+        respond, calls = flaky(5)
+        self.server.respond('slow.com', body=respond)
+        policy = RetryPolicy(max_attempts=10, backoff_factor=1,
+                             jitter=False, deadline=0.5)
+        client = Client(api_key=API_KEY, url=self.server.url, retry=policy)
+
+        self.assertRaises(HttpApiError, client.data, 'slow.com')
+        assert len(calls) == 1
+        assert policy.stats.backoff_time == 0
+
+
+if __name__ == '__main__':
+    unittest.main()
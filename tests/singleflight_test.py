@@ -0,0 +1,74 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from whoisapi import Client
+from whoisapi import HttpApiError
+from whoisapi import RequestParameters
+from stub_server import StubWhoisServer, API_KEY, whois_record
+
+
+class TestCoalescing(unittest.TestCase):
+    """
+    Offline tests against a local stub server.
+    """
+    def setUp(self):
+        self.server = StubWhoisServer().start()
+        self.client = Client(api_key=API_KEY, url=self.server.url,
+                             coalesce=True)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def lookup_concurrently(self, domain, count, params=None):
+        barrier = threading.Barrier(count)
+
+        def lookup(_):
+            barrier.wait()
+            try:
+                return self.client.data(domain, params)
+            except HttpApiError as error:
+                return error
+
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            return list(executor.map(lookup, range(count)))
+
+    def test_shared_result(self):
+        self.server.respond('popular.com', delay=0.3,
+                            body=whois_record('popular.com'))
+
+        records = self.lookup_concurrently('popular.com', 5)
+
+        assert len(self.server.queries) == 1
+        assert all(r.domain_name == 'popular.com' for r in records)
+        assert len(set(id(r) for r in records)) == 5
+        assert self.client.single_flight.shared == 4
+
+    def test_shared_error(self):
+        self.server.respond('broken.com', status=500, body='oops', delay=0.3)
+
+        errors = self.lookup_concurrently('broken.com', 3)
+
+        assert len(self.server.queries) == 1
+        assert all(isinstance(e, HttpApiError) for e in errors)
+
+    def test_different_parameters(self):
+        self.server.respond('popular.com', delay=0.2,
+                            body=whois_record('popular.com'))
+        barrier = threading.Barrier(2)
+
+        def lookup(params):
+            barrier.wait()
+            return self.client.data('popular.com', params)
+
+        for params in (RequestParameters(da=1),
+                       RequestParameters(prefer_fresh=1)):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(lookup, [None, params]))
+        assert len(self.server.queries) == 4
+        assert sorted(q['preferFresh'] for q in self.server.queries[2:]) \
+            == ['0', '1']
+
+
+if __name__ == '__main__':
+    unittest.main()
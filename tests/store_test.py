@@ -0,0 +1,107 @@
+import datetime
+import unittest
+from whoisapi import Client
+from whoisapi import RecordStore
+from whoisapi import RequestParameters
+from whoisapi import ResponseError
+from whoisapi import WhoisRecord
+from stub_server import StubWhoisServer, API_KEY, ERROR_MESSAGE, \
+    whois_record
+
+NOW = datetime.datetime(2030, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def record(domain: str, expires: str, registrar: str,
+           country: str or None) -> dict:
+    values = whois_record(domain)
+    values['WhoisRecord']['expiresDate'] = expires
+    values['WhoisRecord']['registrarName'] = registrar
+    if country is None:
+        del values['WhoisRecord']['registrant']
+    else:
+        values['WhoisRecord']['registrant']['countryCode'] = country
+    return values
+
+
+class TestRecordStore(unittest.TestCase):
+    """
+    Offline tests against a local stub server.
+    """
+    def setUp(self):
+        self.server = StubWhoisServer().start()
+        self.server.respond('soon.com', body=record(
+            'soon.com', '2030-01-10T00:00:00Z', 'GoDaddy.com, LLC', 'US'))
+        self.server.respond('later.com', body=record(
+            'later.com', '2030-03-01T00:00:00+01:00', 'NameCheap, Inc.',
+            'DE'))
+        self.server.respond('expired.com', body=record(
+            'expired.com', '2029-12-01 10:00:00 UTC', 'GoDaddy.com, LLC',
+            None))
+        self.server.respond('bad-domain', body=ERROR_MESSAGE)
+        self.store = RecordStore(':memory:')
+        self.client = Client(api_key=API_KEY, url=self.server.url,
+                             store=self.store)
+
+    def tearDown(self):
+        self.client.close()
+        self.store.close()
+        self.server.stop()
+
+    def test_write_through(self):
+        self.client.data('soon.com')
+        self.client.data('later.com', fields=['domain_name'])
+        self.client.data('expired.com',
+                         RequestParameters(output_format='xml'))
+        self.assertRaises(ResponseError, self.client.data, 'bad-domain')
+
+        assert len(self.store) == 3
+        assert 'soon.com' in self.store and 'bad-domain' not in self.store
+        assert self.store.get('SOON.COM') == WhoisRecord(
+            record('soon.com', '2030-01-10T00:00:00Z', 'GoDaddy.com, LLC',
+                   'US')['WhoisRecord'])
+        assert self.store.get('expired.com').registrant is None
+        assert self.store.get_raw('later.com').startswith(b'{')
+        assert self.store.get('missing.com') is None
+        self.store.delete('soon.com')
+        assert self.store.get_raw('soon.com') is None
+
+    def test_queries(self):
+        for domain in ('soon.com', 'later.com', 'expired.com'):
+            self.client.data(domain)
+
+        soon, = self.store.expiring(days=30, now=NOW)
+        assert soon.domain_name == 'soon.com'
+        assert soon.expires_date == datetime.datetime(
+            2030, 1, 10, tzinfo=datetime.timezone.utc)
+        assert (soon.registrar_name, soon.country_code) == \
+            ('GoDaddy.com, LLC', 'US')
+        assert [r.domain_name for r in self.store.expiring(90, NOW)] == \
+            ['soon.com', 'later.com']
+        assert [r.domain_name for r in self.store.find(
+            registrar_name='godaddy.com, llc')] == ['expired.com', 'soon.com']
+        assert [r.domain_name for r in self.store.find(
+            country_code='de')] == ['later.com']
+        assert self.store.find(expires_before=NOW)[0].country_code is None
+        assert len(self.store.find(limit=2)) == 2
+
+    def test_indexes(self):
+        queries = [
+            ('expires_date >= ? AND expires_date < ?', (0, 1)),
+            ('registrar_name = ?', ('x',)),
+            ('country_code = ?', ('us',)),
+            ('domain_name = ?', ('x.com',)),
+        ]
+        for condition, args in queries:
+            plan = ' '.join(str(row) for row in self.store._db.execute(
+                'EXPLAIN QUERY PLAN SELECT * FROM whois_records WHERE '
+                + condition, args))
+            assert 'USING INDEX' in plan or 'USING PRIMARY KEY' in plan \
+                or 'sqlite_autoindex' in plan, plan
+
+    def test_invalid_store(self):
+        self.assertRaises(TypeError, Client, api_key=API_KEY,
+                          store='records.db')
+
+
+if __name__ == '__main__':
+    unittest.main()
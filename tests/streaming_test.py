@@ -0,0 +1,108 @@
+import io
+import json
+import unittest
+from whoisapi import Client
+from whoisapi import ResponseError
+from whoisapi import TextFieldFilter
+from stub_server import StubWhoisServer, API_KEY, ERROR_MESSAGE, \
+    WHOIS_RECORD
+
+
+class SpillFile(io.BytesIO):
+    def close(self):
+        self.text = self.getvalue()
+        super().close()
+
+
+def feed(text_filter: TextFieldFilter, data: bytes, size: int) -> bytes:
+    for i in range(0, len(data), size):
+        text_filter.feed(data[i:i + size])
+    return text_filter.close()
+
+
+class TestTextFieldFilter(unittest.TestCase):
+    def setUp(self):
+        self.document = json.loads(json.dumps(WHOIS_RECORD))
+        self.document['WhoisRecord']['registryData']['rawText'] = \
+            'Domain: "café" \\ \U0001F600\n' * 50
+
+    def test_values_are_cut_at_any_chunk_size(self):
+        data = json.dumps(self.document).encode('utf-8')
+        for size in (1, 2, 3, 7, 64, len(data)):
+            parsed = json.loads(feed(TextFieldFilter(), data, size))
+            record = parsed['WhoisRecord']
+            assert record['rawText'] == ''
+            assert record['registryData']['rawText'] == ''
+            assert record['registrant']['rawText'] == ''
+            assert record['registrant']['countryCode'] == 'US'
+            assert record['nameServers']['hostNames'] == \
+                ['ns1.example.net', 'ns2.example.net']
+
+    def test_spill(self):
+        expected = self.document['WhoisRecord']['registryData']['rawText']
+        for data in (json.dumps(self.document).encode('utf-8'),
+                     json.dumps(self.document, ensure_ascii=False,
+                                indent=2).encode('utf-8')):
+            for size in (1, 5, 4096):
+                files = {}
+                text_filter = TextFieldFilter(
+                    spill=lambda path: files.setdefault(path, SpillFile()))
+                feed(text_filter, data, size)
+                text = files['WhoisRecord.registryData.rawText'].text
+                assert text.decode('utf-8') == expected
+                assert files['WhoisRecord.registrant.rawText'].text \
+                    == b'Registrant Organization: Whois API, Inc'
+
+    def test_only_values_of_skipped_keys_are_cut(self):
+        data = b'{"a": ["rawText", {"rawText": 1}], "b": "rawText", ' \
+               b'"c": {"x\\"rawText": "kept", "rawText": "cut"}}'
+        parsed = json.loads(feed(TextFieldFilter(), data, 3))
+        assert parsed == {'a': ['rawText', {'rawText': 1}], 'b': 'rawText',
+                          'c': {'x"rawText': 'kept', 'rawText': ''}}
+
+    def test_spill_can_drop_values(self):
+        paths = []
+        data = json.dumps(self.document).encode('utf-8')
+        text_filter = TextFieldFilter(
+            skip_keys=['status'], spill=lambda path: paths.append(path))
+        parsed = json.loads(feed(text_filter, data, 16))
+        assert paths == ['WhoisRecord.registryData.status']
+        assert parsed['WhoisRecord']['registryData']['status'] == ''
+        assert text_filter.skipped_bytes == len('clientTransferProhibited')
+
+
+class TestStreamingClient(unittest.TestCase):
+    """
+    Offline tests against a local stub server.
+    """
+    def setUp(self):
+        self.server = StubWhoisServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_streaming_data(self):
+        files = {}
+        with Client(api_key=API_KEY, url=self.server.url, streaming=True,
+                    spill=lambda path: files.setdefault(path, SpillFile())
+                    ) as client:
+            whois = client.data('whoisxmlapi.com')
+            self.server.respond('bad-domain', body=ERROR_MESSAGE)
+            self.assertRaises(ResponseError, client.data, 'bad-domain')
+
+        assert whois.domain_name == 'whoisxmlapi.com'
+        assert whois.registrant.country_code == 'US'
+        assert whois.raw_text == ''
+        assert files['WhoisRecord.rawText'].text == \
+            b'Domain Name: whoisxmlapi.com'
+
+    def test_iter_data(self):
+        with Client(api_key=API_KEY, url=self.server.url) as client:
+            chunks = list(client.api_requester.iter_data(
+                'whoisxmlapi.com', chunk_size=100))
+        assert len(chunks) > 1
+        assert json.loads(b''.join(chunks))['WhoisRecord']['rawText']
+
+
+if __name__ == '__main__':
+    unittest.main()
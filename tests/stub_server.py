@@ -0,0 +1,195 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from xml.sax.saxutils import escape
+
+API_KEY = 'at_' + '0' * 29
+
+WHOIS_RECORD = {
+    'WhoisRecord': {
+        'domainName': 'whoisxmlapi.com',
+        'createdDate': '2009-03-19T21:47:17Z',
+        'updatedDate': '2021-02-16T19:04:22Z',
+        'expiresDate': '2030-03-19T21:47:17Z',
+        'registrarName': 'GoDaddy.com, LLC',
+        'registrarIANAID': '146',
+        'domainAvailability': 'UNAVAILABLE',
+        'estimatedDomainAge': 4600,
+        'parseCode': 8,
+        'rawText': 'Domain Name: whoisxmlapi.com',
+        'registrant': {
+            'organization': 'Whois API, Inc',
+            'state': 'CA',
+            'country': 'UNITED STATES',
+            'countryCode': 'US',
+            'rawText': 'Registrant Organization: Whois API, Inc'
+        },
+        'nameServers': {
+            'rawText': 'ns1.example.net\nns2.example.net\n',
+            'hostNames': ['ns1.example.net', 'ns2.example.net'],
+            'ips': []
+        },
+        'audit': {
+            'createdDate': '2021-02-17 15:26:53.000 UTC',
+            'updatedDate': '2021-02-17 15:26:53.000 UTC'
+        },
+        'registryData': {
+            'domainName': 'whoisxmlapi.com',
+            'createdDate': '2009-03-19T21:47:17Z',
+            'expiresDate': '2030-03-19T21:47:17Z',
+            'registrarName': 'GoDaddy.com, LLC',
+            'status': 'clientTransferProhibited',
+            'rawText': 'Domain Name: WHOISXMLAPI.COM'
+        }
+    }
+}
+
+ERROR_MESSAGE = {
+    'ErrorMessage': {
+        'errorCode': 'WHOIS_01',
+        'msg': 'Invalid domain name'
+    }
+}
+
+
+def whois_record(domain: str) -> dict:
+    record = json.loads(json.dumps(WHOIS_RECORD))
+    record['WhoisRecord']['domainName'] = domain
+    record['WhoisRecord']['registryData']['domainName'] = domain
+    return record
+
+
+class StubWhoisServer:
+    """
+    Local HTTP/1.1 server answering like the WhoisService endpoint.
+
+    Every domain gets a WhoisRecord unless a custom response is set via
+    respond(). Received queries and accepted connections are recorded.
+    latency delays every response by the given number of seconds.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.queries = []
+        self.connections = 0
+        self._responses = {}
+        self._drips = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(
+            ('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return 'http://127.0.0.1:{}/whoisserver/WhoisService'.format(
+            self._server.server_address[1])
+
+    def respond(self, domain: str, status: int = 200, body=None,
+                headers: dict or None = None, delay: float = 0.0,
+                drip: float = 0.0):
+        """Set the response for a domain; body may be a dict, str or
+        a callable returning (status, body, headers). drip sends the
+        body in 10-byte pieces this many seconds apart"""
+        self._responses[domain] = (status, body, headers or {}, delay)
+        self._drips[domain] = drip
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                query = {k: v[0] for k, v in parse_qs(
+                    urlparse(self.path).query).items()}
+                with stub._lock:
+                    stub.queries.append(query)
+                status, body, headers = stub._build(query)
+                data = body.encode('utf-8') \
+                    if isinstance(body, str) else body
+                try:
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header('Content-Length', str(len(data)))
+                    self.end_headers()
+                    drip = stub._drips.get(query.get('domainName'))
+                    if not drip:
+                        self.wfile.write(data)
+                    for i in range(0, len(data), 10) if drip else ():
+                        self.wfile.write(data[i:i + 10])
+                        self.wfile.flush()
+                        time.sleep(drip)
+                except (BrokenPipeError, ConnectionResetError):
+                    # the client gave up waiting
+                    self.close_connection = True
+
+        return Handler
+
+    def _build(self, query: dict):
+        if self.latency:
+            time.sleep(self.latency)
+        domain = query.get('domainName', '')
+        output_format = query.get('outputFormat', 'JSON').lower()
+        if domain in self._responses:
+            status, body, headers, delay = self._responses[domain]
+            if delay:
+                time.sleep(delay)
+            if callable(body):
+                return body(query)
+        elif output_format == 'xml':
+            status, body, headers = 200, whois_record_xml(domain), {}
+        else:
+            status, body, headers = 200, whois_record(domain), {}
+
+        if isinstance(body, dict) and output_format == 'xml':
+            body = '<?xml version="1.0" encoding="utf-8"?>' + to_xml(body)
+            headers = dict({'Content-Type': 'application/xml'}, **headers)
+        elif isinstance(body, dict):
+            body = json.dumps(body)
+            headers = dict({'Content-Type': 'application/json'}, **headers)
+        return status, body if body is not None else '', headers
+
+
+def to_xml(value) -> str:
+    """Serialize a decoded response like the XML output format does"""
+    if isinstance(value, dict):
+        return ''.join('<{0}>{1}</{0}>'.format(k, to_xml(v))
+                       for k, v in value.items())
+    if isinstance(value, list):
+        return ''.join('<Address>{}</Address>'.format(to_xml(v))
+                       for v in value)
+    return escape(str(value))
+
+
+def whois_record_xml(domain: str) -> str:
+    return '<?xml version="1.0" encoding="utf-8"?>' \
+        + to_xml(whois_record(domain))